@@ -42,8 +42,22 @@ Documentation available in: English, French, Spanish, German, Italian, Chinese
 from .generic_tree import (
     Tree,
     TreeNode,
+    CompactTreeNode,
     TraversalMode,
 )
+from .flat_tree import FlatTree
+from .indexes import ValueIndex, MetadataIndex, ChildIndex
+from .aggregates import SubtreeAggregates
+from .ancestry import AncestorIndex
+from .binary_tree import MappedTree, MappedNode
+from .persistent import PersistentTree, PersistentNode
+from .parallel import ParallelExecutor
+from .hashing import SubtreeHashes
+from .journal import TreeJournal
+from .threadsafe import ConcurrentTree, RWLock
+from .paths import PathCache
+from .query import Query, compile_query
+from .heavy_light import PathAggregates
 
 __module__ = 'generic_tree'
 __project__ = 'variableplus'
@@ -55,5 +69,25 @@ __copyright__ = 'Copyright 2026 - Created with AI assistance'
 __all__ = [
     'Tree',
     'TreeNode',
+    'CompactTreeNode',
     'TraversalMode',
+    'FlatTree',
+    'ValueIndex',
+    'MetadataIndex',
+    'ChildIndex',
+    'SubtreeAggregates',
+    'AncestorIndex',
+    'MappedTree',
+    'MappedNode',
+    'PersistentTree',
+    'PersistentNode',
+    'ParallelExecutor',
+    'SubtreeHashes',
+    'TreeJournal',
+    'ConcurrentTree',
+    'RWLock',
+    'PathCache',
+    'Query',
+    'compile_query',
+    'PathAggregates',
 ]
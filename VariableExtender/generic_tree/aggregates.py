@@ -0,0 +1,270 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Aggregates - Cached per-subtree statistics for generic trees.
+
+:class:`SubtreeAggregates` caches, for every node of a tree, the size,
+height, leaf count and balance of the subtree rooted at it, plus any number
+of user-registered associative aggregates (sums, minimums, ...). Values are
+computed on demand in one post-order pass over the nodes that are not cached
+yet, so repeated queries are O(1). Edits only invalidate the cached values
+on the path from the edited node to the root.
+
+Example:
+    >>> import operator
+    >>> tree = Tree(root_value=1)
+    >>> child = tree.add_child(tree.root, 2)
+    >>> aggregates = tree.enable_aggregates()
+    >>> aggregates.register("total", lambda node: node.value, operator.add)
+    >>> aggregates.get("total")
+    3
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .generic_tree import Tree, TreeNode, _TreeListener, _MISSING
+except ImportError:
+    from generic_tree import Tree, TreeNode, _TreeListener, _MISSING
+
+# Index of each built-in statistic in the cached tuples.
+_SIZE, _HEIGHT, _LEAVES, _BALANCED = range(4)
+
+
+class _Aggregate:
+    """A registered associative aggregate and its per-node cache."""
+    __slots__ = ('value', 'combine', 'cache')
+
+    def __init__(self, value: Callable[[TreeNode], Any], combine: Callable[[Any, Any], Any]):
+        self.value = value
+        self.combine = combine
+        self.cache: Dict[int, Any] = {}
+
+
+class SubtreeAggregates(_TreeListener):
+    """Cache of subtree size, height, leaf count, balance and custom aggregates.
+
+    A custom aggregate of a node is ``value(node)`` combined, left to right,
+    with the aggregates of its children; ``combine`` must be associative.
+
+    Attributes:
+        tree (Tree): The tree whose subtrees are aggregated
+    """
+
+    def __init__(self, tree: Tree):
+        """Initialize an empty cache for a tree.
+
+        Args:
+            tree (Tree): The tree to aggregate
+        """
+        self.tree = tree
+        self._stats: Dict[int, Tuple[int, int, int, bool]] = {}
+        self._custom: Dict[str, _Aggregate] = {}
+        # Readers sharing a read lock may fill the caches at the same time.
+        self._lock = threading.Lock()
+
+    def register(self, name: str, value: Callable[[TreeNode], Any],
+                 combine: Callable[[Any, Any], Any]) -> None:
+        """Register (or replace) a custom associative aggregate.
+
+        Args:
+            name (str): Name used to query the aggregate
+            value (Callable): Function giving the contribution of one node
+            combine (Callable): Associative function merging two partial results
+        """
+        self._custom[name] = _Aggregate(value, combine)
+
+    def unregister(self, name: str) -> bool:
+        """Remove a custom aggregate.
+
+        Args:
+            name (str): Name of the aggregate
+
+        Returns:
+            bool: True if the aggregate existed, False otherwise
+        """
+        return self._custom.pop(name, None) is not None
+
+    def clear(self) -> None:
+        """Drop every cached value; they are recomputed on the next query."""
+        self._stats.clear()
+        for aggregate in self._custom.values():
+            aggregate.cache.clear()
+
+    def size(self, node: Optional[TreeNode] = None) -> int:
+        """Get the number of nodes in a subtree.
+
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            int: Number of nodes
+        """
+        return self._stats_of(node or self.tree.root)[_SIZE]
+
+    def height(self, node: Optional[TreeNode] = None) -> int:
+        """Get the height of a subtree.
+
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            int: Height (0 for a leaf)
+        """
+        return self._stats_of(node or self.tree.root)[_HEIGHT]
+
+    def leaf_count(self, node: Optional[TreeNode] = None) -> int:
+        """Get the number of leaves in a subtree.
+
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            int: Number of leaves
+        """
+        return self._stats_of(node or self.tree.root)[_LEAVES]
+
+    def is_balanced(self, node: Optional[TreeNode] = None) -> bool:
+        """Check whether a subtree is balanced (see :meth:`Tree.is_balanced`).
+
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            bool: True if every node's children heights differ by at most 1
+        """
+        return self._stats_of(node or self.tree.root)[_BALANCED]
+
+    def get(self, name: str, node: Optional[TreeNode] = None) -> Any:
+        """Get the value of a custom aggregate for a subtree.
+
+        Args:
+            name (str): Name of the registered aggregate
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            Any: The aggregated value
+
+        Raises:
+            KeyError: If no aggregate is registered under ``name``
+        """
+        aggregate = self._custom[name]
+        node = node or self.tree.root
+        cache = aggregate.cache
+        cached = cache.get(id(node), _MISSING)
+        if cached is not _MISSING:
+            return cached
+        value = aggregate.value
+        combine = aggregate.combine
+        with self._lock:
+            for item in self._uncached_post_order(node, cache):
+                result = value(item)
+                for child in item.children:
+                    result = combine(result, cache[id(child)])
+                cache[id(item)] = result
+            return cache[id(node)]
+
+    def _stats_of(self, node: TreeNode) -> Tuple[int, int, int, bool]:
+        stats = self._stats
+        cached = stats.get(id(node))
+        if cached is not None:
+            return cached
+        with self._lock:
+            return self._fill_stats(node)
+
+    def _fill_stats(self, node: TreeNode) -> Tuple[int, int, int, bool]:
+        stats = self._stats
+        for item in self._uncached_post_order(node, stats):
+            children = item.children
+            if not children:
+                stats[id(item)] = (1, 0, 1, True)
+                continue
+            size = 1
+            leaves = 0
+            balanced = True
+            highest = -1
+            lowest = None
+            for child in children:
+                child_size, child_height, child_leaves, child_balanced = stats[id(child)]
+                size += child_size
+                leaves += child_leaves
+                balanced = balanced and child_balanced
+                if child_height > highest:
+                    highest = child_height
+                if lowest is None or child_height < lowest:
+                    lowest = child_height
+            stats[id(item)] = (size, highest + 1, leaves, balanced and highest - lowest <= 1)
+        return stats[id(node)]
+
+    @staticmethod
+    def _uncached_post_order(node: TreeNode, cache: Dict[int, Any]) -> List[TreeNode]:
+        """List the uncached nodes of a subtree, children before parents.
+
+        A cached node always has cached descendants, so cached subtrees are
+        skipped entirely.
+        """
+        order = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if id(current) in cache:
+                continue
+            order.append(current)
+            stack.extend(current.children)
+        order.reverse()
+        return order
+
+    def _tables(self) -> List[Dict[int, Any]]:
+        return [self._stats] + [aggregate.cache for aggregate in self._custom.values()]
+
+    def _invalidate_path(self, node: Optional[TreeNode],
+                         tables: Optional[List[Dict[int, Any]]] = None) -> None:
+        """Drop cached values from ``node`` up to the root.
+
+        Stops at the first node with nothing cached: its ancestors cannot
+        have cached values either.
+        """
+        if tables is None:
+            tables = self._tables()
+        while node is not None:
+            key = id(node)
+            found = False
+            for table in tables:
+                if table.pop(key, _MISSING) is not _MISSING:
+                    found = True
+            if not found:
+                return
+            node = node.parent
+
+    def _evict_subtree(self, node: TreeNode) -> None:
+        tables = self._tables()
+        for item in self.tree._pre_order(node):
+            key = id(item)
+            for table in tables:
+                table.pop(key, None)
+
+    def attached(self, node: TreeNode) -> None:
+        self._evict_subtree(node)
+        self._invalidate_path(node.parent)
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        self._evict_subtree(node)
+        self._invalidate_path(parent)
+
+    def value_changed(self, node: TreeNode, old_value: Any) -> None:
+        self._invalidate_custom(node)
+
+    def metadata_changed(self, node: TreeNode, key: str, old_value: Any) -> None:
+        self._invalidate_custom(node)
+
+    def reordered(self, node: TreeNode) -> None:
+        self._invalidate_custom(node)
+
+    def _invalidate_custom(self, node: TreeNode) -> None:
+        """Custom aggregates may read values/metadata and depend on child order."""
+        if self._custom:
+            self._invalidate_path(node, [aggregate.cache for aggregate in self._custom.values()])
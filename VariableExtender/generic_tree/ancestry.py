@@ -0,0 +1,272 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Ancestry - Constant-time ancestor queries for generic trees.
+
+:class:`AncestorIndex` numbers the nodes of a tree in pre-order and keeps,
+for each node, its depth and the last pre-order number of its subtree. On
+top of that it builds a sparse table of range minimums over the depths.
+This answers:
+
+    - ``is_ancestor(a, b)`` and ``depth(node)`` in O(1)
+    - ``lca(a, b)`` in O(1) (the shallowest node strictly after ``a`` and
+      up to ``b`` in pre-order is a child of their lowest common ancestor)
+    - ``kth_ancestor(node, k)`` in O(log n) by bisecting the pre-order
+      numbers of the nodes at the target depth
+
+The index is meant for frozen or rarely-mutated trees: structural edits
+mark it stale and the next query rebuilds it (O(n log n)).
+
+Example:
+    >>> tree = Tree(root_value="ceo")
+    >>> cto = tree.add_child(tree.root, "cto")
+    >>> dev = tree.add_child(cto, "dev")
+    >>> ops = tree.add_child(cto, "ops")
+    >>> ancestry = tree.enable_ancestor_index()
+    >>> ancestry.lca(dev, ops).value
+    'cto'
+    >>> ancestry.distance(dev, ops)
+    2
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .generic_tree import Tree, TreeNode, _TreeListener
+except ImportError:
+    from generic_tree import Tree, TreeNode, _TreeListener
+
+
+class AncestorIndex(_TreeListener):
+    """Pre/post-order numbering plus a sparse table for ancestor queries.
+
+    Attributes:
+        tree (Tree): The indexed tree
+    """
+
+    def __init__(self, tree: Tree):
+        """Initialize and build the index for a tree.
+
+        Args:
+            tree (Tree): The tree to index
+        """
+        self.tree = tree
+        self._stale = True
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Renumber the tree and rebuild the sparse table."""
+        nodes: List[TreeNode] = []
+        depths: List[int] = []
+        parents: List[int] = []
+        stack = [(self.tree.root, 0, -1)]
+        while stack:
+            node, depth, parent = stack.pop()
+            number = len(nodes)
+            nodes.append(node)
+            depths.append(depth)
+            parents.append(parent)
+            if node.children:
+                stack.extend((child, depth + 1, number) for child in reversed(node.children))
+        count = len(nodes)
+        last = list(range(count))
+        for number in range(count - 1, 0, -1):
+            parent = parents[number]
+            if last[number] > last[parent]:
+                last[parent] = last[number]
+        levels: List[List[int]] = []
+        for number, depth in enumerate(depths):
+            if depth == len(levels):
+                levels.append([number])
+            else:
+                levels[depth].append(number)
+
+        # Keys combine depth and number so that min() picks the shallowest node.
+        keys = array('q', (depth * count + number for number, depth in enumerate(depths)))
+        table = [keys]
+        span = 1
+        while span * 2 <= count:
+            previous = table[-1]
+            table.append(array('q', map(min, previous, previous[span:])))
+            span *= 2
+
+        self._nodes = nodes
+        self._number: Dict[int, int] = {id(node): number for number, node in enumerate(nodes)}
+        self._depth = array('q', depths)
+        self._parent = array('q', parents)
+        self._last = array('q', last)
+        self._levels = levels
+        self._table = table
+        self._stale = False
+
+    def _numbers(self, *nodes: TreeNode) -> List[int]:
+        if self._stale:
+            self.rebuild()
+        try:
+            return [self._number[id(node)] for node in nodes]
+        except KeyError:
+            raise ValueError("node is not part of the indexed tree") from None
+
+    def __contains__(self, node: TreeNode) -> bool:
+        if self._stale:
+            self.rebuild()
+        return id(node) in self._number
+
+    def depth(self, node: TreeNode) -> int:
+        """Get the depth of a node.
+
+        Args:
+            node (TreeNode): A node of the tree
+
+        Returns:
+            int: Depth (0 for the root)
+        """
+        return self._depth[self._numbers(node)[0]]
+
+    def is_ancestor(self, ancestor: TreeNode, node: TreeNode) -> bool:
+        """Check whether ``ancestor`` is ``node`` or one of its ancestors.
+
+        Args:
+            ancestor (TreeNode): The candidate ancestor
+            node (TreeNode): The candidate descendant
+
+        Returns:
+            bool: True if ``ancestor`` lies on the path from the root to ``node``
+        """
+        a, b = self._numbers(ancestor, node)
+        return a <= b <= self._last[a]
+
+    def _lca_number(self, a: int, b: int) -> int:
+        if a == b:
+            return a
+        if a > b:
+            a, b = b, a
+        if b <= self._last[a]:
+            return a
+        low = a + 1
+        level = (b - low + 1).bit_length() - 1
+        row = self._table[level]
+        key = min(row[low], row[b - (1 << level) + 1])
+        return self._parent[key % len(self._nodes)]
+
+    def lca(self, a: TreeNode, b: TreeNode) -> TreeNode:
+        """Get the lowest common ancestor of two nodes.
+
+        Args:
+            a (TreeNode): First node
+            b (TreeNode): Second node
+
+        Returns:
+            TreeNode: The deepest node that is an ancestor of both
+        """
+        first, second = self._numbers(a, b)
+        return self._nodes[self._lca_number(first, second)]
+
+    def distance(self, a: TreeNode, b: TreeNode) -> int:
+        """Get the number of edges on the path between two nodes.
+
+        Args:
+            a (TreeNode): First node
+            b (TreeNode): Second node
+
+        Returns:
+            int: Path length in edges
+        """
+        first, second = self._numbers(a, b)
+        depth = self._depth
+        return depth[first] + depth[second] - 2 * depth[self._lca_number(first, second)]
+
+    def kth_ancestor(self, node: TreeNode, k: int) -> Optional[TreeNode]:
+        """Get the ancestor ``k`` levels above a node.
+
+        Args:
+            node (TreeNode): The starting node
+            k (int): Number of levels to climb (0 returns the node itself)
+
+        Returns:
+            Optional[TreeNode]: The ancestor, or None if ``k`` exceeds the depth
+        """
+        number = self._numbers(node)[0]
+        target = self._depth[number] - k
+        if k < 0 or target < 0:
+            return None
+        level = self._levels[target]
+        return self._nodes[level[bisect_right(level, number) - 1]]
+
+    def lca_many(self, pairs: Iterable[Tuple[TreeNode, TreeNode]]) -> List[TreeNode]:
+        """Get the lowest common ancestors of many node pairs.
+
+        Args:
+            pairs (Iterable[Tuple[TreeNode, TreeNode]]): Node pairs
+
+        Returns:
+            List[TreeNode]: One common ancestor per pair, in input order
+        """
+        if self._stale:
+            self.rebuild()
+        number = self._number
+        nodes = self._nodes
+        lca_number = self._lca_number
+        try:
+            return [nodes[lca_number(number[id(a)], number[id(b)])] for a, b in pairs]
+        except KeyError:
+            raise ValueError("node is not part of the indexed tree") from None
+
+    def distance_many(self, pairs: Iterable[Tuple[TreeNode, TreeNode]]) -> List[int]:
+        """Get the path lengths between many node pairs.
+
+        Args:
+            pairs (Iterable[Tuple[TreeNode, TreeNode]]): Node pairs
+
+        Returns:
+            List[int]: One distance per pair, in input order
+        """
+        if self._stale:
+            self.rebuild()
+        number = self._number
+        depth = self._depth
+        lca_number = self._lca_number
+        result = []
+        try:
+            for a, b in pairs:
+                first = number[id(a)]
+                second = number[id(b)]
+                result.append(depth[first] + depth[second]
+                              - 2 * depth[lca_number(first, second)])
+        except KeyError:
+            raise ValueError("node is not part of the indexed tree") from None
+        return result
+
+    def is_ancestor_many(self, pairs: Iterable[Tuple[TreeNode, TreeNode]]) -> List[bool]:
+        """Check many ``(ancestor, node)`` pairs at once.
+
+        Args:
+            pairs (Iterable[Tuple[TreeNode, TreeNode]]): Candidate pairs
+
+        Returns:
+            List[bool]: One answer per pair, in input order
+        """
+        if self._stale:
+            self.rebuild()
+        number = self._number
+        last = self._last
+        result = []
+        try:
+            for ancestor, node in pairs:
+                a = number[id(ancestor)]
+                b = number[id(node)]
+                result.append(a <= b <= last[a])
+        except KeyError:
+            raise ValueError("node is not part of the indexed tree") from None
+        return result
+
+    def attached(self, node: TreeNode) -> None:
+        self._stale = True
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        self._stale = True
@@ -0,0 +1,121 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Async Tree - Asyncio traversal and bounded-concurrency node visitors.
+
+:func:`atraverse` iterates over a tree from ``async for`` loops and hands
+control back to the event loop every ``yield_every`` nodes, so walking a
+large tree does not stall the other tasks.
+
+:func:`aapply` runs an I/O-bound coroutine function on every node with at
+most ``concurrency`` coroutines in flight. Nodes are started lazily in
+pre-order as earlier ones finish, so a 100k-node walk keeps only the
+running window in memory instead of one task per node. With
+``parent_first``, a node's coroutine starts only once its parent's has
+completed, and the children are read at that moment (the parent's
+coroutine may add some).
+
+The first failing coroutine cancels the ones still running and its
+exception is raised; cancelling the task running :func:`aapply` cancels
+them as well.
+
+Example:
+    >>> async def fetch_details(node):
+    ...     node.set_metadata("details", await cache.get(node.value))
+    >>> asyncio.run(tree.aapply(fetch_details, concurrency=64))
+    >>> async def names():
+    ...     return [node.value async for node in tree.atraverse()]
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+try:
+    from .generic_tree import Tree, TreeNode, TraversalMode
+except ImportError:
+    from generic_tree import Tree, TreeNode, TraversalMode
+
+
+async def atraverse(tree: Tree, mode: TraversalMode = TraversalMode.PRE_ORDER,
+                    start: Optional[TreeNode] = None,
+                    yield_every: int = 256) -> AsyncIterator[TreeNode]:
+    """Traverse a tree asynchronously in the specified mode.
+
+    Args:
+        tree (Tree): The tree to traverse
+        mode (TraversalMode): The traversal mode to use
+        start (Optional[TreeNode]): Node to start from (default: root)
+        yield_every (int): Let other tasks run after this many nodes
+
+    Yields:
+        TreeNode: Nodes in traversal order
+
+    Raises:
+        ValueError: If ``yield_every`` is smaller than 1
+    """
+    if yield_every < 1:
+        raise ValueError("yield_every must be at least 1")
+    for count, node in enumerate(tree.traverse(mode, start), 1):
+        yield node
+        if count % yield_every == 0:
+            await asyncio.sleep(0)
+
+
+async def aapply(tree: Tree, coro_fn: Callable[[TreeNode], Awaitable[Any]],
+                 start: Optional[TreeNode] = None, concurrency: int = 16,
+                 parent_first: bool = False) -> int:
+    """Await a coroutine function on every node, ``concurrency`` at a time.
+
+    Args:
+        tree (Tree): The tree to visit
+        coro_fn (Callable): Coroutine function called with each node
+        start (Optional[TreeNode]): Node to start from (default: root)
+        concurrency (int): Maximum number of coroutines running at once
+        parent_first (bool): Start a node only after its parent completed
+
+    Returns:
+        int: Number of nodes visited
+
+    Raises:
+        ValueError: If ``concurrency`` is smaller than 1
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    current = start or tree.root
+    if parent_first:
+        ready = deque([current])
+        source = None
+    else:
+        source = tree._pre_order(current)
+    running: Dict[asyncio.Task, TreeNode] = {}
+    visited = 0
+    try:
+        while True:
+            while len(running) < concurrency:
+                if source is not None:
+                    node = next(source, None)
+                elif ready:
+                    node = ready.popleft()
+                else:
+                    node = None
+                if node is None:
+                    break
+                running[asyncio.ensure_future(coro_fn(node))] = node
+            if not running:
+                return visited
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                node = running.pop(task)
+                task.result()
+                visited += 1
+                if source is None:
+                    ready.extend(node.children)
+    finally:
+        if running:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
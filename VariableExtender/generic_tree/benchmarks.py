@@ -0,0 +1,241 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Benchmarks for the generic_tree module.
+
+Each benchmark builds its own trees, measures one aspect of the
+implementation and returns a dictionary of results so it can be reused
+from other scripts. Running this file prints every benchmark.
+
+Usage:
+    python benchmarks.py            # run all benchmarks
+    python benchmarks.py memory     # run a single benchmark
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from generic_tree import CompactTreeNode, Tree, TreeNode  # noqa: E402
+from threadsafe import ConcurrentTree  # noqa: E402
+
+
+def _build_tree(node_class: type, node_count: int, fan_out: int,
+                metadata_every: int) -> Tree:
+    """Build a complete tree of ``node_count`` nodes in level order."""
+    tree = Tree(root_value=0, node_class=node_class)
+    frontier = [tree.root]
+    created = 1
+    position = 0
+    while created < node_count:
+        parent = frontier[position]
+        position += 1
+        for _ in range(fan_out):
+            if created >= node_count:
+                break
+            child = tree.add_child(parent, created)
+            if metadata_every and created % metadata_every == 0:
+                child.set_metadata("tag", created)
+            frontier.append(child)
+            created += 1
+    return tree
+
+
+def benchmark_memory(node_count: int = 200_000, fan_out: int = 4,
+                     metadata_every: int = 10) -> Dict[str, Any]:
+    """Compare memory used by TreeNode and CompactTreeNode trees.
+    
+    Args:
+        node_count (int): Number of nodes in each tree
+        fan_out (int): Children per internal node
+        metadata_every (int): Give every n-th node one metadata entry (0: none)
+        
+    Returns:
+        Dict[str, Any]: Bytes per node and build time for each node class
+    """
+    results: Dict[str, Any] = {"node_count": node_count}
+    for node_class in (TreeNode, CompactTreeNode):
+        tracemalloc.start()
+        start = time.perf_counter()
+        tree = _build_tree(node_class, node_count, fan_out, metadata_every)
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[node_class.__name__] = {
+            "bytes_per_node": current / node_count,
+            "build_seconds": elapsed,
+        }
+        del tree
+    results["ratio"] = (results["TreeNode"]["bytes_per_node"]
+                        / results["CompactTreeNode"]["bytes_per_node"])
+    return results
+
+
+def benchmark_contention(node_count: int = 20_000, readers: int = 4,
+                         duration: float = 1.0, batch_size: int = 10,
+                         write_interval: float = 0.001,
+                         io_pause: float = 0.0005) -> Dict[str, Any]:
+    """Measure N reader threads and one writer sharing a ConcurrentTree.
+    
+    Readers repeatedly stream a full traversal, pausing every 1000 nodes as
+    if writing a response, either over the live tree under the read lock or
+    over a snapshot taken without holding the lock while iterating; the
+    writer keeps renaming leaves in batched transactions.
+    
+    Args:
+        node_count (int): Number of nodes in the shared tree
+        readers (int): Number of reader threads
+        duration (float): Seconds each scenario runs
+        batch_size (int): Edits per write transaction
+        write_interval (float): Seconds the writer sleeps between transactions
+        io_pause (float): Seconds a reader sleeps every 1000 nodes
+        
+    Returns:
+        Dict[str, Any]: Traversals and write transactions per second, and the
+        mean wait for the write lock, for each read strategy
+    """
+    results: Dict[str, Any] = {"node_count": node_count, "readers": readers}
+    for strategy in ("locked", "snapshot"):
+        shared = ConcurrentTree(_build_tree(TreeNode, node_count, 4, 0))
+        leaves = shared.tree.get_all_leaf_nodes()
+        stop = threading.Event()
+        reads = [0] * readers
+        writes = [0]
+        write_wait = [0.0]
+
+        def stream(nodes) -> None:
+            for count, _ in enumerate(nodes):
+                if count % 1000 == 0:
+                    time.sleep(io_pause)
+
+        def read(slot: int) -> None:
+            while not stop.is_set():
+                if strategy == "locked":
+                    with shared.read() as tree:
+                        stream(tree.traverse())
+                else:
+                    stream(shared.traverse())
+                reads[slot] += 1
+
+        def write() -> None:
+            position = 0
+            while not stop.is_set():
+                start = time.perf_counter()
+                with shared.transaction():
+                    write_wait[0] += time.perf_counter() - start
+                    for _ in range(batch_size):
+                        leaf = leaves[position % len(leaves)]
+                        leaf.set_value(leaf.value + 1)
+                        position += 1
+                writes[0] += 1
+                time.sleep(write_interval)
+
+        threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        results[strategy] = {
+            "traversals_per_second": sum(reads) / duration,
+            "transactions_per_second": writes[0] / duration,
+            "write_wait_ms": 1000 * write_wait[0] / max(writes[0], 1),
+        }
+        shared.close()
+    return results
+
+
+def _naive_path_sum(a: TreeNode, b: TreeNode) -> Any:
+    """Sum the values between two nodes from their paths to the root."""
+    up, down = a.get_path_to_root(), b.get_path_to_root()
+    shared = 0
+    while shared < min(len(up), len(down)) and up[shared] is down[shared]:
+        shared += 1
+    return sum(node.value for node in up[shared - 1:]) + sum(node.value for node in down[shared:])
+
+
+def benchmark_path_aggregates(node_count: int = 50_000, spread: int = 16,
+                              queries: int = 2_000, updates: int = 20_000,
+                              seed: int = 1) -> Dict[str, Any]:
+    """Compare path sums from ``get_path_to_root`` with a PathAggregates index.
+    
+    The tree attaches each node under one of the ``spread`` nodes created
+    just before it, which makes it deep (like long dependency chains).
+    
+    Args:
+        node_count (int): Number of nodes in the tree
+        spread (int): Parent choices per new node (smaller: deeper tree)
+        queries (int): Random node pairs to query
+        updates (int): Random value edits with the index enabled
+        seed (int): Random seed
+        
+    Returns:
+        Dict[str, Any]: Depth of the newest nodes, index build time, queries per second for
+        the naive approach and the index (single and batched), and updates
+        per second with the index enabled
+    """
+    rng = random.Random(seed)
+    tree = Tree(root_value=0)
+    nodes = [tree.root]
+    for index in range(1, node_count):
+        parent = nodes[rng.randrange(max(0, index - spread), index)]
+        nodes.append(tree.add_child(parent, rng.randint(-100, 100)))
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+    results: Dict[str, Any] = {"node_count": node_count,
+                               "depth": max(node.get_depth() for node in nodes[-spread:])}
+
+    start = time.perf_counter()
+    expected = [_naive_path_sum(a, b) for a, b in pairs]
+    results["naive_queries_per_second"] = queries / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    paths = tree.enable_path_aggregates()
+    results["build_seconds"] = time.perf_counter() - start
+    start = time.perf_counter()
+    answers = [paths.path_sum(a, b) for a, b in pairs]
+    results["index_queries_per_second"] = queries / (time.perf_counter() - start)
+    start = time.perf_counter()
+    batched = paths.query_many(pairs)
+    results["batch_queries_per_second"] = queries / (time.perf_counter() - start)
+    assert answers == batched == expected
+
+    edited = [rng.choice(nodes) for _ in range(updates)]
+    start = time.perf_counter()
+    for node in edited:
+        node.set_value(node.value + 1)
+    results["index_updates_per_second"] = updates / (time.perf_counter() - start)
+    tree.disable_path_aggregates()
+    results["speedup"] = (results["batch_queries_per_second"]
+                          / results["naive_queries_per_second"])
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "memory": benchmark_memory,
+    "contention": benchmark_contention,
+    "path_aggregates": benchmark_path_aggregates,
+}
+
+
+def main(argv: list) -> None:
+    """Run the benchmarks named in ``argv`` (all when empty)."""
+    names = argv or list(BENCHMARKS)
+    for name in names:
+        print(f"\n[{name}]")
+        for key, value in BENCHMARKS[name]().items():
+            print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
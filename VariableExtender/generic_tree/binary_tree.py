@@ -0,0 +1,376 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Binary Tree - Compact binary file format with memory-mapped lazy access.
+
+:func:`write_binary` stores a tree as the pre-order columns of a
+:class:`FlatTree` plus two blob tables. :class:`MappedTree` opens such a file
+with ``mmap`` and exposes it as a read-only :class:`FlatTree` whose columns
+are views on the mapping, so opening costs O(1) and only the pages of the
+nodes actually visited are read.
+
+File layout (little-endian, every section aligned to 8 bytes):
+    header: magic, version, column item size, node/value/metadata counts
+    columns: parent, first_child, next_sibling, depth, size, value_id,
+        metadata_id (one integer per node, ``-1`` means "none")
+    value offsets: ``value_count + 1`` 64-bit offsets into the value blob
+    metadata offsets: ``metadata_count + 1`` 64-bit offsets into the metadata blob
+    value blob: JSON encoding of each distinct value (equal values are stored once)
+    metadata blob: JSON encoding of each node's metadata dict
+
+Example:
+    >>> tree.save_binary("taxonomy.gtb")
+    >>> with Tree.open_binary("taxonomy.gtb") as mapped:
+    ...     root = mapped.node(0)
+    ...     print(root.value, [child.value for child in root.children])
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .generic_tree import Tree, TreeNode
+    from .flat_tree import FlatTree, _index_typecode
+except ImportError:
+    from generic_tree import Tree, TreeNode
+    from flat_tree import FlatTree, _index_typecode
+
+_MAGIC = b'GTREEBIN'
+_VERSION = 1
+_HEADER = struct.Struct('<8sIIQQQ')
+_COLUMNS = ('parent', 'first_child', 'next_sibling', 'depth', 'size', 'value_id', 'metadata_id')
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, default=str, ensure_ascii=False).encode('utf-8')
+
+
+def _column_bytes(column: array) -> bytes:
+    if _BIG_ENDIAN:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_binary(source: Union[Tree, TreeNode, FlatTree], filepath: str,
+                 include_metadata: bool = True) -> None:
+    """Save a tree (or the subtree below a node) in the binary format.
+
+    Args:
+        source (Union[Tree, TreeNode, FlatTree]): What to save
+        filepath (str): Path of the file to write
+        include_metadata (bool): Whether to store node metadata
+    """
+    flat = source if isinstance(source, FlatTree) else FlatTree.from_tree(source, include_metadata)
+    count = len(flat)
+    typecode = _index_typecode(count)
+
+    value_ids = array(typecode, [0]) * count
+    value_offsets = array('q', [0])
+    value_blobs: List[bytes] = []
+    interned: Dict[bytes, int] = {}
+    for index, value in enumerate(flat.values):
+        encoded = _encode(value)
+        value_id = interned.get(encoded)
+        if value_id is None:
+            value_id = interned[encoded] = len(value_blobs)
+            value_blobs.append(encoded)
+            value_offsets.append(value_offsets[-1] + len(encoded))
+        value_ids[index] = value_id
+    del interned
+
+    metadata_ids = array(typecode, [-1]) * count
+    metadata_offsets = array('q', [0])
+    metadata_blobs: List[bytes] = []
+    if include_metadata:
+        for index in sorted(flat.metadata):
+            encoded = _encode(flat.metadata[index])
+            metadata_ids[index] = len(metadata_blobs)
+            metadata_blobs.append(encoded)
+            metadata_offsets.append(metadata_offsets[-1] + len(encoded))
+
+    columns = [flat.parent, flat.first_child, flat.next_sibling, flat.depth, flat.size,
+               value_ids, metadata_ids]
+    with open(filepath, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, value_ids.itemsize, count,
+                             len(value_blobs), len(metadata_blobs)))
+        for section in [array(typecode, column) for column in columns] + [value_offsets,
+                                                                          metadata_offsets]:
+            data = _column_bytes(section)
+            f.write(data)
+            f.write(bytes(_aligned(len(data)) - len(data)))
+        for blob in value_blobs:
+            f.write(blob)
+        f.write(bytes(_aligned(value_offsets[-1]) - value_offsets[-1]))
+        for blob in metadata_blobs:
+            f.write(blob)
+
+
+class _BlobTable:
+    """Lazily decoded JSON entries addressed by id through an offset column."""
+
+    def __init__(self, offsets, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+        self._cache: Dict[int, Any] = {}
+
+    def __getitem__(self, entry: int) -> Any:
+        value = self._cache.get(entry, self)
+        if value is not self:
+            return value
+        value = json.loads(bytes(self._blob[self._offsets[entry]:self._offsets[entry + 1]]))
+        # Containers are decoded again on every access so callers never share them.
+        if not isinstance(value, (list, dict)):
+            self._cache[entry] = value
+        return value
+
+
+class _MappedValues:
+    """Read-only sequence of node values backed by the value table."""
+
+    def __init__(self, value_ids, table: _BlobTable):
+        self._ids = value_ids
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._table[value_id] for value_id in self._ids[index]]
+        return self._table[self._ids[index]]
+
+    def __iter__(self) -> Iterator[Any]:
+        table = self._table
+        return (table[value_id] for value_id in self._ids)
+
+    def index(self, value: Any, start: int = 0, end: Optional[int] = None) -> int:
+        end = len(self._ids) if end is None else end
+        table = self._table
+        ids = self._ids
+        for index in range(start, end):
+            if table[ids[index]] == value:
+                return index
+        raise ValueError(f"{value!r} is not in the tree")
+
+
+class _MappedMetadata:
+    """Read-only ``index -> metadata dict`` mapping backed by the metadata table."""
+
+    def __init__(self, metadata_ids, table: _BlobTable):
+        self._ids = metadata_ids
+        self._table = table
+
+    def __contains__(self, index: int) -> bool:
+        return 0 <= index < len(self._ids) and self._ids[index] >= 0
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index not in self:
+            raise KeyError(index)
+        return self._table[self._ids[index]]
+
+    def get(self, index: int, default: Any = None) -> Any:
+        return self[index] if index in self else default
+
+    def items(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        table = self._table
+        for index, metadata_id in enumerate(self._ids):
+            if metadata_id >= 0:
+                yield index, table[metadata_id]
+
+
+class MappedNode:
+    """Lightweight handle on one node of a :class:`MappedTree`.
+
+    Values, metadata and neighbours are decoded from the mapping on access.
+
+    Attributes:
+        tree (MappedTree): The mapped tree the node belongs to
+        index (int): Pre-order number of the node
+    """
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree: MappedTree, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def value(self) -> Any:
+        return self.tree.values[self.index]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.tree.metadata.get(self.index, {})
+
+    @property
+    def parent(self) -> Optional[MappedNode]:
+        parent = self.tree.parent[self.index]
+        return None if parent < 0 else MappedNode(self.tree, parent)
+
+    @property
+    def children(self) -> List[MappedNode]:
+        tree = self.tree
+        return [MappedNode(tree, child) for child in tree.children(self.index)]
+
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """Get a metadata value.
+
+        Args:
+            key (str): The metadata key
+            default (Any): Default value if key doesn't exist
+
+        Returns:
+            Any: The metadata value or default
+        """
+        return self.tree.get_metadata(self.index, key, default)
+
+    def is_leaf(self) -> bool:
+        return self.tree.first_child[self.index] < 0
+
+    def is_root(self) -> bool:
+        return self.tree.parent[self.index] < 0
+
+    def get_depth(self) -> int:
+        return self.tree.depth[self.index]
+
+    def get_path_to_root(self) -> List[MappedNode]:
+        """Get the path from the root to this node.
+
+        Returns:
+            List[MappedNode]: Nodes from root to this node
+        """
+        return [MappedNode(self.tree, index) for index in self.tree.path_to_root(self.index)]
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, MappedNode) and other.tree is self.tree
+                and other.index == self.index)
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return f"MappedNode(index={self.index}, value={self.value!r})"
+
+
+class MappedTree(FlatTree):
+    """Read-only :class:`FlatTree` over a memory-mapped binary tree file.
+
+    Every :class:`FlatTree` query works unchanged; columns are views on the
+    mapping and values/metadata are decoded on demand. Close the tree (or use
+    it as a context manager) to release the mapping.
+    """
+
+    def __init__(self, filepath: str):
+        """Map a file written by :func:`write_binary`.
+
+        Args:
+            filepath (str): Path of the binary tree file
+
+        Raises:
+            ValueError: If the file is not a binary tree file
+        """
+        self._file = open(filepath, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{filepath} is not a binary tree file") from None
+        try:
+            self._views: List[memoryview] = []
+            self._map_sections(filepath)
+        except Exception:
+            self.close()
+            raise
+
+    def _map_sections(self, filepath: str) -> None:
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{filepath} is not a binary tree file")
+        magic, version, itemsize, count, value_count, metadata_count = \
+            _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{filepath} is not a binary tree file (version {_VERSION})")
+        typecode = 'i' if itemsize == struct.calcsize('i') else 'q'
+        raw = memoryview(self._mmap)
+        self._views.append(raw)
+        offset = _HEADER.size
+
+        def section(typecode: str, length: int):
+            nonlocal offset
+            size = length * struct.calcsize(typecode)
+            view = raw[offset:offset + size]
+            self._views.append(view)
+            offset = _aligned(offset + size)
+            if _BIG_ENDIAN:
+                column = array(typecode, view)
+                column.byteswap()
+                return column
+            column = view.cast(typecode)
+            self._views.append(column)
+            return column
+
+        columns = {name: section(typecode, count) for name in _COLUMNS}
+        value_offsets = section('q', value_count + 1)
+        metadata_offsets = section('q', metadata_count + 1)
+        value_blob = raw[offset:offset + value_offsets[-1]]
+        offset = _aligned(offset + value_offsets[-1])
+        metadata_blob = raw[offset:offset + metadata_offsets[-1]]
+        self._views.extend((value_blob, metadata_blob))
+
+        super().__init__(
+            _MappedValues(columns['value_id'], _BlobTable(value_offsets, value_blob)),
+            columns['parent'], columns['first_child'], columns['next_sibling'],
+            columns['depth'], columns['size'],
+            _MappedMetadata(columns['metadata_id'], _BlobTable(metadata_offsets, metadata_blob)))
+        self.filepath = filepath
+
+    @property
+    def root(self) -> MappedNode:
+        """Handle on the root node."""
+        return MappedNode(self, 0)
+
+    def node(self, index: int) -> MappedNode:
+        """Get a handle on a node.
+
+        Args:
+            index (int): Pre-order number of the node
+
+        Returns:
+            MappedNode: The node handle
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return MappedNode(self, index)
+
+    def close(self) -> None:
+        """Release the memory mapping and the underlying file."""
+        views = self.__dict__.pop('_views', [])
+        for view in reversed(views):
+            view.release()
+        if not self._mmap_closed():
+            self._mmap.close()
+        self._file.close()
+
+    def _mmap_closed(self) -> bool:
+        mapping = getattr(self, '_mmap', None)
+        return mapping is None or mapping.closed
+
+    def __enter__(self) -> MappedTree:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"MappedTree(nodes={len(self)}, file={self.filepath!r})"
@@ -0,0 +1,225 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Builders - Bulk construction of trees from flat exports.
+
+Each builder consumes its input once, as an iterable (generators are
+fine), linking nodes directly instead of going through ``Tree.add_child``
+bookkeeping, and sets the node count at the end:
+
+- :func:`tree_from_edges`: ``(parent_value, child_value)`` pairs, in any
+  order; values identify nodes and must be hashable
+- :func:`tree_from_parent_array`: node values plus the index of each
+  node's parent (forward references are allowed)
+- :func:`tree_from_paths`: delimited paths such as ``"a/b/c"``
+
+Malformed input (several roots, nodes whose parent never appears, nodes
+with two parents, cycles) raises :class:`ValueError` once the input is
+exhausted, without ever looping over a cycle.
+
+Example:
+    >>> tree = tree_from_edges([("root", "a"), ("a", "a1"), ("root", "b")])
+    >>> [node.value for node in tree.traverse()]
+    ['root', 'a', 'a1', 'b']
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+from itertools import islice, zip_longest
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .generic_tree import Tree, TreeNode, _MISSING
+except ImportError:
+    from generic_tree import Tree, TreeNode, _MISSING
+
+# Number of offending values quoted in error messages.
+_QUOTED = 5
+
+
+def _link(parent: TreeNode, child: TreeNode) -> None:
+    """Append ``child`` to ``parent`` without tree-level bookkeeping."""
+    child.parent = parent
+    child._position = parent._next_slot()
+    parent._append_child(child)
+
+
+def _quote(values: Iterable[Any]) -> str:
+    """Format the first few values of an iterable for an error message."""
+    return ', '.join(repr(value) for value in islice(values, _QUOTED))
+
+
+def _finish(root: TreeNode, count: int, node_class: type) -> Tree:
+    """Wrap a linked root in a Tree, checking that all ``count`` nodes hang below it."""
+    reached = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        reached += 1
+        if node.children:
+            stack.extend(node.children)
+    if reached != count:
+        raise ValueError(f"input contains a cycle: {count - reached} nodes are not "
+                         "reachable from the root")
+    tree = Tree(node_class=node_class)
+    tree.root = root
+    tree._node_count = count
+    return tree
+
+
+def _single_root(roots: List[TreeNode], what: str) -> TreeNode:
+    """Return the only root, or raise for an empty, rootless or orphaned input."""
+    if len(roots) == 1:
+        return roots[0]
+    if not roots:
+        raise ValueError(f"input contains a cycle: no {what} is a root")
+    raise ValueError(f"input has {len(roots)} roots (orphaned {what}s?): "
+                     f"{_quote(node.value for node in roots)}")
+
+
+def tree_from_edges(edges: Iterable[Tuple[Optional[Hashable], Hashable]],
+                    node_class: type = TreeNode) -> Tree:
+    """Build a tree from ``(parent_value, child_value)`` edges in one pass.
+
+    Edges may come in any order. A ``(None, value)`` edge declares the
+    root explicitly, which is only needed for a single-node tree. Children
+    keep the order of their edges.
+
+    Args:
+        edges (Iterable[Tuple]): Parent/child value pairs
+        node_class (type): Node type to build the tree from
+
+    Returns:
+        Tree: The built tree
+
+    Raises:
+        ValueError: If the edges do not describe exactly one tree
+    """
+    nodes: Dict[Hashable, TreeNode] = {}
+    declared_root = _MISSING
+    for parent_value, child_value in edges:
+        child = nodes.get(child_value)
+        if child is None:
+            child = nodes[child_value] = node_class(value=child_value)
+        elif child.parent is not None or child_value == declared_root:
+            raise ValueError(f"node {child_value!r} has more than one parent")
+        if parent_value is None:
+            if declared_root is not _MISSING:
+                raise ValueError(f"both {declared_root!r} and {child_value!r} are "
+                                 "declared as root")
+            declared_root = child_value
+            continue
+        parent = nodes.get(parent_value)
+        if parent is None:
+            parent = nodes[parent_value] = node_class(value=parent_value)
+        elif parent is child:
+            raise ValueError(f"input contains a cycle: {child_value!r} is its own parent")
+        _link(parent, child)
+    if not nodes:
+        raise ValueError("no edges given")
+    root = _single_root([node for node in nodes.values() if node.parent is None], "node")
+    return _finish(root, len(nodes), node_class)
+
+
+def tree_from_parent_array(values: Iterable[Any], parents: Iterable[Optional[int]],
+                           node_class: type = TreeNode) -> Tree:
+    """Build a tree from node values and parent indexes in one pass.
+
+    ``parents[i]`` is the index (in ``values``) of the parent of node ``i``,
+    or ``None``/a negative number for the root. Parents may come after
+    their children; children keep their index order.
+
+    Args:
+        values (Iterable[Any]): Value per node
+        parents (Iterable[Optional[int]]): Parent index per node
+        node_class (type): Node type to build the tree from
+
+    Returns:
+        Tree: The built tree
+
+    Raises:
+        ValueError: If the lengths differ or the array is not exactly one tree
+    """
+    nodes: List[TreeNode] = []
+    roots: List[TreeNode] = []
+    # Children whose parent index has not been reached yet.
+    pending: Dict[int, List[TreeNode]] = {}
+    for value, parent_index in zip_longest(values, parents, fillvalue=_MISSING):
+        if value is _MISSING or parent_index is _MISSING:
+            raise ValueError("values and parents have different lengths")
+        index = len(nodes)
+        node = node_class(value=value)
+        nodes.append(node)
+        if parent_index is None or parent_index < 0:
+            roots.append(node)
+        elif parent_index < index:
+            _link(nodes[parent_index], node)
+        elif parent_index == index:
+            raise ValueError(f"input contains a cycle: node {index} is its own parent")
+        else:
+            pending.setdefault(parent_index, []).append(node)
+        waiting = pending.pop(index, None)
+        if waiting:
+            for child in waiting:
+                _link(node, child)
+    if pending:
+        raise ValueError(f"parent indexes out of range: {_quote(sorted(pending))}")
+    if not nodes:
+        raise ValueError("no nodes given")
+    return _finish(_single_root(roots, "node"), len(nodes), node_class)
+
+
+def tree_from_paths(paths: Iterable[Union[str, Sequence[Any]]], sep: str = "/",
+                    node_class: type = TreeNode) -> Tree:
+    """Build a tree from delimited paths in one pass.
+
+    Every path starts at the root, e.g. ``"root/a/b"``; missing
+    intermediate nodes are created on the way and shared by later paths.
+    Empty components (``"root//a"``, a trailing separator) are ignored.
+    Paths may also be given as sequences of values.
+
+    Args:
+        paths (Iterable[Union[str, Sequence]]): Paths from the root
+        sep (str): Separator between path components
+        node_class (type): Node type to build the tree from
+
+    Returns:
+        Tree: The built tree
+
+    Raises:
+        ValueError: If no path is given or paths start at different roots
+    """
+    root = None
+    count = 0
+    # Children of each node by value, only for nodes that have children.
+    lookup: Dict[int, Dict[Any, TreeNode]] = {}
+    for path in paths:
+        if isinstance(path, str):
+            parts = [part for part in path.split(sep) if part]
+        else:
+            parts = list(path)
+        if not parts:
+            continue
+        if root is None:
+            root = node_class(value=parts[0])
+            count = 1
+        elif parts[0] != root.value:
+            raise ValueError(f"path {path!r} does not start at the root {root.value!r}")
+        node = root
+        for part in islice(parts, 1, None):
+            children = lookup.get(id(node))
+            if children is None:
+                children = lookup[id(node)] = {}
+            child = children.get(part)
+            if child is None:
+                child = children[part] = node_class(value=part)
+                _link(node, child)
+                count += 1
+            node = child
+    if root is None:
+        raise ValueError("no paths given")
+    tree = Tree(node_class=node_class)
+    tree.root = root
+    tree._node_count = count
+    return tree
@@ -0,0 +1,247 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Diffing - Edit scripts between trees and their replay.
+
+:func:`diff_trees` compares two trees top-down using the Merkle digests of
+:mod:`hashing`: a pair of subtrees with equal digests is skipped without
+being visited, so only the paths leading to changes are walked. With
+hashing enabled (and warm) on both trees, the work is proportional to the
+number of changed nodes times their depth and fan-out, not to the size of
+the trees.
+
+The result is an edit script: a list of JSON-serializable operations that
+:func:`apply_patch` replays in order. Nodes are addressed by paths (lists
+of child indexes from the root) valid at the moment the operation runs:
+
+- ``{"op": "update", "path": p, "value": v}``: replace a value
+- ``{"op": "metadata", "path": p, "set": {...}, "unset": [...]}``: change metadata keys
+- ``{"op": "delete", "path": p}``: remove a subtree
+- ``{"op": "insert", "path": parent, "index": i, "node": {...}}``: insert a
+  subtree given in the :meth:`Tree.to_dict` layout
+- ``{"op": "move", "path": p, "to": parent, "index": i}``: move a subtree
+
+Children are aligned per parent: identical subtrees are matched by
+digest, then remaining children by equal value, then by position, and
+matched children that changed order are moved. Parents with an ordered
+child index keep their children in key order, so :func:`apply_patch`
+rejects an insert or move that would put a child anywhere else.
+
+Example:
+    >>> script = old.diff(new)
+    >>> payload = json.dumps(script)              # ship only the changes
+    >>> old.apply_patch(json.loads(payload))
+    >>> old.equals(new)
+    True
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from .generic_tree import Tree, TreeNode, _same_items, _same_value
+except ImportError:
+    from generic_tree import Tree, TreeNode, _same_items, _same_value
+
+
+def _align(old_children: Sequence[TreeNode], new_children: Sequence[TreeNode],
+           old_digest, new_digest) -> List[Optional[int]]:
+    """Pair each new child with an old child index (or None for an insertion)."""
+    pairs: List[Optional[int]] = [None] * len(new_children)
+    used = [False] * len(old_children)
+    by_digest: Dict[bytes, List[int]] = {}
+    for index in range(len(old_children) - 1, -1, -1):
+        by_digest.setdefault(old_digest(old_children[index]), []).append(index)
+    for position, child in enumerate(new_children):
+        candidates = by_digest.get(new_digest(child))
+        if candidates:
+            index = candidates.pop()
+            pairs[position] = index
+            used[index] = True
+    if all(used) or all(pair is not None for pair in pairs):
+        return pairs
+    # Unhashable values are left for the positional pass.
+    by_value: Dict[Any, List[int]] = {}
+    for index in range(len(old_children) - 1, -1, -1):
+        if used[index]:
+            continue
+        try:
+            by_value.setdefault(old_children[index].value, []).append(index)
+        except TypeError:
+            pass
+    for position, child in enumerate(new_children):
+        if pairs[position] is not None:
+            continue
+        try:
+            candidates = by_value.get(child.value)
+        except TypeError:
+            candidates = None
+        if candidates:
+            index = candidates.pop()
+            pairs[position] = index
+            used[index] = True
+    remaining = [index for index in range(len(old_children)) if not used[index]]
+    remaining.reverse()
+    for position, child in enumerate(new_children):
+        if pairs[position] is None and remaining:
+            pairs[position] = remaining.pop()
+    return pairs
+
+
+def diff_trees(old: Tree, new: Tree) -> List[Dict[str, Any]]:
+    """Compute an edit script turning ``old`` into ``new``.
+
+    Args:
+        old (Tree): The tree the script applies to
+        new (Tree): The tree the script produces
+
+    Returns:
+        List[Dict[str, Any]]: The edit operations, in replay order
+    """
+    old_hashes = old._digests()
+    new_hashes = new._digests()
+    old_digest = old_hashes.digest
+    new_digest = new_hashes.digest
+    script: List[Dict[str, Any]] = []
+    stack = [(old.root, new.root, [])]
+    while stack:
+        source, target, path = stack.pop()
+        if old_digest(source) == new_digest(target):
+            continue
+        if not _same_value(source.value, target.value):
+            script.append({'op': 'update', 'path': path, 'value': target.value})
+        if not _same_items(source.metadata, target.metadata):
+            before = source.metadata
+            after = target.metadata
+            script.append({'op': 'metadata', 'path': path,
+                           'set': {key: value for key, value in after.items()
+                                   if key not in before or not _same_value(before[key], value)},
+                           'unset': [key for key in before if key not in after]})
+        old_children = source.children
+        new_children = target.children
+        pairs = _align(old_children, new_children, old_digest, new_digest)
+        paired = set(index for index in pairs if index is not None)
+        for index in range(len(old_children) - 1, -1, -1):
+            if index not in paired:
+                script.append({'op': 'delete', 'path': path + [index]})
+        # Current order of the surviving old children, as old indexes.
+        current = [index for index in range(len(old_children)) if index in paired]
+        for position, index in enumerate(pairs):
+            if index is None:
+                script.append({'op': 'insert', 'path': path, 'index': position,
+                               'node': new.to_dict(new_children[position])})
+                current.insert(position, -1)
+                continue
+            at = current.index(index, position)
+            if at != position:
+                script.append({'op': 'move', 'path': path + [at], 'to': path,
+                               'index': position})
+                del current[at]
+                current.insert(position, index)
+        for position in range(len(pairs) - 1, -1, -1):
+            index = pairs[position]
+            if index is not None:
+                stack.append((old_children[index], new_children[position], path + [position]))
+    return script
+
+
+def _resolve(tree: Tree, path: Sequence[int]) -> TreeNode:
+    node = tree.root
+    for index in path:
+        child = node.get_child_by_index(index)
+        if child is None:
+            raise IndexError(f"no node at path {list(path)!r}")
+        node = child
+    return node
+
+
+def _check_order(parent: TreeNode, value: Any, index: int) -> None:
+    """Reject placing ``value`` at ``index`` against an ordered child index.
+
+    Such parents place children by key, so a script built against another
+    order would leave the later paths pointing at the wrong nodes.
+    """
+    lookup = parent.child_index
+    if lookup is not None and lookup.ordered and lookup.position_for(value) != index:
+        raise _order_error(parent, index)
+
+
+def _order_error(parent: TreeNode, index: int) -> ValueError:
+    return ValueError(f"position {index} contradicts the key order of the "
+                      f"ordered child index at {parent.value!r}")
+
+
+def _place(tree: Tree, parent: TreeNode, node: TreeNode, index: int) -> None:
+    """Move the last child ``node`` of ``parent`` to position ``index``.
+
+    Parents with an ordered child index already placed ``node`` by key
+    (at ``index``, see :func:`_check_order`).
+    """
+    if parent.child_index is not None and parent.child_index.ordered:
+        return
+    children = parent.children
+    if index < len(children) - 1:
+        children.pop()
+        children.insert(index, node)
+        if tree._listeners:
+            tree._reordered(parent)
+
+
+def apply_patch(tree: Tree, script: Sequence[Dict[str, Any]]) -> None:
+    """Replay an edit script produced by :func:`diff_trees` on a tree.
+
+    Edits go through the tree and node methods, so indexes, aggregates and
+    digests stay current.
+
+    Args:
+        tree (Tree): The tree to edit in place
+        script (Sequence[Dict[str, Any]]): The edit operations
+
+    Raises:
+        ValueError: If an operation is unknown, or puts a child at a position
+            that an ordered child index would not give it
+        IndexError: If a path does not exist in the tree
+    """
+    for operation in script:
+        kind = operation['op']
+        node = _resolve(tree, operation['path'])
+        if kind == 'update':
+            node.set_value(operation['value'])
+        elif kind == 'metadata':
+            for key in operation.get('unset', ()):
+                node.remove_metadata(key)
+            for key, value in operation.get('set', {}).items():
+                node.set_metadata(key, value)
+        elif kind == 'delete':
+            tree.remove_child(node.parent, node)
+        elif kind == 'insert':
+            data = operation['node']
+            _check_order(node, data.get('value'), operation['index'])
+            child = type(tree.root)(value=data.get('value'))
+            if 'metadata' in data:
+                child.metadata = dict(data['metadata'])
+            Tree._build_from_dict(child, data.get('children', []))
+            tree.add_node(node, child)
+            _place(tree, node, child, operation['index'])
+        elif kind == 'move':
+            target = _resolve(tree, operation['to'])
+            if node.parent is target:
+                lookup = target.child_index
+                if lookup is not None and lookup.ordered:
+                    if target._child_index(node) != operation['index']:
+                        raise _order_error(target, operation['index'])
+                    continue
+                children = target.children
+                children.pop(target._child_index(node))
+                children.insert(operation['index'], node)
+                if tree._listeners:
+                    tree._reordered(target)
+            else:
+                _check_order(target, node.value, operation['index'])
+                tree.remove_child(node.parent, node)
+                tree.add_node(target, node)
+                _place(tree, target, node, operation['index'])
+        else:
+            raise ValueError(f"unknown patch operation {kind!r}")
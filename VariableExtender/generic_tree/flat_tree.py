@@ -0,0 +1,366 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Flat Tree - Array-backed, read-mostly representation of a generic tree.
+
+A :class:`FlatTree` stores the structure of a tree in parallel integer
+arrays instead of linked :class:`TreeNode` objects. Nodes are numbered in
+pre-order, so every subtree occupies a contiguous index range and most
+queries become tight loops (or plain slices) over ``array.array`` columns.
+Values and metadata live in side columns.
+
+Columns (indexed by node number, ``-1`` means "none"):
+    parent: Index of the parent node
+    first_child: Index of the first child
+    next_sibling: Index of the next sibling
+    depth: Distance from the flat tree's root
+    size: Number of nodes in the subtree rooted at the node
+    values: Node values (a Python list)
+    metadata: Sparse mapping ``index -> metadata dict`` for nodes that have any
+
+Example:
+    >>> tree = Tree(root_value="root")
+    >>> child = tree.add_child(tree.root, "child")
+    >>> flat = tree.to_flat()
+    >>> [flat.values[i] for i in flat.traverse()]
+    ['root', 'child']
+    >>> flat.to_tree().get_node_count()
+    2
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:
+    from .generic_tree import Tree, TreeNode, TraversalMode
+except ImportError:
+    from generic_tree import Tree, TreeNode, TraversalMode
+
+
+def _index_typecode(node_count: int) -> str:
+    """Pick the smallest signed array typecode able to hold node indexes."""
+    return 'i' if node_count < 2 ** 31 else 'q'
+
+
+class FlatTree:
+    """Columnar tree with structure stored in parallel integer arrays.
+
+    Attributes:
+        parent (array): Parent index per node (-1 for the root)
+        first_child (array): First child index per node (-1 for leaves)
+        next_sibling (array): Next sibling index per node (-1 for last children)
+        depth (array): Depth per node (0 for the root)
+        size (array): Subtree size per node (1 for leaves)
+        values (List[Any]): Value per node
+        metadata (Dict[int, Dict[str, Any]]): Metadata of the nodes that have any
+    """
+
+    def __init__(self, values: List[Any], parent: array, first_child: array,
+                 next_sibling: array, depth: array, size: array,
+                 metadata: Optional[Dict[int, Dict[str, Any]]] = None):
+        """Initialize a flat tree from prepared pre-order columns.
+
+        Use :meth:`from_tree` or :meth:`Tree.to_flat` to build one from a tree.
+
+        Args:
+            values (List[Any]): Value per node, in pre-order
+            parent (array): Parent index per node
+            first_child (array): First child index per node
+            next_sibling (array): Next sibling index per node
+            depth (array): Depth per node
+            size (array): Subtree size per node
+            metadata (Optional[Dict[int, Dict[str, Any]]]): Sparse metadata column
+        """
+        self.values = values
+        self.parent = parent
+        self.first_child = first_child
+        self.next_sibling = next_sibling
+        self.depth = depth
+        self.size = size
+        self.metadata = metadata if metadata is not None else {}
+
+    @classmethod
+    def from_tree(cls, source: Union[Tree, TreeNode],
+                  include_metadata: bool = True) -> FlatTree:
+        """Build a flat tree from a tree or from the subtree below a node.
+
+        Args:
+            source (Union[Tree, TreeNode]): Tree, or node whose subtree is flattened
+            include_metadata (bool): Whether to copy node metadata
+
+        Returns:
+            FlatTree: The flattened tree
+        """
+        root = source.root if isinstance(source, Tree) else source
+        values: List[Any] = []
+        parents: List[int] = []
+        depths: List[int] = []
+        metadata: Dict[int, Dict[str, Any]] = {}
+        stack = [(root, -1, 0)]
+        while stack:
+            node, parent_index, node_depth = stack.pop()
+            index = len(values)
+            values.append(node.value)
+            parents.append(parent_index)
+            depths.append(node_depth)
+            if include_metadata and node.metadata:
+                metadata[index] = node.metadata.copy()
+            children = node.children
+            if children:
+                child_depth = node_depth + 1
+                stack.extend((child, index, child_depth) for child in reversed(children))
+        return cls._from_columns(values, parents, depths, metadata)
+
+    @classmethod
+    def _from_columns(cls, values: List[Any], parents: List[int], depths: List[int],
+                      metadata: Dict[int, Dict[str, Any]]) -> FlatTree:
+        """Derive the sibling, child and size columns from pre-order parents."""
+        count = len(values)
+        typecode = _index_typecode(count)
+        first_child = array(typecode, [-1]) * count
+        next_sibling = array(typecode, [-1]) * count
+        last_child = array(typecode, [-1]) * count
+        for index in range(1, count):
+            parent_index = parents[index]
+            previous = last_child[parent_index]
+            if previous < 0:
+                first_child[parent_index] = index
+            else:
+                next_sibling[previous] = index
+            last_child[parent_index] = index
+        size = array(typecode, [1]) * count
+        for index in range(count - 1, 0, -1):
+            size[parents[index]] += size[index]
+        return cls(values, array(typecode, parents), first_child, next_sibling,
+                   array(typecode, depths), size, metadata)
+
+    def to_tree(self, node_class: type = TreeNode) -> Tree:
+        """Materialize the flat tree as a linked :class:`Tree`.
+
+        Args:
+            node_class (type): Node type to build the tree from
+
+        Returns:
+            Tree: A new tree with the same structure, values and metadata
+        """
+        values = self.values
+        metadata = self.metadata
+        tree = Tree(root_value=values[0] if values else None, node_class=node_class)
+        if 0 in metadata:
+            tree.root.metadata = metadata[0].copy()
+        nodes = [tree.root]
+        parent = self.parent
+        for index in range(1, len(values)):
+            node = nodes[parent[index]].add_child(values[index])
+            if index in metadata:
+                node.metadata = metadata[index].copy()
+            nodes.append(node)
+        tree._node_count = max(len(values), 1)
+        return tree
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"FlatTree(nodes={len(self.values)}, height={self.height() if self.values else 0})"
+
+    def get_node_count(self) -> int:
+        """Get the total number of nodes.
+
+        Returns:
+            int: Total node count
+        """
+        return len(self.values)
+
+    def get_metadata(self, index: int, key: str, default: Any = None) -> Any:
+        """Get a metadata value of a node.
+
+        Args:
+            index (int): The node index
+            key (str): The metadata key
+            default (Any): Default value if key doesn't exist
+
+        Returns:
+            Any: The metadata value or default
+        """
+        node_metadata = self.metadata.get(index)
+        return default if node_metadata is None else node_metadata.get(key, default)
+
+    def children(self, index: int) -> List[int]:
+        """Get the child indexes of a node, in order.
+
+        Args:
+            index (int): The node index
+
+        Returns:
+            List[int]: Indexes of the children
+        """
+        result = []
+        next_sibling = self.next_sibling
+        child = self.first_child[index]
+        while child >= 0:
+            result.append(child)
+            child = next_sibling[child]
+        return result
+
+    def path_to_root(self, index: int) -> List[int]:
+        """Get the indexes from the root down to a node.
+
+        Args:
+            index (int): The node index
+
+        Returns:
+            List[int]: Indexes from the root to the node
+        """
+        path = []
+        parent = self.parent
+        while index >= 0:
+            path.append(index)
+            index = parent[index]
+        path.reverse()
+        return path
+
+    def subtree_range(self, index: int = 0) -> range:
+        """Get the contiguous index range covered by a subtree.
+
+        Args:
+            index (int): Root of the subtree
+
+        Returns:
+            range: Indexes of the subtree, in pre-order
+        """
+        return range(index, index + self.size[index])
+
+    def traverse(self, mode: TraversalMode = TraversalMode.PRE_ORDER,
+                 start: int = 0) -> Iterator[int]:
+        """Traverse node indexes in the specified mode.
+
+        Args:
+            mode (TraversalMode): The traversal mode to use
+            start (int): Index of the node to start from (default: root)
+
+        Yields:
+            int: Node indexes in traversal order
+        """
+        if not self.values:
+            return
+        if mode == TraversalMode.PRE_ORDER:
+            yield from self.subtree_range(start)
+        elif mode == TraversalMode.POST_ORDER:
+            yield from self._post_order(start)
+        elif mode == TraversalMode.LEVEL_ORDER:
+            yield from self._level_order(start)
+        elif mode == TraversalMode.IN_ORDER:
+            yield from self._in_order(start)
+
+    def _post_order(self, start: int) -> Iterator[int]:
+        """Post-order: a node is emitted once its next pre-order node leaves its range."""
+        parent = self.parent
+        pending = []
+        for index in self.subtree_range(start):
+            up = parent[index]
+            while pending and pending[-1] != up:
+                yield pending.pop()
+            pending.append(index)
+        while pending:
+            yield pending.pop()
+
+    def _level_order(self, start: int) -> Iterator[int]:
+        """Level-order: pre-order indexes bucketed by depth keep sibling order."""
+        depth = self.depth
+        base = depth[start]
+        levels: List[List[int]] = []
+        for index in self.subtree_range(start):
+            level = depth[index] - base
+            if level == len(levels):
+                levels.append([index])
+            else:
+                levels[level].append(index)
+        for level in levels:
+            yield from level
+
+    def _in_order(self, start: int) -> Iterator[int]:
+        """In-order: first half of the children, the node, then the rest."""
+        stack = [(start, False)]
+        while stack:
+            index, expanded = stack.pop()
+            if expanded:
+                yield index
+                continue
+            children = self.children(index)
+            if not children:
+                yield index
+                continue
+            mid = len(children) // 2
+            stack.extend((child, False) for child in reversed(children[mid:]))
+            stack.append((index, True))
+            stack.extend((child, False) for child in reversed(children[:mid]))
+
+    def height(self, start: int = 0) -> int:
+        """Get the height of the tree (or of a subtree).
+
+        Args:
+            start (int): Root of the subtree (default: root)
+
+        Returns:
+            int: Height of the subtree
+        """
+        end = start + self.size[start]
+        return max(self.depth[start:end]) - self.depth[start]
+
+    def leaves(self, start: int = 0) -> List[int]:
+        """Get the indexes of all leaf nodes.
+
+        Args:
+            start (int): Root of the subtree (default: root)
+
+        Returns:
+            List[int]: Leaf indexes, in pre-order
+        """
+        first_child = self.first_child
+        return [index for index in self.subtree_range(start) if first_child[index] < 0]
+
+    def find(self, value: Any, start: int = 0) -> int:
+        """Find the first node (in pre-order) holding a value.
+
+        Args:
+            value (Any): The value to search for
+            start (int): Root of the subtree to search (default: root)
+
+        Returns:
+            int: Index of the node, or -1 if not found
+        """
+        end = start + self.size[start]
+        try:
+            return self.values.index(value, start, end)
+        except ValueError:
+            return -1
+
+    def subtree(self, start: int) -> FlatTree:
+        """Slice out the subtree rooted at a node as a new flat tree.
+
+        Args:
+            start (int): Root of the subtree
+
+        Returns:
+            FlatTree: The subtree, re-indexed from 0
+        """
+        end = start + self.size[start]
+        typecode = _index_typecode(end - start)
+
+        def rebase(column: array) -> array:
+            return array(typecode, [i - start if i >= 0 else -1 for i in column[start:end]])
+
+        parent = rebase(self.parent)
+        parent[0] = -1
+        next_sibling = rebase(self.next_sibling)
+        next_sibling[0] = -1
+        base = self.depth[start]
+        depth = array(typecode, [d - base for d in self.depth[start:end]])
+        metadata = {index - start: data.copy() for index, data in self.metadata.items()
+                    if start <= index < end}
+        return FlatTree(self.values[start:end], parent, rebase(self.first_child),
+                        next_sibling, depth, array(typecode, self.size[start:end]), metadata)
@@ -26,6 +26,7 @@ Example:
 
 Classes:
     TreeNode: Represents a single node in the tree
+    CompactTreeNode: Slotted, lazily allocated node for very large trees
     Tree: Manages the complete tree structure
     TraversalMode: Enumeration for traversal modes
 
@@ -35,8 +36,10 @@ Date: January 12, 2026
 
 from __future__ import annotations
 
-from typing import Any, Optional, Callable, List, Dict, Iterator
+from typing import Any, Optional, Callable, List, Dict, Iterable, Iterator, Tuple
 import json
+from bisect import bisect_left, insort
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -49,20 +52,72 @@ class TraversalMode(Enum):
     IN_ORDER = "in_order"          # Left subtree, parent, right subtree
 
 
-@dataclass
-class TreeNode:
-    """Represents a single node in a tree structure.
+_MISSING = object()
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    """Check that two values are equal and of the same types, recursing into
+    builtin containers (so ``1`` and ``True``, or ``[1]`` and ``(1,)``, differ)."""
+    kind = type(a)
+    if kind is not type(b):
+        return False
+    if kind is list or kind is tuple:
+        return len(a) == len(b) and all(map(_same_value, a, b))
+    if kind is dict:
+        return _same_items(a, b)
+    if kind is set or kind is frozenset:
+        if len(a) != len(b):
+            return False
+        members = {item: item for item in b}
+        return all(item in members and _same_value(item, members[item]) for item in a)
+    return a == b
+
+
+def _same_items(a: Dict[Any, Any], b: Dict[Any, Any]) -> bool:
+    """Check that two mappings hold the same keys and values (see :func:`_same_value`)."""
+    if len(a) != len(b):
+        return False
+    keys = {key: key for key in b}
+    for key, value in a.items():
+        if key not in keys or not _same_value(key, keys[key]):
+            return False
+        if not _same_value(value, b[key]):
+            return False
+    return True
+
+
+class _TreeListener:
+    """Base class for objects kept up to date with the edits of a :class:`Tree`.
     
-    Attributes:
-        value (Any): The value stored in this node
-        children (List[TreeNode]): List of child nodes
-        parent (Optional[TreeNode]): Reference to parent node
-        metadata (Dict[str, Any]): Custom metadata key-value pairs
+    Listeners are registered with ``Tree._add_listener``. While a tree has
+    listeners, each of its nodes carries a ``_tree`` back-reference so that
+    node-level edits (``TreeNode.add_child``, ``set_metadata``, ...) are
+    reported as well as the ``Tree`` methods. All hooks are no-ops here.
     """
-    value: Any = None
-    children: List[TreeNode] = field(default_factory=list)
-    parent: Optional[TreeNode] = field(default=None, repr=False)
-    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def attached(self, node: TreeNode) -> None:
+        """The subtree rooted at ``node`` was attached to the tree."""
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        """The subtree rooted at ``node`` was detached from ``parent``."""
+
+    def value_changed(self, node: TreeNode, old_value: Any) -> None:
+        """The value of ``node`` was replaced."""
+
+    def metadata_changed(self, node: TreeNode, key: str, old_value: Any) -> None:
+        """Metadata ``key`` of ``node`` changed (``old_value`` may be ``_MISSING``)."""
+
+    def reordered(self, node: TreeNode) -> None:
+        """The children of ``node`` were reordered."""
+
+
+class _TreeNodeMixin:
+    """Node behaviour shared by :class:`TreeNode` and :class:`CompactTreeNode`.
+    
+    Subclasses provide the ``value``, ``children``, ``parent``, ``metadata``,
+    ``_position``, ``_removed_slots``, ``_tree`` and ``_child_lookup`` attributes.
+    """
+    __slots__ = ()
 
     def add_child(self, value: Any) -> TreeNode:
         """Add a new child node with the given value.
@@ -72,38 +127,159 @@ class TreeNode:
             
         Returns:
             TreeNode: The newly created child node
+
+        Raises:
+            TypeError: If an ordered child index cannot compare the value's key
         """
-        child = TreeNode(value=value, parent=self)
-        self.children.append(child)
+        lookup = self._child_lookup
+        if lookup is not None:
+            lookup.position_for(value)
+        child = type(self)(value=value, parent=self)
+        if lookup is None:
+            child._position = self._next_slot()
+            self._append_child(child)
+        else:
+            lookup.insert(child)
+        if self._tree is not None:
+            self._tree._attached(child)
         return child
 
     def add_node(self, node: TreeNode) -> TreeNode:
         """Add an existing node as a child.
         
+        A node that still has a parent is detached from it first (a move).
+        
         Args:
             node (TreeNode): The node to add as a child
             
         Returns:
             TreeNode: The added node
+            
+        Raises:
+            ValueError: If ``node`` is this node or one of its ancestors
+            TypeError: If an ordered child index cannot compare the node's key;
+                ``node`` is left where it was
         """
+        if node is self or node.children:
+            ancestor = self
+            while ancestor is not None:
+                if ancestor is node:
+                    raise ValueError("cannot add a node below itself")
+                ancestor = ancestor.parent
+        lookup = self._child_lookup
+        if lookup is not None:
+            lookup.position_for(node.value)
+        if node.parent is not None:
+            node.parent.remove_child(node)
         node.parent = self
-        self.children.append(node)
+        if lookup is None:
+            node._position = self._next_slot()
+            self._append_child(node)
+        else:
+            lookup.insert(node)
+        if self._tree is not None:
+            self._tree._attached(node)
         return node
 
     def remove_child(self, node: TreeNode) -> bool:
         """Remove a child node.
         
+        The child is matched by identity, not by value equality.
+        
         Args:
             node (TreeNode): The child node to remove
             
         Returns:
             bool: True if removal was successful, False otherwise
         """
-        if node in self.children:
-            self.children.remove(node)
-            node.parent = None
-            return True
-        return False
+        index = self._child_index(node)
+        if index < 0:
+            return False
+        del self.children[index]
+        lookup = self._child_lookup
+        if lookup is not None:
+            lookup.discard(node, index)
+        if lookup is None or not lookup.ordered:
+            removed = self._removed_slots
+            if removed is None:
+                self._removed_slots = [node._position]
+            else:
+                insort(removed, node._position)
+                if len(removed) > len(self.children):
+                    self._renumber_children()
+        node._position = None
+        node.parent = None
+        if node._tree is not None:
+            node._tree._detached(node, self)
+        return True
+
+    def _append_child(self, node: TreeNode) -> None:
+        """Append a node to the children list."""
+        self.children.append(node)
+
+    def _next_slot(self) -> int:
+        """Return the position hint for a child appended to this node."""
+        removed = self._removed_slots
+        return len(self.children) + (len(removed) if removed else 0)
+
+    def _renumber_children(self) -> None:
+        """Reset the position hints of all children to their list index."""
+        for index, child in enumerate(self.children):
+            child._position = index
+        self._removed_slots = None
+
+    def _child_index(self, node: TreeNode) -> int:
+        """Get the index of a child by identity, or -1 if it is not a child."""
+        lookup = self._child_lookup
+        if lookup is not None and lookup.ordered:
+            return lookup.index_of(node)
+        children = self.children
+        slot = node._position
+        if slot is not None:
+            removed = self._removed_slots
+            index = slot - bisect_left(removed, slot) if removed else slot
+            if 0 <= index < len(children) and children[index] is node:
+                return index
+        if not children:
+            return -1
+        self._renumber_children()
+        slot = node._position
+        if slot is not None and slot < len(children) and children[slot] is node:
+            return slot
+        return -1
+
+    def get_index(self) -> Optional[int]:
+        """Get the position of this node among its parent's children.
+        
+        Returns:
+            Optional[int]: The index in the parent's children, or None for a root
+        """
+        if self.parent is None:
+            return None
+        index = self.parent._child_index(self)
+        return index if index >= 0 else None
+
+    def get_next_sibling(self) -> Optional[TreeNode]:
+        """Get the sibling immediately after this node.
+        
+        Returns:
+            Optional[TreeNode]: The next sibling, or None if there is none
+        """
+        index = self.get_index()
+        if index is None:
+            return None
+        return self.parent.get_child_by_index(index + 1)
+
+    def get_previous_sibling(self) -> Optional[TreeNode]:
+        """Get the sibling immediately before this node.
+        
+        Returns:
+            Optional[TreeNode]: The previous sibling, or None if there is none
+        """
+        index = self.get_index()
+        if not index:
+            return None
+        return self.parent.children[index - 1]
 
     def get_child_by_index(self, index: int) -> Optional[TreeNode]:
         """Get a child node by index.
@@ -121,12 +297,18 @@ class TreeNode:
     def get_child_by_value(self, value: Any) -> Optional[TreeNode]:
         """Get the first child node with the given value.
         
+        Answered from the child index when one is enabled (see
+        :meth:`enable_child_index`), otherwise by scanning the children.
+        
         Args:
             value (Any): The value to search for
             
         Returns:
             Optional[TreeNode]: The child with the value, or None if not found
         """
+        lookup = self._child_lookup
+        if lookup is not None:
+            return lookup.find(value)
         for child in self.children:
             if child.value == value:
                 return child
@@ -143,6 +325,74 @@ class TreeNode:
         """
         return [child for child in self.children if predicate(child.value)]
 
+    def get_children_in_range(self, low: Any = None, high: Any = None,
+                              include_low: bool = True,
+                              include_high: bool = True) -> List[TreeNode]:
+        """Get the children whose value lies between two bounds.
+        
+        With an ordered child index the bounds apply to the index keys and
+        are found by bisection; otherwise the children are scanned and
+        incomparable values are skipped.
+        
+        Args:
+            low (Any): Lower bound (None for no lower bound)
+            high (Any): Upper bound (None for no upper bound)
+            include_low (bool): Whether the lower bound is inclusive
+            include_high (bool): Whether the upper bound is inclusive
+            
+        Returns:
+            List[TreeNode]: Matching children, ordered by value (or key)
+        """
+        lookup = self._child_lookup
+        if lookup is not None and lookup.ordered:
+            return lookup.find_range(low, high, include_low, include_high)
+        try:
+            from .indexes import _in_range
+        except ImportError:
+            from indexes import _in_range
+        found = [child for child in self.children
+                 if _in_range(child.value, low, high, include_low, include_high)]
+        found.sort(key=lambda child: child.value)
+        return found
+
+    @property
+    def child_index(self):
+        """The active :class:`ChildIndex` of this node, or None when disabled."""
+        return self._child_lookup
+
+    def enable_child_index(self, ordered: bool = False,
+                           key: Optional[Callable[[Any], Any]] = None):
+        """Index the children of this node for fast lookups by value.
+        
+        Meant for very wide nodes: ``get_child_by_value`` becomes a hash
+        lookup. In ordered mode the children are sorted by ``key(value)``
+        and kept sorted as children are added or change value, lookups
+        bisect, and ``get_children_in_range`` slices the children.
+        
+        Args:
+            ordered (bool): Keep the children sorted instead of in insertion order
+            key (Optional[Callable]): Sort key for ordered mode (default: the value)
+            
+        Returns:
+            ChildIndex: The (new or already matching) child index
+        """
+        lookup = self._child_lookup
+        if lookup is not None and lookup.ordered == ordered and lookup.key is key:
+            return lookup
+        try:
+            from .indexes import ChildIndex
+        except ImportError:
+            from indexes import ChildIndex
+        self._child_lookup = None
+        self._child_lookup = ChildIndex(self, ordered, key)
+        return self._child_lookup
+
+    def disable_child_index(self) -> None:
+        """Drop the child index; the children keep their current order."""
+        if self._child_lookup is not None:
+            self._child_lookup = None
+            self._renumber_children()
+
     def child_count(self) -> int:
         """Get the number of direct children.
         
@@ -186,13 +436,31 @@ class TreeNode:
         Returns:
             List[TreeNode]: List of nodes from root to this node
         """
-        path = [self]
-        current = self.parent
+        path = []
+        current = self
         while current is not None:
-            path.insert(0, current)
+            path.append(current)
             current = current.parent
+        path.reverse()
         return path
 
+    def set_value(self, value: Any) -> None:
+        """Replace the value of this node.
+        
+        Unlike assigning ``node.value`` directly, this keeps the indexes of
+        the owning tree up to date.
+        
+        Args:
+            value (Any): The new value
+        """
+        old_value = self.value
+        self.value = value
+        parent = self.parent
+        if parent is not None and parent._child_lookup is not None:
+            parent._child_lookup.value_changed(self, old_value)
+        if self._tree is not None:
+            self._tree._value_changed(self, old_value)
+
     def set_metadata(self, key: str, value: Any) -> None:
         """Set a metadata key-value pair.
         
@@ -200,6 +468,14 @@ class TreeNode:
             key (str): The metadata key
             value (Any): The metadata value
         """
+        tree = self._tree
+        old_value = self.metadata.get(key, _MISSING) if tree is not None else _MISSING
+        self._store_metadata(key, value)
+        if tree is not None:
+            tree._metadata_changed(self, key, old_value)
+
+    def _store_metadata(self, key: str, value: Any) -> None:
+        """Store a metadata key-value pair."""
         self.metadata[key] = value
 
     def get_metadata(self, key: str, default: Any = None) -> Any:
@@ -225,8 +501,33 @@ class TreeNode:
         """
         return key in self.metadata
 
+    def remove_metadata(self, key: str) -> bool:
+        """Remove a metadata key.
+
+        Args:
+            key (str): The metadata key
+
+        Returns:
+            bool: True if the key existed, False otherwise
+        """
+        if key not in self.metadata:
+            return False
+        old_value = self.metadata.pop(key)
+        if self._tree is not None:
+            self._tree._metadata_changed(self, key, old_value)
+        return True
+
     def clear_metadata(self) -> None:
         """Clear all metadata for this node."""
+        tree = self._tree
+        old_metadata = dict(self.metadata) if tree is not None else None
+        self._drop_metadata()
+        if old_metadata:
+            for key, old_value in old_metadata.items():
+                tree._metadata_changed(self, key, old_value)
+
+    def _drop_metadata(self) -> None:
+        """Remove every stored metadata entry."""
         self.metadata.clear()
 
     def clone(self, deep: bool = True) -> TreeNode:
@@ -238,13 +539,199 @@ class TreeNode:
         Returns:
             TreeNode: A cloned copy of this node
         """
-        cloned = TreeNode(value=self.value, metadata=self.metadata.copy())
+        cloned = type(self)(value=self.value, metadata=self.metadata.copy())
         if deep:
-            for child in self.children:
-                cloned.add_node(child.clone(deep=True))
+            stack = [(self, cloned)]
+            while stack:
+                source, target = stack.pop()
+                for child in source.children:
+                    copied = target.add_child(child.value)
+                    copied.metadata = child.metadata.copy()
+                    stack.append((child, copied))
         return cloned
 
 
+@dataclass
+class TreeNode(_TreeNodeMixin):
+    """Represents a single node in a tree structure.
+    
+    Children are tracked by identity: each child keeps a position hint in
+    its parent's numbering, and the parent records the slots removed since
+    the last renumbering. Looking up a child's index therefore costs a
+    bisect instead of a scan comparing whole subtrees with ``==``. Hints
+    are always validated against ``children``, so direct edits of the list
+    (sorting, reversing, inserting) are detected and trigger a renumbering.
+    
+    Attributes:
+        value (Any): The value stored in this node
+        children (List[TreeNode]): List of child nodes
+        parent (Optional[TreeNode]): Reference to parent node
+        metadata (Dict[str, Any]): Custom metadata key-value pairs
+    """
+    value: Any = None
+    children: List[TreeNode] = field(default_factory=list)
+    parent: Optional[TreeNode] = field(default=None, repr=False)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    _position: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _removed_slots: Optional[List[int]] = field(default=None, init=False, repr=False,
+                                                compare=False)
+    _tree: Optional[Tree] = field(default=None, init=False, repr=False, compare=False)
+    _child_lookup: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+
+
+class _EmptyChildren(list):
+    """Shared read-only empty child list of unallocated compact nodes.
+    
+    Order-only operations are no-ops; anything that would add a child raises,
+    because the list is shared by every leaf. Use ``add_child``/``add_node``.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("children of a CompactTreeNode are allocated on first "
+                        "add_child()/add_node(); this empty list is read-only")
+
+    append = extend = insert = __setitem__ = __iadd__ = __imul__ = _read_only
+
+    def clear(self) -> None:
+        """Nothing to clear."""
+
+    def reverse(self) -> None:
+        """Nothing to reverse."""
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """Nothing to sort."""
+
+
+class _EmptyMetadata(dict):
+    """Shared read-only empty metadata dict of unallocated compact nodes."""
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("metadata of a CompactTreeNode is allocated on first "
+                        "set_metadata(); this empty dict is read-only")
+
+    __setitem__ = update = setdefault = __ior__ = _read_only
+
+    def clear(self) -> None:
+        """Nothing to clear."""
+
+
+_NO_CHILDREN = _EmptyChildren()
+_NO_METADATA = _EmptyMetadata()
+
+
+class CompactTreeNode(_TreeNodeMixin):
+    """Memory-lean tree node using ``__slots__`` and lazy containers.
+    
+    API-compatible with :class:`TreeNode`, but without a per-instance
+    ``__dict__``. The ``children`` list and ``metadata`` dict are only
+    allocated when first written through ``add_child``/``add_node`` or
+    ``set_metadata``; until then reading them returns shared read-only empty
+    containers. Compact nodes compare by identity.
+    
+    Example:
+        >>> tree = Tree(root_value="root", node_class=CompactTreeNode)
+        >>> leaf = tree.add_child(tree.root, "leaf")
+        >>> leaf.children
+        []
+    
+    Attributes:
+        value (Any): The value stored in this node
+        children (List[CompactTreeNode]): List of child nodes
+        parent (Optional[CompactTreeNode]): Reference to parent node
+        metadata (Dict[str, Any]): Custom metadata key-value pairs
+    """
+    __slots__ = ('value', 'parent', '_children', '_metadata', '_position', '_removed_slots',
+                 '_tree', '_child_lookup')
+
+    def __init__(self, value: Any = None, children: Optional[List[CompactTreeNode]] = None,
+                 parent: Optional[CompactTreeNode] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """Initialize a compact node.
+        
+        Args:
+            value (Any): The value stored in this node
+            children (Optional[List]): Initial child list (stored as given)
+            parent (Optional[CompactTreeNode]): Reference to parent node
+            metadata (Optional[Dict[str, Any]]): Initial metadata (stored as given)
+        """
+        self.value = value
+        self.parent = parent
+        self._children = children or None
+        self._metadata = metadata or None
+        self._position = None
+        self._removed_slots = None
+        self._tree = None
+        self._child_lookup = None
+
+    @property
+    def children(self) -> List[CompactTreeNode]:
+        """List of child nodes (a shared read-only list while empty)."""
+        children = self._children
+        return _NO_CHILDREN if children is None else children
+
+    @children.setter
+    def children(self, children: List[CompactTreeNode]) -> None:
+        self._children = children or None
+        self._removed_slots = None
+        if self._child_lookup is not None:
+            self._child_lookup.rebuild()
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadata key-value pairs (a shared read-only dict while empty)."""
+        metadata = self._metadata
+        return _NO_METADATA if metadata is None else metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Dict[str, Any]) -> None:
+        self._metadata = metadata or None
+
+    def _append_child(self, node: CompactTreeNode) -> None:
+        """Append a node, allocating the children list on first use."""
+        if self._children is None:
+            self._children = [node]
+        else:
+            self._children.append(node)
+
+    def is_leaf(self) -> bool:
+        """Check if this node is a leaf (has no children).
+        
+        Returns:
+            bool: True if node has no children, False otherwise
+        """
+        return not self._children
+
+    def _store_metadata(self, key: str, value: Any) -> None:
+        """Store a metadata key-value pair, allocating the dict on first use."""
+        if self._metadata is None:
+            self._metadata = {key: value}
+        else:
+            self._metadata[key] = value
+
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """Get a metadata value by key.
+        
+        Args:
+            key (str): The metadata key
+            default (Any): Default value if key doesn't exist
+            
+        Returns:
+            Any: The metadata value or default
+        """
+        metadata = self._metadata
+        return default if metadata is None else metadata.get(key, default)
+
+    def _drop_metadata(self) -> None:
+        """Release the metadata dict."""
+        self._metadata = None
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(value={self.value!r}, "
+                f"children={self.children!r}, metadata={self.metadata!r})")
+
+
 class Tree:
     """Manages a complete tree structure with various operations.
     
@@ -252,14 +739,25 @@ class Tree:
         root (TreeNode): The root node of the tree
     """
     
-    def __init__(self, root_value: Any = None):
+    def __init__(self, root_value: Any = None, node_class: type = TreeNode):
         """Initialize a new tree.
         
         Args:
             root_value (Any): The value for the root node
+            node_class (type): Node type to build the tree from, e.g.
+                :class:`TreeNode` (default) or :class:`CompactTreeNode`
         """
-        self.root = TreeNode(value=root_value)
+        self.root = node_class(value=root_value)
         self._node_count = 1
+        self._listeners: List[_TreeListener] = []
+        self._value_index = None
+        self._metadata_indexes: Dict[str, Any] = {}
+        self._aggregates = None
+        self._ancestor_index = None
+        self._hashes = None
+        self._journal = None
+        self._path_cache = None
+        self._path_aggregates = None
 
     def add_child(self, parent: TreeNode, value: Any) -> TreeNode:
         """Add a child to a parent node.
@@ -278,15 +776,31 @@ class Tree:
     def add_node(self, parent: TreeNode, node: TreeNode) -> TreeNode:
         """Add an existing node as a child.
         
+        A node that already belongs to this tree is moved under ``parent``.
+        A node still attached in another tree must be removed from that
+        tree first, so that its node count stays right.
+        
         Args:
             parent (TreeNode): The parent node
             node (TreeNode): The node to add
             
         Returns:
             TreeNode: The added node
+            
+        Raises:
+            ValueError: If ``node`` belongs to another tree, or ``parent`` is
+                ``node`` or one of its descendants
         """
+        if node.parent is None:
+            parent.add_node(node)
+            self._node_count += self._subtree_size(node)
+            return node
+        root = node.parent
+        while root.parent is not None:
+            root = root.parent
+        if root is not self.root:
+            raise ValueError("node belongs to another tree; remove it from that tree first")
         parent.add_node(node)
-        self._node_count += self._count_nodes(node)
         return node
 
     def remove_child(self, parent: TreeNode, child: TreeNode) -> bool:
@@ -299,10 +813,44 @@ class Tree:
         Returns:
             bool: True if removal was successful, False otherwise
         """
-        if parent.remove_child(child):
-            self._node_count -= self._count_nodes(child)
-            return True
-        return False
+        if parent._child_index(child) < 0:
+            return False
+        size = self._subtree_size(child)
+        parent.remove_child(child)
+        self._node_count -= size
+        return True
+
+    @property
+    def value_index(self):
+        """The active :class:`ValueIndex`, or None when value indexing is off."""
+        return self._value_index
+
+    def enable_value_index(self):
+        """Build a value -> nodes hash index and keep it up to date.
+        
+        Once enabled, ``get_node_by_value``, ``depth_first_search``,
+        ``breadth_first_search`` and ``find_path`` answer from the index in
+        O(1) average time. The index follows edits made through the tree and
+        node methods; values assigned directly to ``node.value`` are not seen,
+        use ``TreeNode.set_value`` or ``value_index.rebuild()``.
+        
+        Returns:
+            ValueIndex: The (new or already active) index
+        """
+        if self._value_index is None:
+            try:
+                from .indexes import ValueIndex
+            except ImportError:
+                from indexes import ValueIndex
+            self._value_index = ValueIndex(self)
+            self._add_listener(self._value_index)
+        return self._value_index
+
+    def disable_value_index(self) -> None:
+        """Drop the value index; lookups go back to scanning the tree."""
+        if self._value_index is not None:
+            self._remove_listener(self._value_index)
+            self._value_index = None
 
     def get_node_by_value(self, value: Any, start: Optional[TreeNode] = None) -> Optional[TreeNode]:
         """Find a node by its value.
@@ -314,6 +862,8 @@ class Tree:
         Returns:
             Optional[TreeNode]: The found node, or None if not found
         """
+        if self._value_index is not None:
+            return self._value_index.find(value, start)
         search_root = start or self.root
         for node in self.traverse(TraversalMode.PRE_ORDER, search_root):
             if node.value == value:
@@ -335,6 +885,109 @@ class Tree:
         return [node for node in self.traverse(TraversalMode.PRE_ORDER, search_root)
                 if predicate(node.value)]
 
+    def create_metadata_index(self, key: str):
+        """Declare a secondary index on a metadata key.
+        
+        The index is kept up to date by ``set_metadata``, ``clear_metadata``
+        and structural edits, and is used by ``find_by_metadata`` and
+        ``find_by_metadata_range``.
+        
+        Args:
+            key (str): The metadata key to index
+            
+        Returns:
+            MetadataIndex: The (new or already existing) index for the key
+        """
+        index = self._metadata_indexes.get(key)
+        if index is None:
+            try:
+                from .indexes import MetadataIndex
+            except ImportError:
+                from indexes import MetadataIndex
+            index = MetadataIndex(self, key)
+            self._metadata_indexes[key] = index
+            self._add_listener(index)
+        return index
+
+    def drop_metadata_index(self, key: str) -> bool:
+        """Remove the secondary index on a metadata key.
+        
+        Args:
+            key (str): The indexed metadata key
+            
+        Returns:
+            bool: True if an index was removed, False otherwise
+        """
+        index = self._metadata_indexes.pop(key, None)
+        if index is None:
+            return False
+        self._remove_listener(index)
+        return True
+
+    def get_metadata_index(self, key: str):
+        """Get the secondary index on a metadata key.
+        
+        Args:
+            key (str): The metadata key
+            
+        Returns:
+            Optional[MetadataIndex]: The index, or None if the key is not indexed
+        """
+        return self._metadata_indexes.get(key)
+
+    def find_by_metadata(self, key: str, value: Any,
+                         start: Optional[TreeNode] = None) -> List[TreeNode]:
+        """Find all nodes whose metadata ``key`` equals ``value``.
+        
+        Uses the secondary index on ``key`` when one exists (results then
+        come in no particular order), otherwise scans in pre-order.
+        
+        Args:
+            key (str): The metadata key
+            value (Any): The metadata value to match
+            start (Optional[TreeNode]): Node to start search from (default: root)
+            
+        Returns:
+            List[TreeNode]: List of matching nodes
+        """
+        index = self._metadata_indexes.get(key)
+        search_root = start or self.root
+        if index is not None and search_root._tree is self:
+            return index.find(value, search_root)
+        return [node for node in self._pre_order(search_root)
+                if node.metadata.get(key, _MISSING) == value]
+
+    def find_by_metadata_range(self, key: str, low: Any = None, high: Any = None,
+                               start: Optional[TreeNode] = None,
+                               include_low: bool = True,
+                               include_high: bool = True) -> List[TreeNode]:
+        """Find all nodes whose metadata ``key`` lies between two bounds.
+        
+        Args:
+            key (str): The metadata key
+            low (Any): Lower bound (None for no lower bound)
+            high (Any): Upper bound (None for no upper bound)
+            start (Optional[TreeNode]): Node to start search from (default: root)
+            include_low (bool): Whether the lower bound is inclusive
+            include_high (bool): Whether the upper bound is inclusive
+            
+        Returns:
+            List[TreeNode]: Matching nodes, ordered by metadata value
+        """
+        index = self._metadata_indexes.get(key)
+        search_root = start or self.root
+        if index is not None and search_root._tree is self:
+            return index.find_range(low, high, search_root, include_low, include_high)
+        try:
+            from .indexes import _in_range
+        except ImportError:
+            from indexes import _in_range
+        found = [node for node in self._pre_order(search_root)
+                 if key in node.metadata
+                 and _in_range(node.metadata[key], low, high, include_low, include_high)]
+        found.sort(key=lambda node: node.metadata[key])
+        return found
+
     def get_all_leaf_nodes(self, start: Optional[TreeNode] = None) -> List[TreeNode]:
         """Get all leaf nodes in the tree.
         
@@ -360,6 +1013,238 @@ class Tree:
         search_root = start or self.root
         return list(self.traverse(TraversalMode.PRE_ORDER, search_root))
 
+    @property
+    def aggregates(self):
+        """The active :class:`SubtreeAggregates` cache, or None when disabled."""
+        return self._aggregates
+
+    def enable_aggregates(self):
+        """Cache subtree size, height, leaf count and balance per node.
+        
+        Once enabled, ``get_height``, ``get_subtree_height``, ``is_balanced``,
+        ``get_subtree_size`` and ``get_leaf_count`` are O(1) after their first
+        computation, and edits only invalidate the path to the root. Custom
+        associative aggregates can be registered on the returned object.
+        
+        Returns:
+            SubtreeAggregates: The (new or already active) aggregate cache
+        """
+        if self._aggregates is None:
+            try:
+                from .aggregates import SubtreeAggregates
+            except ImportError:
+                from aggregates import SubtreeAggregates
+            self._aggregates = SubtreeAggregates(self)
+            self._add_listener(self._aggregates)
+        return self._aggregates
+
+    def disable_aggregates(self) -> None:
+        """Drop the aggregate cache."""
+        if self._aggregates is not None:
+            self._remove_listener(self._aggregates)
+            self._aggregates = None
+
+    @property
+    def ancestor_index(self):
+        """The active :class:`AncestorIndex`, or None when disabled."""
+        return self._ancestor_index
+
+    def enable_ancestor_index(self):
+        """Number the nodes for O(1) ancestor and lowest-common-ancestor queries.
+        
+        Meant for frozen or rarely-mutated trees: structural edits mark the
+        index stale and the next query rebuilds it. Once enabled,
+        ``get_common_ancestor`` uses it.
+        
+        Returns:
+            AncestorIndex: The (new or already active) ancestor index
+        """
+        if self._ancestor_index is None:
+            try:
+                from .ancestry import AncestorIndex
+            except ImportError:
+                from ancestry import AncestorIndex
+            self._ancestor_index = AncestorIndex(self)
+            self._add_listener(self._ancestor_index)
+        return self._ancestor_index
+
+    def disable_ancestor_index(self) -> None:
+        """Drop the ancestor index."""
+        if self._ancestor_index is not None:
+            self._remove_listener(self._ancestor_index)
+            self._ancestor_index = None
+
+    @property
+    def path_aggregates(self):
+        """The active :class:`PathAggregates` index, or None when disabled."""
+        return self._path_aggregates
+
+    def enable_path_aggregates(self, weight: Optional[Callable[[TreeNode], Any]] = None):
+        """Index node weights for path sum/min/max queries in O(log² n).
+        
+        Uses a heavy-light decomposition over segment trees. Value and
+        metadata edits update the index in O(log n); structural edits mark it
+        stale and the next query rebuilds it.
+        
+        Args:
+            weight (Optional[Callable]): Weight of a node (default: its value)
+            
+        Returns:
+            PathAggregates: The (new or already active) path aggregate index
+        """
+        if self._path_aggregates is None:
+            try:
+                from .heavy_light import PathAggregates
+            except ImportError:
+                from heavy_light import PathAggregates
+            self._path_aggregates = PathAggregates(self, weight)
+            self._add_listener(self._path_aggregates)
+        return self._path_aggregates
+
+    def disable_path_aggregates(self) -> None:
+        """Drop the path aggregate index."""
+        if self._path_aggregates is not None:
+            self._remove_listener(self._path_aggregates)
+            self._path_aggregates = None
+
+    @property
+    def hashes(self):
+        """The active :class:`SubtreeHashes` cache, or None when disabled."""
+        return self._hashes
+
+    def enable_hashing(self):
+        """Cache a Merkle content digest per subtree and keep it up to date.
+        
+        Once enabled and warm, ``equals`` between two hashed trees is O(1),
+        and edits only drop the digests on the path to the root.
+        
+        Returns:
+            SubtreeHashes: The (new or already active) digest cache
+        """
+        if self._hashes is None:
+            try:
+                from .hashing import SubtreeHashes
+            except ImportError:
+                from hashing import SubtreeHashes
+            self._hashes = SubtreeHashes(self)
+            self._add_listener(self._hashes)
+        return self._hashes
+
+    def disable_hashing(self) -> None:
+        """Drop the digest cache."""
+        if self._hashes is not None:
+            self._remove_listener(self._hashes)
+            self._hashes = None
+
+    def _digests(self):
+        """Get the active digest cache, or a throwaway one for a single query."""
+        if self._hashes is not None:
+            return self._hashes
+        try:
+            from .hashing import SubtreeHashes
+        except ImportError:
+            from hashing import SubtreeHashes
+        return SubtreeHashes(self)
+
+    def equals(self, other: Tree) -> bool:
+        """Check whether two trees have the same values, metadata and shape.
+        
+        Parents and node identities are ignored, but value types are not:
+        ``1``, ``1.0`` and ``True`` are different values here. When both trees
+        have hashing enabled the digests are compared (O(1) once computed);
+        otherwise, or when a digest covers objects hashed by identity, the
+        trees are walked side by side.
+        
+        Args:
+            other (Tree): The tree to compare with
+            
+        Returns:
+            bool: True if both trees hold the same content
+        """
+        if self._hashes is not None and other._hashes is not None:
+            if self._hashes.digest() == other._hashes.digest():
+                return True
+            if self._hashes.is_canonical() and other._hashes.is_canonical():
+                return False
+        stack = [(self.root, other.root)]
+        while stack:
+            left, right = stack.pop()
+            if (not _same_value(left.value, right.value)
+                    or len(left.children) != len(right.children)
+                    or not _same_items(left.metadata, right.metadata)):
+                return False
+            stack.extend(zip(left.children, right.children))
+        return True
+
+    def find_duplicate_subtrees(self, node: Optional[TreeNode] = None,
+                                min_size: int = 1) -> List[List[TreeNode]]:
+        """Group identical subtrees (same values, metadata and shape).
+        
+        Args:
+            node (Optional[TreeNode]): Node to start from (default: root)
+            min_size (int): Ignore subtrees with fewer nodes than this
+            
+        Returns:
+            List[List[TreeNode]]: Groups of two or more identical subtrees
+        """
+        return self._digests().find_duplicates(node, min_size)
+
+    def diff(self, other: Tree) -> List[Dict[str, Any]]:
+        """Compute an edit script that turns this tree into ``other``.
+        
+        Identical subtrees are skipped by comparing digests; enable hashing on
+        both trees to make repeated diffs proportional to the changes. See
+        :mod:`diffing` for the operations.
+        
+        Args:
+            other (Tree): The target tree
+            
+        Returns:
+            List[Dict[str, Any]]: JSON-serializable edit operations
+        """
+        try:
+            from .diffing import diff_trees
+        except ImportError:
+            from diffing import diff_trees
+        return diff_trees(self, other)
+
+    def apply_patch(self, script: List[Dict[str, Any]]) -> None:
+        """Replay an edit script produced by :meth:`diff` on this tree.
+        
+        Args:
+            script (List[Dict[str, Any]]): The edit operations
+        """
+        try:
+            from .diffing import apply_patch
+        except ImportError:
+            from diffing import apply_patch
+        apply_patch(self, script)
+
+    def get_subtree_size(self, node: Optional[TreeNode] = None) -> int:
+        """Get the number of nodes in a subtree.
+        
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+            
+        Returns:
+            int: Number of nodes in the subtree
+        """
+        return self._subtree_size(node or self.root)
+
+    def get_leaf_count(self, node: Optional[TreeNode] = None) -> int:
+        """Get the number of leaves in a subtree.
+        
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+            
+        Returns:
+            int: Number of leaves
+        """
+        current = node or self.root
+        if self._aggregates is not None and current._tree is self:
+            return self._aggregates.leaf_count(current)
+        return sum(1 for item in self._pre_order(current) if not item.children)
+
     def get_node_count(self) -> int:
         """Get the total number of nodes in the tree.
         
@@ -378,9 +1263,9 @@ class Tree:
             int: Height of the tree
         """
         current = node or self.root
-        if current.is_leaf():
-            return 0
-        return 1 + max((self.get_height(child) for child in current.children), default=0)
+        if self._aggregates is not None and current._tree is self:
+            return self._aggregates.height(current)
+        return self._subtree_height(current)
 
     def traverse(self, mode: TraversalMode = TraversalMode.PRE_ORDER, 
                  start: Optional[TreeNode] = None) -> Iterator[TreeNode]:
@@ -405,36 +1290,59 @@ class Tree:
             yield from self._in_order(node)
 
     def _pre_order(self, node: TreeNode) -> Iterator[TreeNode]:
-        """Pre-order traversal: parent then children."""
-        yield node
-        for child in node.children:
-            yield from self._pre_order(child)
+        """Pre-order traversal: parent then children (explicit stack)."""
+        stack = [node]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            current = pop()
+            yield current
+            if current.children:
+                extend(reversed(current.children))
 
     def _post_order(self, node: TreeNode) -> Iterator[TreeNode]:
-        """Post-order traversal: children then parent."""
-        for child in node.children:
-            yield from self._post_order(child)
-        yield node
+        """Post-order traversal: children then parent (explicit stack)."""
+        stack = [(node, iter(node.children))]
+        while stack:
+            current, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                yield current
+            else:
+                stack.append((child, iter(child.children)))
 
     def _level_order(self, node: TreeNode) -> Iterator[TreeNode]:
         """Level-order traversal: level by level."""
-        queue = [node]
+        queue = deque([node])
+        popleft = queue.popleft
+        extend = queue.extend
         while queue:
-            current = queue.pop(0)
+            current = popleft()
             yield current
-            queue.extend(current.children)
+            extend(current.children)
 
     def _in_order(self, node: TreeNode) -> Iterator[TreeNode]:
-        """In-order traversal: left subtree, parent, right subtree."""
-        if not node.is_leaf():
-            mid = len(node.children) // 2
-            for child in node.children[:mid]:
-                yield from self._in_order(child)
-        yield node
-        if not node.is_leaf():
-            mid = len(node.children) // 2
-            for child in node.children[mid:]:
-                yield from self._in_order(child)
+        """In-order traversal: left subtree, parent, right subtree.
+
+        The first half of the children (``len(children) // 2``) is visited
+        before the parent, the remaining children after it.
+        """
+        # Each entry is (node, expanded); an expanded node is ready to be yielded.
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                yield current
+                continue
+            children = current.children
+            if not children:
+                yield current
+                continue
+            mid = len(children) // 2
+            stack.extend((child, False) for child in reversed(children[mid:]))
+            stack.append((current, True))
+            stack.extend((child, False) for child in reversed(children[:mid]))
 
     def to_dict(self, node: Optional[TreeNode] = None, include_metadata: bool = True) -> Dict[str, Any]:
         """Convert the tree to a dictionary.
@@ -446,17 +1354,23 @@ class Tree:
         Returns:
             Dict[str, Any]: Dictionary representation of the tree
         """
-        current = node or self.root
-        result = {
-            'value': current.value,
-            'children': []
-        }
-        
-        if include_metadata and current.metadata:
-            result['metadata'] = current.metadata
+        def node_dict(item: TreeNode) -> Dict[str, Any]:
+            data = {'value': item.value, 'children': []}
+            if include_metadata and item.metadata:
+                data['metadata'] = item.metadata
+            return data
         
-        for child in current.children:
-            result['children'].append(self.to_dict(child, include_metadata))
+        current = node or self.root
+        result = node_dict(current)
+        stack = [(current, result)]
+        while stack:
+            item, data = stack.pop()
+            children_data = data['children']
+            for child in item.children:
+                child_data = node_dict(child)
+                children_data.append(child_data)
+                if child.children:
+                    stack.append((child, child_data))
         
         return result
 
@@ -472,52 +1386,208 @@ class Tree:
         Returns:
             str: JSON representation of the tree
         """
-        data = self.to_dict(node, include_metadata)
-        return json.dumps(data, indent=indent, default=str)
+        return ''.join(self._iter_json(node or self.root, include_metadata, indent))
+
+    def dump(self, fp, node: Optional[TreeNode] = None, include_metadata: bool = True,
+             indent: Optional[int] = None) -> None:
+        """Write the tree as JSON to a text file object, streaming node by node.
+        
+        The output is identical to :meth:`to_json`, but no intermediate
+        dictionary or string of the whole tree is built.
+        
+        Args:
+            fp: Writable text file object
+            node (Optional[TreeNode]): Node to start from (default: root)
+            include_metadata (bool): Whether to include metadata
+            indent (Optional[int]): JSON indentation level
+        """
+        write = fp.write
+        buffer: List[str] = []
+        for chunk in self._iter_json(node or self.root, include_metadata, indent):
+            buffer.append(chunk)
+            if len(buffer) >= 4096:
+                write(''.join(buffer))
+                buffer.clear()
+        if buffer:
+            write(''.join(buffer))
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> Tree:
+    def _iter_json(root: TreeNode, include_metadata: bool,
+                   indent: Optional[Any]) -> Iterator[str]:
+        """Yield the JSON text of a subtree, matching ``json.dumps(to_dict(...))``.
+        
+        Node dictionaries are written by hand with an explicit stack of child
+        iterators; values and metadata go through the same encoder settings
+        as ``json.dumps(..., indent=indent, default=str)``.
+        """
+        encoder = json.JSONEncoder(indent=indent, default=str)
+        if indent is None:
+            unit = None
+            separator = ', '
+        else:
+            unit = indent if isinstance(indent, str) else ' ' * indent
+            separator = ','
+        
+        def newline(level: int) -> str:
+            return '' if unit is None else '\n' + unit * level
+        
+        def encode(value: Any, level: int) -> str:
+            text = encoder.encode(value)
+            if unit is not None and '\n' in text:
+                # Raw newlines only come from indentation; strings escape theirs.
+                text = text.replace('\n', newline(level))
+            return text
+        
+        def open_node(item: TreeNode, level: int):
+            inner = level + 1
+            head = ('{' + newline(inner) + '"value": ' + encode(item.value, inner)
+                    + separator + newline(inner) + '"children": ')
+            closing = newline(level) + '}'
+            if include_metadata and item.metadata:
+                closing = (separator + newline(inner) + '"metadata": '
+                           + encode(item.metadata, inner) + closing)
+            if not item.children:
+                return head + '[]' + closing, None
+            frame = [iter(item.children), level + 2, newline(inner) + ']' + closing, True]
+            return head + '[' + newline(level + 2), frame
+        
+        chunk, frame = open_node(root, 0)
+        yield chunk
+        stack = [frame] if frame is not None else []
+        while stack:
+            frame = stack[-1]
+            child = next(frame[0], None)
+            if child is None:
+                stack.pop()
+                yield frame[2]
+                continue
+            chunk, child_frame = open_node(child, frame[1])
+            if frame[3]:
+                frame[3] = False
+            else:
+                chunk = separator + newline(frame[1]) + chunk
+            yield chunk
+            if child_frame is not None:
+                stack.append(child_frame)
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any], node_class: type = TreeNode) -> Tree:
         """Create a tree from a dictionary.
         
         Args:
             data (Dict[str, Any]): Dictionary representation of the tree
+            node_class (type): Node type to build the tree from
             
         Returns:
             Tree: A new tree constructed from the dictionary
         """
-        tree = Tree(root_value=data.get('value'))
+        tree = Tree(root_value=data.get('value'), node_class=node_class)
         
         if 'metadata' in data:
             tree.root.metadata = data['metadata']
         
-        for child_data in data.get('children', []):
-            Tree._build_from_dict(tree.root, child_data)
+        tree._node_count += Tree._build_from_dict(tree.root, data.get('children', []))
         
         return tree
 
     @staticmethod
-    def _build_from_dict(parent: TreeNode, child_data: Dict[str, Any]) -> None:
-        """Helper method to build tree from dictionary recursively."""
-        child = parent.add_child(child_data.get('value'))
-        
-        if 'metadata' in child_data:
-            child.metadata = child_data['metadata']
+    def _build_from_dict(parent: TreeNode, children_data: List[Dict[str, Any]]) -> int:
+        """Attach the nodes described by ``children_data`` below ``parent``.
         
-        for grandchild_data in child_data.get('children', []):
-            Tree._build_from_dict(child, grandchild_data)
+        Returns:
+            int: Number of nodes created
+        """
+        created = 0
+        stack = [(parent, iter(children_data))]
+        while stack:
+            node, pending = stack[-1]
+            child_data = next(pending, _MISSING)
+            if child_data is _MISSING:
+                stack.pop()
+                continue
+            child = node.add_child(child_data.get('value'))
+            created += 1
+            if 'metadata' in child_data:
+                child.metadata = child_data['metadata']
+            grandchildren = child_data.get('children')
+            if grandchildren:
+                stack.append((child, iter(grandchildren)))
+        return created
 
     @staticmethod
-    def from_json(json_str: str) -> Tree:
+    def from_json(json_str: str, node_class: type = TreeNode) -> Tree:
         """Create a tree from a JSON string.
         
         Args:
             json_str (str): JSON representation of the tree
+            node_class (type): Node type to build the tree from
             
         Returns:
             Tree: A new tree constructed from the JSON
         """
         data = json.loads(json_str)
-        return Tree.from_dict(data)
+        return Tree.from_dict(data, node_class)
+
+    @staticmethod
+    def from_edges(edges: Iterable[Tuple[Any, Any]], node_class: type = TreeNode) -> Tree:
+        """Build a tree from ``(parent_value, child_value)`` edges in one pass.
+        
+        Values identify the nodes, so they must be hashable and unique.
+        See :func:`builders.tree_from_edges`.
+        
+        Args:
+            edges (Iterable[Tuple[Any, Any]]): Parent/child value pairs (any order)
+            node_class (type): Node type to build the tree from
+            
+        Returns:
+            Tree: The built tree
+        """
+        try:
+            from .builders import tree_from_edges
+        except ImportError:
+            from builders import tree_from_edges
+        return tree_from_edges(edges, node_class)
+
+    @staticmethod
+    def from_parent_array(values: Iterable[Any], parents: Iterable[Optional[int]],
+                          node_class: type = TreeNode) -> Tree:
+        """Build a tree from node values and parent indexes in one pass.
+        
+        See :func:`builders.tree_from_parent_array`.
+        
+        Args:
+            values (Iterable[Any]): Value per node
+            parents (Iterable[Optional[int]]): Parent index per node (None or -1 for the root)
+            node_class (type): Node type to build the tree from
+            
+        Returns:
+            Tree: The built tree
+        """
+        try:
+            from .builders import tree_from_parent_array
+        except ImportError:
+            from builders import tree_from_parent_array
+        return tree_from_parent_array(values, parents, node_class)
+
+    @staticmethod
+    def from_paths(paths: Iterable[Any], sep: str = "/", node_class: type = TreeNode) -> Tree:
+        """Build a tree from delimited paths such as ``"root/a/b"`` in one pass.
+        
+        See :func:`builders.tree_from_paths`.
+        
+        Args:
+            paths (Iterable): Path strings (or value sequences) from the root
+            sep (str): Separator between path components
+            node_class (type): Node type to build the tree from
+            
+        Returns:
+            Tree: The built tree
+        """
+        try:
+            from .builders import tree_from_paths
+        except ImportError:
+            from builders import tree_from_paths
+        return tree_from_paths(paths, sep, node_class)
 
     def save_to_file(self, filepath: str, include_metadata: bool = True, 
                      indent: int = 2) -> None:
@@ -528,23 +1598,195 @@ class Tree:
             include_metadata (bool): Whether to include metadata
             indent (int): JSON indentation level
         """
-        json_str = self.to_json(include_metadata=include_metadata, indent=indent)
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(json_str)
+            self.dump(f, include_metadata=include_metadata, indent=indent)
+
+    @staticmethod
+    def load(fp, node_class: type = TreeNode,
+             progress: Optional[Callable[[int, int], None]] = None,
+             chunk_size: int = 1 << 16) -> Tree:
+        """Load a tree from a JSON file object, parsing it incrementally.
+        
+        Nodes are built while the input is read chunk by chunk, so memory
+        stays close to the size of the resulting tree and deep trees do not
+        hit the recursion limit.
+        
+        Args:
+            fp: Readable file object, in text or binary (UTF-8) mode
+            node_class (type): Node type to build the tree from
+            progress (Optional[Callable[[int, int], None]]): Called after every
+                chunk with the bytes read so far and the number of nodes built
+            chunk_size (int): Number of bytes/characters read at a time
+            
+        Returns:
+            Tree: The loaded tree
+        """
+        try:
+            from .json_stream import load_tree
+        except ImportError:
+            from json_stream import load_tree
+        return load_tree(fp, node_class, progress, chunk_size)
 
     @staticmethod
-    def load_from_file(filepath: str) -> Tree:
+    def load_from_file(filepath: str, node_class: type = TreeNode,
+                       progress: Optional[Callable[[int, int], None]] = None) -> Tree:
         """Load a tree from a JSON file.
         
         Args:
             filepath (str): Path to the file to load
+            node_class (type): Node type to build the tree from
+            progress (Optional[Callable[[int, int], None]]): Called after every
+                chunk with the bytes read so far and the number of nodes built
             
         Returns:
             Tree: The loaded tree
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            json_str = f.read()
-        return Tree.from_json(json_str)
+        with open(filepath, 'rb') as f:
+            return Tree.load(f, node_class, progress)
+
+    def save_binary(self, filepath: str, include_metadata: bool = True) -> None:
+        """Save the tree in the compact binary format (see :mod:`binary_tree`).
+        
+        Args:
+            filepath (str): Path to save the file
+            include_metadata (bool): Whether to include metadata
+        """
+        try:
+            from .binary_tree import write_binary
+        except ImportError:
+            from binary_tree import write_binary
+        write_binary(self, filepath, include_metadata)
+
+    @staticmethod
+    def open_binary(filepath: str):
+        """Open a binary tree file as a read-only, memory-mapped view.
+        
+        Opening is O(1); nodes are decoded only when they are visited.
+        
+        Args:
+            filepath (str): Path of the file to open
+            
+        Returns:
+            MappedTree: The mapped view (close it, or use it in a ``with`` block)
+        """
+        try:
+            from .binary_tree import MappedTree
+        except ImportError:
+            from binary_tree import MappedTree
+        return MappedTree(filepath)
+
+    @staticmethod
+    def load_binary(filepath: str, node_class: type = TreeNode) -> Tree:
+        """Load a whole tree from a binary tree file.
+        
+        Args:
+            filepath (str): Path to the file to load
+            node_class (type): Node type to build the tree from
+            
+        Returns:
+            Tree: The loaded tree
+        """
+        with Tree.open_binary(filepath) as mapped:
+            return mapped.to_tree(node_class)
+
+    @property
+    def journal(self):
+        """The active :class:`TreeJournal`, or None when journaling is off."""
+        return self._journal
+
+    def enable_journal(self, filepath: str, batch_size: int = 256,
+                       sync_interval: float = 1.0):
+        """Snapshot the tree to a file and journal every later edit to ``filepath.log``.
+        
+        Each edit made through the tree or node methods appends one line to
+        the log; see :mod:`journal`. Reload with :meth:`open_journal`.
+        
+        Args:
+            filepath (str): Path of the snapshot file
+            batch_size (int): Number of buffered operations that triggers an fsync
+            sync_interval (float): Seconds after which buffered operations are synced
+            
+        Returns:
+            TreeJournal: The journal
+        """
+        try:
+            from .journal import TreeJournal
+        except ImportError:
+            from journal import TreeJournal
+        self.disable_journal()
+        self._journal = TreeJournal.create(self, filepath, batch_size=batch_size,
+                                           sync_interval=sync_interval)
+        self._add_listener(self._journal)
+        return self._journal
+
+    def disable_journal(self) -> None:
+        """Sync and close the journal; later edits are no longer recorded."""
+        if self._journal is not None:
+            self._journal.close()
+            self._remove_listener(self._journal)
+            self._journal = None
+
+    @staticmethod
+    def open_journal(filepath: str, node_class: type = TreeNode, batch_size: int = 256,
+                     sync_interval: float = 1.0) -> Tree:
+        """Load a journaled tree (snapshot plus log replay) and keep journaling it.
+        
+        Args:
+            filepath (str): Path of the snapshot file
+            node_class (type): Node type to build the tree from
+            batch_size (int): Number of buffered operations that triggers an fsync
+            sync_interval (float): Seconds after which buffered operations are synced
+            
+        Returns:
+            Tree: The loaded tree, with its journal enabled
+        """
+        try:
+            from .journal import TreeJournal
+        except ImportError:
+            from journal import TreeJournal
+        journal = TreeJournal.load(filepath, node_class, batch_size=batch_size,
+                                   sync_interval=sync_interval)
+        tree = journal.tree
+        tree._journal = journal
+        tree._add_listener(journal)
+        return tree
+
+    def to_flat(self, node: Optional[TreeNode] = None, include_metadata: bool = True):
+        """Convert the tree to an array-backed :class:`FlatTree`.
+        
+        Args:
+            node (Optional[TreeNode]): Node to start from (default: root)
+            include_metadata (bool): Whether to copy node metadata
+            
+        Returns:
+            FlatTree: Columnar copy of the tree, numbered in pre-order
+        """
+        try:
+            from .flat_tree import FlatTree
+        except ImportError:
+            from flat_tree import FlatTree
+        return FlatTree.from_tree(node or self.root, include_metadata)
+
+    def to_persistent(self, node: Optional[TreeNode] = None, include_metadata: bool = True,
+                      share_identical: bool = False):
+        """Convert the tree to an immutable :class:`PersistentTree` version.
+        
+        Further edits of the persistent version return new versions sharing
+        unchanged subtrees, so they are a cheap way to keep snapshots.
+        
+        Args:
+            node (Optional[TreeNode]): Node to start from (default: root)
+            include_metadata (bool): Whether to copy node metadata
+            share_identical (bool): Store identical subtrees once (hash-consing)
+            
+        Returns:
+            PersistentTree: Persistent copy of the tree
+        """
+        try:
+            from .persistent import PersistentTree
+        except ImportError:
+            from persistent import PersistentTree
+        return PersistentTree.from_tree(node or self.root, include_metadata, share_identical)
 
     def map(self, func: Callable[[Any], Any], node: Optional[TreeNode] = None) -> Tree:
         """Apply a function to all nodes and return a new tree.
@@ -556,44 +1798,255 @@ class Tree:
         Returns:
             Tree: A new tree with transformed values
         """
-        current = node or self.root
-        new_value = func(current.value)
-        new_node = TreeNode(value=new_value, metadata=current.metadata.copy())
-        
-        for child in current.children:
-            child_tree = self.map(func, child)
-            new_node.add_node(child_tree.root)
+        return self._transform(node or self.root, func, None, None)
+
+    def map_with_metadata(self, func: Callable[[Any, Dict[str, Any]], Any],
+                          node: Optional[TreeNode] = None) -> Tree:
+        """Build a new tree whose values and metadata are produced by a function.
         
-        new_tree = Tree()
-        new_tree.root = new_node
-        return new_tree
+        Args:
+            func (Callable): Function called with each node's value and a copy of
+                its metadata, returning ``(new_value, new_metadata)``
+            node (Optional[TreeNode]): Node to start from (default: root)
+            
+        Returns:
+            Tree: A new tree with transformed values and metadata
+        """
+        return self._transform(node or self.root, None, func, None)
 
     def filter(self, predicate: Callable[[Any], bool], node: Optional[TreeNode] = None) -> Tree:
         """Filter the tree by a predicate.
         
+        A node failing the predicate is dropped together with its subtree.
+        
         Args:
             predicate (Callable): Function that returns True for nodes to keep
             node (Optional[TreeNode]): Node to start from (default: root)
             
         Returns:
-            Tree: A new filtered tree
+            Tree: A new filtered tree (an empty tree if the start node fails)
         """
-        current = node or self.root
-        
-        if not predicate(current.value):
-            return Tree()
+        return self._transform(node or self.root, None, None, predicate)
+
+    def map_filter(self, func: Callable[[Any], Any], predicate: Callable[[Any], bool],
+                   node: Optional[TreeNode] = None) -> Tree:
+        """Filter the tree and transform the kept values in a single pass.
         
-        new_node = TreeNode(value=current.value, metadata=current.metadata.copy())
+        Equivalent to ``tree.filter(predicate, node).map(func)`` without
+        building the intermediate filtered tree.
         
-        for child in current.children:
-            child_tree = self.filter(predicate, child)
-            if child_tree.root.value is not None or child_tree.get_node_count() > 1:
-                new_node.add_node(child_tree.root)
+        Args:
+            func (Callable): Function to apply to each kept node's value
+            predicate (Callable): Function of the original value that returns
+                True for nodes to keep
+            node (Optional[TreeNode]): Node to start from (default: root)
+            
+        Returns:
+            Tree: A new tree (an empty tree if the start node fails)
+        """
+        return self._transform(node or self.root, func, None, predicate)
+
+    def _transform(self, current: TreeNode, func: Optional[Callable[[Any], Any]],
+                   metadata_func: Optional[Callable[[Any, Dict[str, Any]], Any]],
+                   predicate: Optional[Callable[[Any], bool]]) -> Tree:
+        """Copy a subtree into a new tree in one iterative pass.
         
-        new_tree = Tree()
-        new_tree.root = new_node
+        Each kept node is allocated once, directly below its copied parent;
+        nodes failing ``predicate`` are skipped with their subtree.
+        """
+        node_class = type(current)
+        if predicate is not None and not predicate(current.value):
+            return Tree(node_class=node_class)
+        
+        def convert(item: TreeNode):
+            if metadata_func is not None:
+                return metadata_func(item.value, item.metadata.copy())
+            value = func(item.value) if func is not None else item.value
+            return value, item.metadata.copy() if item.metadata else None
+        
+        value, metadata = convert(current)
+        new_tree = Tree(root_value=value, node_class=node_class)
+        if metadata:
+            new_tree.root.metadata = metadata
+        count = 1
+        stack = [(current, new_tree.root)]
+        while stack:
+            source, target = stack.pop()
+            for child in source.children:
+                if predicate is not None and not predicate(child.value):
+                    continue
+                value, metadata = convert(child)
+                copied = target.add_child(value)
+                if metadata:
+                    copied.metadata = metadata
+                count += 1
+                if child.children:
+                    stack.append((child, copied))
+        new_tree._node_count = count
+        if self._value_index is not None:
+            new_tree.enable_value_index()
         return new_tree
 
+    def parallel_map(self, func: Callable[[Any], Any], node: Optional[TreeNode] = None,
+                     workers: Optional[int] = None,
+                     chunk_size: Optional[int] = None) -> Tree:
+        """Like :meth:`map`, but run ``func`` in a pool of worker processes.
+        
+        Args:
+            func (Callable): Picklable function to apply to each node's value
+            node (Optional[TreeNode]): Node to start from (default: root)
+            workers (Optional[int]): Number of worker processes (default: CPU count)
+            chunk_size (Optional[int]): Maximum number of nodes per task
+            
+        Returns:
+            Tree: A new tree with transformed values
+        """
+        try:
+            from .parallel import ParallelExecutor
+        except ImportError:
+            from parallel import ParallelExecutor
+        with ParallelExecutor(workers, chunk_size) as executor:
+            return executor.map(self, func, node)
+
+    def parallel_reduce(self, func: Callable[[Any, Any], Any], node: Optional[TreeNode] = None,
+                        initial: Any = None, workers: Optional[int] = None,
+                        chunk_size: Optional[int] = None) -> Any:
+        """Like :meth:`reduce` for an associative ``func``, run in worker processes.
+        
+        Args:
+            func (Callable): Picklable, associative reduction function
+            node (Optional[TreeNode]): Node to start from (default: root)
+            initial (Any): Initial accumulator value
+            workers (Optional[int]): Number of worker processes (default: CPU count)
+            chunk_size (Optional[int]): Maximum number of nodes per task
+            
+        Returns:
+            Any: The reduced value
+        """
+        try:
+            from .parallel import ParallelExecutor
+        except ImportError:
+            from parallel import ParallelExecutor
+        with ParallelExecutor(workers, chunk_size) as executor:
+            return executor.reduce(self, func, node, initial)
+
+    def parallel_apply(self, func: Callable[[TreeNode], None], node: Optional[TreeNode] = None,
+                       workers: Optional[int] = None, chunk_size: Optional[int] = None) -> None:
+        """Like :meth:`apply`, run in worker processes on copies of the nodes.
+        
+        Value and metadata changes are written back; see
+        :meth:`ParallelExecutor.apply` for what ``func`` can see.
+        
+        Args:
+            func (Callable): Picklable function to apply to each node
+            node (Optional[TreeNode]): Node to start from (default: root)
+            workers (Optional[int]): Number of worker processes (default: CPU count)
+            chunk_size (Optional[int]): Maximum number of nodes per task
+        """
+        try:
+            from .parallel import ParallelExecutor
+        except ImportError:
+            from parallel import ParallelExecutor
+        with ParallelExecutor(workers, chunk_size) as executor:
+            executor.apply(self, func, node)
+
+    @property
+    def path_cache(self):
+        """The active :class:`PathCache`, or None when disabled."""
+        return self._path_cache
+
+    def enable_path_cache(self, maxsize: int = 4096):
+        """Cache resolved value paths for :meth:`resolve`, kept current by edits.
+        
+        Args:
+            maxsize (int): Maximum number of cached paths (least recently
+                used paths are evicted first)
+            
+        Returns:
+            PathCache: The (new or already active) cache
+        """
+        if self._path_cache is None:
+            try:
+                from .paths import PathCache
+            except ImportError:
+                from paths import PathCache
+            self._path_cache = PathCache(self, maxsize)
+            self._add_listener(self._path_cache)
+        return self._path_cache
+
+    def disable_path_cache(self) -> None:
+        """Drop the path cache."""
+        if self._path_cache is not None:
+            self._remove_listener(self._path_cache)
+            self._path_cache = None
+
+    def resolve(self, path: Any, sep: str = "/") -> Optional[TreeNode]:
+        """Get the node at a value path such as ``"root/eu/fr/paris"``.
+        
+        Each component matches the first child holding that value. With
+        the path cache enabled, hot paths resolve in one lookup and cold
+        ones walk down from their longest cached prefix.
+        
+        Args:
+            path (Union[str, Sequence]): Delimited string, or sequence of values
+                starting with the root value
+            sep (str): Separator between components of a string path
+            
+        Returns:
+            Optional[TreeNode]: The node, or None if the path does not exist
+        """
+        if self._path_cache is not None:
+            return self._path_cache.resolve(path, sep)
+        try:
+            from .paths import split_path, walk_path
+        except ImportError:
+            from paths import split_path, walk_path
+        parts = split_path(path, sep)
+        if not parts or self.root.value != parts[0]:
+            return None
+        return walk_path(self.root, parts)
+
+    def path_of(self, node: TreeNode, sep: str = "/") -> str:
+        """Get the value path of a node, the inverse of :meth:`resolve`.
+        
+        Args:
+            node (TreeNode): The node
+            sep (str): Separator between components
+            
+        Returns:
+            str: The values from the root down to the node, joined by ``sep``
+        """
+        try:
+            from .paths import value_path
+        except ImportError:
+            from paths import value_path
+        return sep.join(str(value) for value in value_path(node))
+
+    def query(self, expression: str, start: Optional[TreeNode] = None,
+              limit: Optional[int] = None) -> List[TreeNode]:
+        """Select nodes with an XPath-like query, e.g. ``"//*[@type = 'region']//*[leaf]"``.
+        
+        The query is compiled once (and cached by text) and its child and
+        descendant steps run as a single pruned traversal; see :mod:`query`
+        for the syntax.
+        
+        Args:
+            expression (str): The query text
+            start (Optional[TreeNode]): Node to start from (default: root)
+            limit (Optional[int]): Stop after this many matches
+            
+        Returns:
+            List[TreeNode]: Matching nodes
+            
+        Raises:
+            ValueError: If the query is malformed
+        """
+        try:
+            from .query import compile_query
+        except ImportError:
+            from query import compile_query
+        return compile_query(expression).select(start or self.root, limit)
+
     def find_path(self, target_value: Any, start: Optional[TreeNode] = None) -> Optional[List[Any]]:
         """Find the path to a value in the tree.
         
@@ -605,14 +2058,28 @@ class Tree:
             Optional[List[Any]]: List of values from root to target, or None if not found
         """
         current = start or self.root
+        if self._value_index is not None:
+            found = self._value_index.find(target_value, current)
+            if found is None:
+                return None
+            path = [found.value]
+            while found is not current:
+                found = found.parent
+                path.append(found.value)
+            path.reverse()
+            return path
+        path: List[Any] = []
+        stack = [(current, 0)]
         
-        if current.value == target_value:
-            return [current.value]
-        
-        for child in current.children:
-            path = self.find_path(target_value, child)
-            if path is not None:
-                return [current.value] + path
+        while stack:
+            node, depth = stack.pop()
+            del path[depth:]
+            path.append(node.value)
+            if node.value == target_value:
+                return path
+            if node.children:
+                depth += 1
+                stack.extend((child, depth) for child in reversed(node.children))
         
         return None
 
@@ -626,12 +2093,21 @@ class Tree:
         Returns:
             Optional[TreeNode]: The common ancestor, or None if not found
         """
-        path1 = {id(n): n for n in node1.get_path_to_root()}
-        path2 = node2.get_path_to_root()
+        ancestry = self._ancestor_index
+        if ancestry is not None and node1._tree is self and node2._tree is self:
+            return ancestry.lca(node1, node2)
+        
+        ancestors = set()
+        current = node1
+        while current is not None:
+            ancestors.add(id(current))
+            current = current.parent
         
-        for node in path2:
-            if id(node) in path1:
-                return path1[id(node)]
+        current = node2
+        while current is not None:
+            if id(current) in ancestors:
+                return current
+            current = current.parent
         
         return None
 
@@ -645,55 +2121,97 @@ class Tree:
             is_last (bool): Whether this is the last child
         """
         current = node or self.root
+        stack = [(current, prefix, is_last)]
         
-        connector = "+-- " if is_last else "|-- "
-        print(prefix + connector + str(current.value))
-        
-        children = current.children
-        for i, child in enumerate(children):
-            is_last_child = (i == len(children) - 1)
-            extension = "    " if is_last else "|   "
-            self.print_tree(child, prefix + extension, is_last_child)
+        while stack:
+            item, item_prefix, item_is_last = stack.pop()
+            connector = "+-- " if item_is_last else "|-- "
+            print(item_prefix + connector + str(item.value))
+            
+            children = item.children
+            extension = item_prefix + ("    " if item_is_last else "|   ")
+            last_index = len(children) - 1
+            for i in range(last_index, -1, -1):
+                stack.append((children[i], extension, i == last_index))
 
     def clear(self) -> None:
         """Clear all children from the root node."""
-        self.root.children.clear()
+        root = self.root
+        if self._listeners:
+            for child in list(reversed(root.children)):
+                root.remove_child(child)
+        else:
+            for child in root.children:
+                child.parent = None
+            root.children.clear()
+            if root._child_lookup is not None:
+                root._child_lookup.rebuild()
+        root._removed_slots = None
         self._node_count = 1
 
     def reverse_children(self, node: Optional[TreeNode] = None) -> None:
         """Reverse the order of children for all nodes.
         
+        Nodes with an ordered child index keep their children in key order.
+        
         Args:
             node (Optional[TreeNode]): Node to start from (default: root)
         """
         current = node or self.root
-        current.children.reverse()
-        for child in current.children:
-            self.reverse_children(child)
+        for item in self._pre_order(current):
+            if item._child_lookup is not None and item._child_lookup.ordered:
+                continue
+            item.children.reverse()
+            if self._listeners:
+                self._reordered(item)
 
     def sort_children(self, node: Optional[TreeNode] = None, 
                       key: Optional[Callable[[Any], Any]] = None, 
                       reverse: bool = False) -> None:
         """Sort children of all nodes.
         
+        Nodes with an ordered child index keep their children in key order.
+        
         Args:
             node (Optional[TreeNode]): Node to start from (default: root)
             key (Optional[Callable]): Function to extract sort key
             reverse (bool): Sort in reverse order
         """
         current = node or self.root
-        current.children.sort(key=lambda x: key(x.value) if key else x.value, 
-                             reverse=reverse)
-        for child in current.children:
-            self.sort_children(child, key, reverse)
+        sort_key = (lambda x: key(x.value)) if key else (lambda x: x.value)
+        for item in self._pre_order(current):
+            if item._child_lookup is not None and item._child_lookup.ordered:
+                continue
+            item.children.sort(key=sort_key, reverse=reverse)
+            if self._listeners:
+                self._reordered(item)
 
     def _count_nodes(self, node: TreeNode) -> int:
         """Count nodes in a subtree."""
-        count = 1
-        for child in node.children:
-            count += self._count_nodes(child)
+        count = 0
+        for _ in self._pre_order(node):
+            count += 1
         return count
 
+    def _subtree_size(self, node: TreeNode) -> int:
+        """Count nodes in a subtree, from the aggregate cache when possible."""
+        if self._aggregates is not None and node._tree is self:
+            return self._aggregates.size(node)
+        return self._count_nodes(node)
+
+    def _subtree_height(self, node: TreeNode) -> int:
+        """Compute the height of a subtree without recursion."""
+        height = 0
+        stack = [(node, 0)]
+        while stack:
+            current, depth = stack.pop()
+            if depth > height:
+                height = depth
+            if current.children:
+                depth += 1
+                stack.extend((child, depth) for child in current.children)
+        return height
+
     def depth_first_search(self, target_value: Any, start: Optional[TreeNode] = None) -> Optional[TreeNode]:
         """Search for a node using depth-first search.
         
@@ -705,6 +2223,8 @@ class Tree:
             Optional[TreeNode]: The found node, or None if not found
         """
         current = start or self.root
+        if self._value_index is not None:
+            return self._value_index.find(target_value, current)
         stack = [current]
         
         while stack:
@@ -726,16 +2246,69 @@ class Tree:
             Optional[TreeNode]: The found node, or None if not found
         """
         current = start or self.root
-        queue = [current]
+        if self._value_index is not None:
+            return self._value_index.find(target_value, current, breadth_first=True)
         
-        while queue:
-            node = queue.pop(0)
+        for node in self._level_order(current):
             if node.value == target_value:
                 return node
-            queue.extend(node.children)
         
         return None
 
+    def best_first(self, score_fn: Callable[[TreeNode], Any], k: int = 1,
+                   bound_fn: Optional[Callable[[TreeNode], Any]] = None,
+                   goal: Optional[Callable[[TreeNode], bool]] = None,
+                   node: Optional[TreeNode] = None,
+                   max_expansions: Optional[int] = None) -> List[Tuple[TreeNode, Any]]:
+        """Find the ``k`` best goal nodes with a heap-ordered best-first search.
+        
+        With an admissible ``bound_fn`` (an upper bound on the goal scores
+        in a subtree) the search prunes subtrees that cannot enter the top
+        ``k`` and stops as soon as none can; see :mod:`search`.
+        
+        Args:
+            score_fn (Callable): Score of a node (higher is better)
+            k (int): Number of goals to return
+            bound_fn (Optional[Callable]): Upper bound on the goal scores below a node
+            goal (Optional[Callable]): Which nodes are results (default: leaves)
+            node (Optional[TreeNode]): Node to start from (default: root)
+            max_expansions (Optional[int]): Stop after expanding this many nodes
+            
+        Returns:
+            List[Tuple[TreeNode, Any]]: ``(node, score)`` pairs, best first
+        """
+        try:
+            from .search import best_first
+        except ImportError:
+            from search import best_first
+        return best_first(self, score_fn, k, bound_fn, goal, node, max_expansions)
+
+    def beam_search(self, score_fn: Callable[[TreeNode], Any], width: int = 8, k: int = 1,
+                    goal: Optional[Callable[[TreeNode], bool]] = None,
+                    bound_fn: Optional[Callable[[TreeNode], Any]] = None,
+                    node: Optional[TreeNode] = None,
+                    max_depth: Optional[int] = None) -> List[Tuple[TreeNode, Any]]:
+        """Find good goal nodes keeping only the ``width`` best nodes per level.
+        
+        Args:
+            score_fn (Callable): Score of a node (higher is better)
+            width (int): Number of nodes kept per level
+            k (int): Number of goals to return
+            goal (Optional[Callable]): Which nodes are results (default: leaves)
+            bound_fn (Optional[Callable]): Upper bound on the goal scores below a
+                node, used to drop hopeless children before scoring them
+            node (Optional[TreeNode]): Node to start from (default: root)
+            max_depth (Optional[int]): Levels to descend below the start node
+            
+        Returns:
+            List[Tuple[TreeNode, Any]]: ``(node, score)`` pairs, best first
+        """
+        try:
+            from .search import beam_search
+        except ImportError:
+            from search import beam_search
+        return beam_search(self, score_fn, width, k, goal, bound_fn, node, max_depth)
+
     def apply(self, func: Callable[[TreeNode], None], node: Optional[TreeNode] = None) -> None:
         """Apply a function to all nodes.
         
@@ -744,9 +2317,45 @@ class Tree:
             node (Optional[TreeNode]): Node to start from (default: root)
         """
         current = node or self.root
-        func(current)
-        for child in current.children:
-            self.apply(func, child)
+        for item in self._pre_order(current):
+            func(item)
+
+    def atraverse(self, mode: TraversalMode = TraversalMode.PRE_ORDER,
+                  start: Optional[TreeNode] = None, yield_every: int = 256):
+        """Traverse the tree from an ``async for`` loop.
+
+        Args:
+            mode (TraversalMode): The traversal mode to use
+            start (Optional[TreeNode]): Node to start from (default: root)
+            yield_every (int): Let other tasks run after this many nodes
+
+        Returns:
+            AsyncIterator[TreeNode]: Nodes in traversal order
+        """
+        try:
+            from .async_tree import atraverse
+        except ImportError:
+            from async_tree import atraverse
+        return atraverse(self, mode, start, yield_every)
+
+    async def aapply(self, coro_fn: Callable[[TreeNode], Any], node: Optional[TreeNode] = None,
+                     concurrency: int = 16, parent_first: bool = False) -> int:
+        """Await a coroutine function on all nodes with bounded concurrency.
+
+        Args:
+            coro_fn (Callable): Coroutine function called with each node
+            node (Optional[TreeNode]): Node to start from (default: root)
+            concurrency (int): Maximum number of coroutines running at once
+            parent_first (bool): Start a node only after its parent completed
+
+        Returns:
+            int: Number of nodes visited
+        """
+        try:
+            from .async_tree import aapply
+        except ImportError:
+            from async_tree import aapply
+        return await aapply(self, coro_fn, node, concurrency, parent_first)
 
     def reduce(self, func: Callable[[Any, Any], Any], node: Optional[TreeNode] = None, 
                initial: Any = None) -> Any:
@@ -761,10 +2370,10 @@ class Tree:
             Any: The reduced value
         """
         current = node or self.root
-        accumulator = func(initial, current.value) if initial is not None else current.value
+        accumulator = initial
         
-        for child in current.children:
-            accumulator = self.reduce(func, child, accumulator)
+        for item in self._pre_order(current):
+            accumulator = func(accumulator, item.value) if accumulator is not None else item.value
         
         return accumulator
 
@@ -779,7 +2388,11 @@ class Tree:
         """
         if node.parent is None:
             return []
-        return [child for child in node.parent.children if child is not node]
+        siblings = node.parent.children
+        index = node.parent._child_index(node)
+        if index < 0:
+            return list(siblings)
+        return siblings[:index] + siblings[index + 1:]
 
     def get_subtree_height(self, node: TreeNode) -> int:
         """Get the height of a subtree rooted at a node.
@@ -790,13 +2403,17 @@ class Tree:
         Returns:
             int: Height of the subtree
         """
-        if node.is_leaf():
-            return 0
-        return 1 + max((self.get_subtree_height(child) for child in node.children), default=0)
+        if self._aggregates is not None and node._tree is self:
+            return self._aggregates.height(node)
+        return self._subtree_height(node)
 
     def is_balanced(self, node: Optional[TreeNode] = None) -> bool:
         """Check if the tree (or subtree) is balanced.
         
+        A subtree is balanced when, at every node, the heights of the
+        children differ by at most one. Heights are computed once in a single
+        post-order pass (or read from the aggregate cache when enabled).
+        
         Args:
             node (Optional[TreeNode]): Node to start from (default: root)
             
@@ -804,18 +2421,62 @@ class Tree:
             bool: True if tree is balanced, False otherwise
         """
         current = node or self.root
-        
-        if current.is_leaf():
-            return True
-        
-        if not current.children:
-            return True
-        
-        heights = [self.get_subtree_height(child) for child in current.children]
-        max_height = max(heights) if heights else 0
-        min_height = min(heights) if heights else 0
-        
-        if max_height - min_height > 1:
-            return False
-        
-        return all(self.is_balanced(child) for child in current.children)
+        if self._aggregates is not None and current._tree is self:
+            return self._aggregates.is_balanced(current)
+        
+        heights: Dict[int, int] = {}
+        for item in self._post_order(current):
+            children = item.children
+            if not children:
+                heights[id(item)] = 0
+                continue
+            child_heights = [heights.pop(id(child)) for child in children]
+            highest = max(child_heights)
+            if highest - min(child_heights) > 1:
+                return False
+            heights[id(item)] = highest + 1
+        return True
+
+    def _add_listener(self, listener: _TreeListener) -> None:
+        """Register a listener, tagging every node with this tree if needed."""
+        if not self._listeners:
+            for node in self._pre_order(self.root):
+                node._tree = self
+        self._listeners.append(listener)
+
+    def _remove_listener(self, listener: _TreeListener) -> None:
+        """Unregister a listener, untagging the nodes when none is left."""
+        self._listeners.remove(listener)
+        if not self._listeners:
+            for node in self._pre_order(self.root):
+                node._tree = None
+
+    def _attached(self, node: TreeNode) -> None:
+        """Tag a newly attached subtree and notify the listeners."""
+        if node._tree is not self:
+            for item in self._pre_order(node):
+                item._tree = self
+        for listener in self._listeners:
+            listener.attached(node)
+
+    def _detached(self, node: TreeNode, parent: TreeNode) -> None:
+        """Notify the listeners of a removed subtree, then untag it."""
+        for listener in self._listeners:
+            listener.detached(node, parent)
+        for item in self._pre_order(node):
+            item._tree = None
+
+    def _value_changed(self, node: TreeNode, old_value: Any) -> None:
+        """Notify the listeners of a value change."""
+        for listener in self._listeners:
+            listener.value_changed(node, old_value)
+
+    def _metadata_changed(self, node: TreeNode, key: str, old_value: Any) -> None:
+        """Notify the listeners of a metadata change."""
+        for listener in self._listeners:
+            listener.metadata_changed(node, key, old_value)
+
+    def _reordered(self, node: TreeNode) -> None:
+        """Notify the listeners that the children of a node were reordered."""
+        for listener in self._listeners:
+            listener.reordered(node)
@@ -0,0 +1,308 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Hashing - Merkle content hashes of subtrees.
+
+The digest of a node covers its value, its metadata and, in order, the
+digests of its children, so two subtrees have the same digest exactly when
+they have the same content (up to hash collisions, negligible with 128-bit
+BLAKE2b digests). Comparing digests makes tree equality O(1), groups
+identical subtrees in one pass and lets identical subtrees be stored once.
+
+:class:`SubtreeHashes` caches the digests of a tree and, once enabled with
+``Tree.enable_hashing()``, drops only the digests on the path from an
+edited node to the root.
+
+Values and metadata are encoded canonically with a type tag per item:
+``None``, ``bool``, ``int``, ``float``, ``complex``, ``str``, ``bytes``,
+``bytearray``, ``tuple``, ``list``, ``dict``, ``set`` and ``frozenset``
+(mapping and set items in sorted encoded order). For these, equal digests
+mean equal values of equal types, and digests are stable across processes
+and runs. Any other object (and NaN, which is not equal to itself) is
+hashed by identity: its digest is only meaningful within the process, and
+the subtree is reported as not canonical (see :meth:`SubtreeHashes.is_canonical`),
+so callers can fall back to comparing it with ``==``.
+
+Example:
+    >>> a = Tree(root_value="root")
+    >>> b = Tree(root_value="root")
+    >>> a.enable_hashing().digest() == b.enable_hashing().digest()
+    True
+    >>> a.equals(b)
+    True
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import threading
+from hashlib import blake2b
+from itertools import count
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    from .generic_tree import Tree, TreeNode, _TreeListener
+except ImportError:
+    from generic_tree import Tree, TreeNode, _TreeListener
+
+DIGEST_SIZE = 16
+
+# Gives every NaN its own encoding, as NaN never equals anything.
+_NAN_TOKENS = count()
+
+_SEQUENCE_TAGS = {tuple: b't', list: b'l'}
+_SET_TAGS = {set: b'e', frozenset: b'z'}
+_BYTES_TAGS = {bytes: b'b', bytearray: b'y'}
+
+
+def _encode_into(value: Any, out: List[bytes]) -> bool:
+    """Append the tagged encoding of a value to ``out``.
+
+    Returns:
+        bool: False if some part was encoded by identity (not canonical)
+    """
+    kind = type(value)
+    if value is None:
+        out.append(b'N')
+        return True
+    if kind is bool:
+        out.append(b'T' if value else b'F')
+        return True
+    if kind is int:
+        out.extend((b'i', format(value, 'x').encode('ascii'), b';'))
+        return True
+    if kind is float:
+        if value != value:
+            out.extend((b'n', str(next(_NAN_TOKENS)).encode('ascii'), b';'))
+            return False
+        # -0.0 == 0.0, so both get the same encoding.
+        out.extend((b'f', (value or 0.0).hex().encode('ascii'), b';'))
+        return True
+    if kind is complex:
+        out.append(b'c')
+        real = _encode_into(value.real, out)
+        return _encode_into(value.imag, out) and real
+    if kind is str:
+        data = value.encode('utf-8', 'surrogatepass')
+        out.extend((b's', str(len(data)).encode('ascii'), b':', data))
+        return True
+    if kind in _BYTES_TAGS:
+        out.extend((_BYTES_TAGS[kind], str(len(value)).encode('ascii'), b':', bytes(value)))
+        return True
+    if kind in _SEQUENCE_TAGS:
+        out.extend((_SEQUENCE_TAGS[kind], str(len(value)).encode('ascii'), b':'))
+        canonical = True
+        for item in value:
+            canonical = _encode_into(item, out) and canonical
+        return canonical
+    if kind is dict or kind in _SET_TAGS:
+        pairs = []
+        canonical = True
+        for item in value:
+            encoded: List[bytes] = []
+            canonical = _encode_into(item, encoded) and canonical
+            if kind is dict:
+                key = b''.join(encoded)
+                encoded = []
+                canonical = _encode_into(value[item], encoded) and canonical
+                pairs.append((key, b''.join(encoded)))
+            else:
+                pairs.append((b''.join(encoded), b''))
+        pairs.sort()
+        out.extend((b'd' if kind is dict else _SET_TAGS[kind],
+                    str(len(pairs)).encode('ascii'), b':'))
+        for key, item in pairs:
+            out.append(key)
+            out.append(item)
+        return canonical
+    name = f"{kind.__module__}.{kind.__qualname__}"
+    out.extend((b'o', name.encode('utf-8'), b'#', str(id(value)).encode('ascii'), b';'))
+    return False
+
+
+def _encode(value: Any) -> Tuple[bytes, bool]:
+    """Encode a value canonically; the flag is False if identity was used."""
+    out: List[bytes] = []
+    canonical = _encode_into(value, out)
+    return b''.join(out), canonical
+
+
+def _digest(value: Any, metadata: Optional[Mapping[str, Any]],
+            child_digests: Iterable[bytes]) -> Tuple[bytes, bool]:
+    digest = blake2b(digest_size=DIGEST_SIZE)
+    encoded, canonical = _encode(value)
+    digest.update(len(encoded).to_bytes(8, 'little'))
+    digest.update(encoded)
+    if metadata:
+        encoded, plain = _encode(dict(metadata))
+        canonical = canonical and plain
+    else:
+        encoded = b''
+    digest.update(len(encoded).to_bytes(8, 'little'))
+    digest.update(encoded)
+    for child in child_digests:
+        digest.update(child)
+    return digest.digest(), canonical
+
+
+def node_digest(value: Any, metadata: Optional[Mapping[str, Any]],
+                child_digests: Iterable[bytes]) -> bytes:
+    """Compute the digest of a node from its content and its children's digests.
+
+    Args:
+        value (Any): The node value
+        metadata (Optional[Mapping[str, Any]]): The node metadata (None or empty
+            for no metadata)
+        child_digests (Iterable[bytes]): Digests of the children, in order
+
+    Returns:
+        bytes: The node digest
+    """
+    return _digest(value, metadata, child_digests)[0]
+
+
+class SubtreeHashes(_TreeListener):
+    """Cache of Merkle digests (and sizes) of the subtrees of a tree.
+
+    Digests are computed on demand in one post-order pass over the nodes
+    that are not cached yet. When registered on the tree (see
+    ``Tree.enable_hashing``), edits drop the cached digests from the edited
+    node up to the root.
+
+    Attributes:
+        tree (Tree): The hashed tree
+    """
+
+    def __init__(self, tree: Tree):
+        """Initialize an empty cache for a tree.
+
+        Args:
+            tree (Tree): The tree to hash
+        """
+        self.tree = tree
+        self._cache: Dict[int, Tuple[bytes, int, bool]] = {}
+        # Readers sharing a read lock may fill the cache at the same time.
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Drop every cached digest (e.g. after direct ``node.value`` edits)."""
+        self._cache.clear()
+
+    def digest(self, node: Optional[TreeNode] = None) -> bytes:
+        """Get the digest of a subtree.
+
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            bytes: The subtree digest
+        """
+        return self._entry(node or self.tree.root)[0]
+
+    def hexdigest(self, node: Optional[TreeNode] = None) -> str:
+        """Get the digest of a subtree as a hexadecimal string.
+
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            str: The subtree digest in hexadecimal
+        """
+        return self.digest(node).hex()
+
+    def size(self, node: Optional[TreeNode] = None) -> int:
+        """Get the number of nodes in a subtree (computed with the digests).
+
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            int: Number of nodes
+        """
+        return self._entry(node or self.tree.root)[1]
+
+    def is_canonical(self, node: Optional[TreeNode] = None) -> bool:
+        """Check whether a subtree's digest covers its content exactly.
+
+        False when some value or metadata in the subtree was hashed by
+        identity; equal content may then have different digests.
+
+        Args:
+            node (Optional[TreeNode]): Root of the subtree (default: root)
+
+        Returns:
+            bool: True if only canonically encoded values occur in the subtree
+        """
+        return self._entry(node or self.tree.root)[2]
+
+    def find_duplicates(self, node: Optional[TreeNode] = None,
+                        min_size: int = 1) -> List[List[TreeNode]]:
+        """Group the identical subtrees below a node.
+
+        Args:
+            node (Optional[TreeNode]): Root of the searched subtree (default: root)
+            min_size (int): Ignore subtrees with fewer nodes than this
+
+        Returns:
+            List[List[TreeNode]]: Groups of two or more identical subtrees, each
+            in pre-order, groups ordered by their first member
+        """
+        start = node or self.tree.root
+        self._entry(start)
+        cache = self._cache
+        groups: Dict[bytes, List[TreeNode]] = {}
+        for item in self.tree._pre_order(start):
+            digest, size, _ = cache[id(item)]
+            if size >= min_size:
+                groups.setdefault(digest, []).append(item)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def _entry(self, node: TreeNode) -> Tuple[bytes, int, bool]:
+        cache = self._cache
+        cached = cache.get(id(node))
+        if cached is not None:
+            return cached
+        with self._lock:
+            order = []
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                if id(current) in cache:
+                    continue
+                order.append(current)
+                stack.extend(current.children)
+            for item in reversed(order):
+                entries = [cache[id(child)] for child in item.children]
+                digest, canonical = _digest(item.value, item.metadata,
+                                            (entry[0] for entry in entries))
+                cache[id(item)] = (digest, 1 + sum(entry[1] for entry in entries),
+                                   canonical and all(entry[2] for entry in entries))
+            return cache[id(node)]
+
+    def _invalidate_path(self, node: Optional[TreeNode]) -> None:
+        """Drop cached digests from ``node`` up to the first uncached ancestor."""
+        cache = self._cache
+        while node is not None and cache.pop(id(node), None) is not None:
+            node = node.parent
+
+    def _evict_subtree(self, node: TreeNode) -> None:
+        cache = self._cache
+        for item in self.tree._pre_order(node):
+            cache.pop(id(item), None)
+
+    def attached(self, node: TreeNode) -> None:
+        self._evict_subtree(node)
+        self._invalidate_path(node.parent)
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        self._evict_subtree(node)
+        self._invalidate_path(parent)
+
+    def value_changed(self, node: TreeNode, old_value: Any) -> None:
+        self._invalidate_path(node)
+
+    def metadata_changed(self, node: TreeNode, key: str, old_value: Any) -> None:
+        self._invalidate_path(node)
+
+    def reordered(self, node: TreeNode) -> None:
+        self._invalidate_path(node)
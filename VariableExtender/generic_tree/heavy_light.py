@@ -0,0 +1,282 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Heavy Light - Path sum, minimum and maximum queries for generic trees.
+
+:class:`PathAggregates` gives every node a numeric weight (its value by
+default) and answers aggregates over the path between two nodes, both
+endpoints included. It uses a heavy-light decomposition: each node's
+*heavy* child is its child with the largest subtree, and following heavy
+children splits the tree into chains. Any root-to-node path crosses at
+most O(log n) chains, and each chain occupies a contiguous range of
+positions in three segment trees (sum, min and max). This gives:
+
+    - ``query(a, b, op)`` in O(log² n), with ``op`` one of "sum", "min"
+      and "max", and ``query_many`` for batches of pairs
+    - point updates in O(log n): editing a node's value (or whatever the
+      weight function reads, e.g. its metadata) updates the segment trees
+
+Structural edits mark the index stale and the next query rebuilds it
+(O(n)), so it suits trees whose weights change often but whose shape
+rarely does.
+
+Example:
+    >>> tree = Tree(root_value=5)
+    >>> left = tree.add_child(tree.root, 3)
+    >>> right = tree.add_child(tree.root, 8)
+    >>> paths = tree.enable_path_aggregates()
+    >>> paths.path_sum(left, right)
+    16
+    >>> right.set_value(1)
+    >>> paths.path_max(left, right)
+    5
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+from operator import add
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .generic_tree import Tree, TreeNode, _TreeListener
+except ImportError:
+    from generic_tree import Tree, TreeNode, _TreeListener
+
+# Reduction applied to the segment tree entries covering a path, per operation.
+_REDUCE = {"sum": sum, "min": min, "max": max}
+
+
+def _node_value(node: TreeNode) -> Any:
+    return node.value
+
+
+def _build_segments(leaves: List[Any], combine: Callable[[Any, Any], Any]) -> List[Any]:
+    """Build a bottom-up segment tree: leaf ``i`` is stored at ``len(leaves) + i``."""
+    count = len(leaves)
+    tree = [leaves[0]] * count + leaves
+    for index in range(count - 1, 0, -1):
+        tree[index] = combine(tree[2 * index], tree[2 * index + 1])
+    return tree
+
+
+class PathAggregates(_TreeListener):
+    """Heavy-light decomposition answering path sum/min/max queries.
+
+    Attributes:
+        tree (Tree): The indexed tree
+        weight (Callable): Function giving the weight of a node
+    """
+
+    def __init__(self, tree: Tree, weight: Optional[Callable[[TreeNode], Any]] = None):
+        """Initialize and build the index for a tree.
+
+        Args:
+            tree (Tree): The tree to index
+            weight (Optional[Callable]): Weight of a node (default: its value)
+        """
+        self.tree = tree
+        self.weight = weight or _node_value
+        self._stale = True
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Decompose the tree into heavy chains and rebuild the segment trees."""
+        nodes: List[TreeNode] = []
+        parents: List[int] = []
+        stack = [(self.tree.root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            number = len(nodes)
+            nodes.append(node)
+            parents.append(parent)
+            if node.children:
+                stack.extend((child, number) for child in reversed(node.children))
+        count = len(nodes)
+
+        # Pre-order numbers put every parent before its children.
+        size = [1] * count
+        for number in range(count - 1, 0, -1):
+            size[parents[number]] += size[number]
+        depth = [0] * count
+        heavy = [-1] * count
+        largest = [0] * count
+        for number in range(1, count):
+            parent = parents[number]
+            depth[number] = depth[parent] + 1
+            if size[number] > largest[parent]:
+                largest[parent] = size[number]
+                heavy[parent] = number
+
+        # Lay every chain out on consecutive positions, starting from its head.
+        head = [0] * count
+        position = [0] * count
+        next_position = 0
+        for number in range(count):
+            if number and heavy[parents[number]] == number:
+                continue
+            member = number
+            while member != -1:
+                head[member] = number
+                position[member] = next_position
+                next_position += 1
+                member = heavy[member]
+
+        weights: List[Any] = [None] * count
+        weight = self.weight
+        for number, node in enumerate(nodes):
+            weights[position[number]] = weight(node)
+
+        self._nodes = nodes
+        self._number: Dict[int, int] = {id(node): number for number, node in enumerate(nodes)}
+        self._parent = parents
+        self._depth = depth
+        self._head = head
+        self._position = position
+        self._segments = {"sum": _build_segments(weights, add),
+                          "min": _build_segments(weights, min),
+                          "max": _build_segments(weights, max)}
+        self._stale = False
+
+    def _numbers(self, *nodes: TreeNode) -> List[int]:
+        if self._stale:
+            self.rebuild()
+        try:
+            return [self._number[id(node)] for node in nodes]
+        except KeyError:
+            raise ValueError("node is not part of the indexed tree") from None
+
+    def __contains__(self, node: TreeNode) -> bool:
+        if self._stale:
+            self.rebuild()
+        return id(node) in self._number
+
+    @staticmethod
+    def _reducer(op: str) -> Callable[[List[Any]], Any]:
+        try:
+            return _REDUCE[op]
+        except KeyError:
+            raise ValueError(f"Unknown path aggregate: {op!r} "
+                             f"(expected one of {', '.join(_REDUCE)})") from None
+
+    def _collect(self, segments: List[Any], a: int, b: int) -> List[Any]:
+        """Gather the segment tree entries that exactly cover the path a..b."""
+        head = self._head
+        depth = self._depth
+        parent = self._parent
+        position = self._position
+        offset = len(self._nodes)
+        parts: List[Any] = []
+        while True:
+            if head[a] == head[b]:
+                low, high = position[a], position[b]
+                if low > high:
+                    low, high = high, low
+            else:
+                if depth[head[a]] < depth[head[b]]:
+                    a, b = b, a
+                low, high = position[head[a]], position[a]
+            low += offset
+            high += offset + 1
+            while low < high:
+                if low & 1:
+                    parts.append(segments[low])
+                    low += 1
+                if high & 1:
+                    high -= 1
+                    parts.append(segments[high])
+                low >>= 1
+                high >>= 1
+            if head[a] == head[b]:
+                return parts
+            a = parent[head[a]]
+
+    def query(self, a: TreeNode, b: TreeNode, op: str = "sum") -> Any:
+        """Aggregate the weights on the path between two nodes.
+
+        Args:
+            a (TreeNode): First endpoint (included)
+            b (TreeNode): Second endpoint (included)
+            op (str): "sum", "min" or "max"
+
+        Returns:
+            Any: The aggregate of the weights of every node on the path
+
+        Raises:
+            ValueError: If ``op`` is unknown or a node is not in the tree
+        """
+        reduce = self._reducer(op)
+        first, second = self._numbers(a, b)
+        return reduce(self._collect(self._segments[op], first, second))
+
+    def path_sum(self, a: TreeNode, b: TreeNode) -> Any:
+        """Sum the weights on the path between two nodes."""
+        return self.query(a, b, "sum")
+
+    def path_min(self, a: TreeNode, b: TreeNode) -> Any:
+        """Get the smallest weight on the path between two nodes."""
+        return self.query(a, b, "min")
+
+    def path_max(self, a: TreeNode, b: TreeNode) -> Any:
+        """Get the largest weight on the path between two nodes."""
+        return self.query(a, b, "max")
+
+    def query_many(self, pairs: Iterable[Tuple[TreeNode, TreeNode]],
+                   op: str = "sum") -> List[Any]:
+        """Aggregate the weights on the paths between many node pairs.
+
+        Args:
+            pairs (Iterable[Tuple[TreeNode, TreeNode]]): Path endpoints
+            op (str): "sum", "min" or "max"
+
+        Returns:
+            List[Any]: One aggregate per pair, in input order
+        """
+        reduce = self._reducer(op)
+        if self._stale:
+            self.rebuild()
+        number = self._number
+        segments = self._segments[op]
+        collect = self._collect
+        try:
+            return [reduce(collect(segments, number[id(a)], number[id(b)])) for a, b in pairs]
+        except KeyError:
+            raise ValueError("node is not part of the indexed tree") from None
+
+    def update(self, node: TreeNode) -> None:
+        """Re-read the weight of one node, e.g. after an external change.
+
+        Value and metadata edits made through the tree call this already.
+
+        Args:
+            node (TreeNode): The node whose weight changed
+        """
+        number = self._numbers(node)[0]
+        offset = len(self._nodes)
+        index = self._position[number] + offset
+        value = self.weight(node)
+        sums = self._segments["sum"]
+        if sums[index] == value and type(sums[index]) is type(value):
+            return
+        for op, combine in (("sum", add), ("min", min), ("max", max)):
+            segments = self._segments[op]
+            slot = index
+            segments[slot] = value
+            slot >>= 1
+            while slot:
+                segments[slot] = combine(segments[2 * slot], segments[2 * slot + 1])
+                slot >>= 1
+
+    def attached(self, node: TreeNode) -> None:
+        self._stale = True
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        self._stale = True
+
+    def value_changed(self, node: TreeNode, old_value: Any) -> None:
+        if not self._stale:
+            self.update(node)
+
+    def metadata_changed(self, node: TreeNode, key: str, old_value: Any) -> None:
+        if not self._stale:
+            self.update(node)
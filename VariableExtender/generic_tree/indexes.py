@@ -0,0 +1,723 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Indexes - Incrementally maintained lookup structures for generic trees.
+
+Indexes are enabled on a :class:`Tree` (for example with
+``Tree.enable_value_index()``) and registered as tree listeners, so every
+edit made through the tree or node methods updates them in place instead of
+forcing a rebuild. Lookups then answer from hash tables instead of
+scanning the whole tree.
+
+Classes:
+    ValueIndex: Hash index from node values to the nodes holding them
+    MetadataIndex: Secondary index on one metadata key, with equality and
+        ordered range lookups
+    ChildIndex: Per-node index of the children of a very wide node, hashed
+        or kept sorted
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    from .generic_tree import Tree, TreeNode, _TreeListener, _MISSING
+except ImportError:
+    from generic_tree import Tree, TreeNode, _TreeListener, _MISSING
+
+
+class _Bucket(dict):
+    """Nodes sharing one value, keyed by ``id(node)`` in insertion order."""
+    __slots__ = ()
+
+
+# Values of these types never compare equal to an unhashable value.
+_SCALAR_TYPES = frozenset({str, int, float, complex, bool, type(None), tuple})
+
+
+def _matches(buckets: Dict[Any, Any], unhashable: Dict[int, TreeNode],
+             value: Any) -> List[TreeNode]:
+    """Get the nodes of a bucket table (plus its unhashable nodes) equal to ``value``.
+
+    A hashable value is looked up in its bucket; an unhashable one in the
+    bucket of its hashable twin (a ``set`` equals a ``frozenset``, a
+    ``bytearray`` equals ``bytes``). Unhashable nodes are compared one by
+    one, unless ``value`` is a scalar that cannot equal them.
+    """
+    try:
+        entry = buckets.get(value)
+    except TypeError:
+        if isinstance(value, (set, bytearray)):
+            twin = frozenset(value) if isinstance(value, set) else bytes(value)
+            entry = buckets.get(twin)
+        else:
+            entry = None
+    if entry is None:
+        found = []
+    elif isinstance(entry, _Bucket):
+        found = [node for node in entry.values() if node.value == value]
+    else:
+        found = [entry] if entry.value == value else []
+    if unhashable and type(value) not in _SCALAR_TYPES:
+        found.extend(node for node in unhashable.values() if node.value == value)
+    return found
+
+
+def _path_key(node: TreeNode, start: TreeNode) -> Optional[List[int]]:
+    """Get the child indexes leading from ``start`` down to ``node``.
+
+    Comparing keys orders nodes in pre-order; comparing ``(len(key), key)``
+    orders them in level order. Returns None if ``node`` is not below ``start``.
+    """
+    key = []
+    while node is not start:
+        parent = node.parent
+        if parent is None:
+            return None
+        key.append(parent._child_index(node))
+        node = parent
+    key.reverse()
+    return key
+
+
+def _is_below(node: TreeNode, start: TreeNode) -> bool:
+    """Check whether ``node`` is ``start`` or one of its descendants."""
+    while node is not None:
+        if node is start:
+            return True
+        node = node.parent
+    return False
+
+
+def _filter_below(nodes: Iterable[TreeNode], start: TreeNode) -> List[TreeNode]:
+    """Keep the nodes inside the subtree of ``start``.
+
+    Verdicts are memoized per ancestor, so filtering many nodes costs one
+    visit per distinct ancestor instead of one root walk per node.
+    """
+    verdicts: Dict[int, bool] = {id(start): True}
+    result = []
+    for node in nodes:
+        path = []
+        current = node
+        verdict = False
+        while current is not None:
+            known = verdicts.get(id(current))
+            if known is not None:
+                verdict = known
+                break
+            path.append(current)
+            current = current.parent
+        for visited in path:
+            verdicts[id(visited)] = verdict
+        if verdict:
+            result.append(node)
+    return result
+
+
+class ValueIndex(_TreeListener):
+    """Hash index mapping node values to the nodes holding them.
+
+    Nodes whose value is unhashable are kept aside and compared one by one,
+    but only with lookup values that could equal them (not with strings,
+    numbers, tuples or None), so hashable lookups stay O(1).
+
+    Attributes:
+        tree (Tree): The indexed tree
+        hits (int): Lookups whose value was found in the index
+        misses (int): Lookups answered by the index without a match
+        fallbacks (int): Lookups of unhashable values, or from a start node
+            outside the indexed tree
+    """
+
+    def __init__(self, tree: Tree):
+        """Initialize and build the index for a tree.
+
+        Args:
+            tree (Tree): The tree to index
+        """
+        self.tree = tree
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self._buckets: Dict[Any, Any] = {}
+        self._unhashable: Dict[int, TreeNode] = {}
+        # First match in the whole tree per value, in pre-order and level order.
+        self._first: Dict[Any, TreeNode] = {}
+        self._first_level: Dict[Any, TreeNode] = {}
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-index every node of the tree (e.g. after direct ``node.value`` edits)."""
+        self._buckets.clear()
+        self._unhashable.clear()
+        self._forget_firsts()
+        for node in self.tree._pre_order(self.tree.root):
+            self._add(node.value, node)
+
+    def __len__(self) -> int:
+        """Get the number of distinct hashable values in the index."""
+        return len(self._buckets)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the lookup counters and index size.
+
+        Returns:
+            Dict[str, int]: ``hits``, ``misses``, ``fallbacks``, ``values``
+            and ``unhashable_nodes``
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'fallbacks': self.fallbacks,
+            'values': len(self._buckets),
+            'unhashable_nodes': len(self._unhashable),
+        }
+
+    def reset_stats(self) -> None:
+        """Reset the lookup counters."""
+        self.hits = self.misses = self.fallbacks = 0
+
+    def _forget_firsts(self, value: Any = _MISSING) -> None:
+        """Drop the cached first match of one value (of every value by default)."""
+        if value is _MISSING:
+            self._first.clear()
+            self._first_level.clear()
+        else:
+            self._first.pop(value, None)
+            self._first_level.pop(value, None)
+
+    def _add(self, value: Any, node: TreeNode) -> None:
+        try:
+            entry = self._buckets.get(value)
+        except TypeError:
+            self._unhashable[id(node)] = node
+            return
+        self._forget_firsts(value)
+        if entry is None:
+            self._buckets[value] = node
+        elif isinstance(entry, _Bucket):
+            entry[id(node)] = node
+        else:
+            self._buckets[value] = _Bucket({id(entry): entry, id(node): node})
+
+    def _discard(self, value: Any, node: TreeNode) -> None:
+        try:
+            entry = self._buckets.get(value)
+        except TypeError:
+            self._unhashable.pop(id(node), None)
+            return
+        self._forget_firsts(value)
+        if entry is node:
+            del self._buckets[value]
+        elif isinstance(entry, _Bucket):
+            entry.pop(id(node), None)
+            if len(entry) == 1:
+                self._buckets[value] = next(iter(entry.values()))
+
+    def nodes(self, value: Any) -> List[TreeNode]:
+        """Get every node holding a value, in no particular order.
+
+        Args:
+            value (Any): The value to look up
+
+        Returns:
+            List[TreeNode]: The matching nodes
+        """
+        try:
+            hash(value)
+        except TypeError:
+            self.fallbacks += 1
+        found = _matches(self._buckets, self._unhashable, value)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
+
+    def find(self, value: Any, start: Optional[TreeNode] = None,
+             breadth_first: bool = False) -> Optional[TreeNode]:
+        """Find the node holding a value that a scan would find first.
+
+        The first match in the whole tree is cached per value until a node
+        holding that value is added, removed or renamed, or children are
+        reordered; a later lookup returns it directly, also from a ``start``
+        node above it (pre-order and level order restricted to a subtree
+        keep their order).
+
+        Args:
+            value (Any): The value to search for
+            start (Optional[TreeNode]): Node to start from (default: root)
+            breadth_first (bool): Return the first match in level order
+                instead of pre-order
+
+        Returns:
+            Optional[TreeNode]: The found node, or None if not found
+        """
+        tree = self.tree
+        root = tree.root
+        start = start or root
+        if start._tree is not tree:
+            self.fallbacks += 1
+            return self._scan(value, start, breadth_first)
+        cache = self._first_level if breadth_first else self._first
+        try:
+            first = cache.get(value)
+        except TypeError:
+            cache = None
+            first = None
+        if first is not None:
+            self.hits += 1
+        else:
+            candidates = self.nodes(value)
+            if not candidates:
+                return None
+            first = self._earliest(candidates, root, breadth_first)
+            if cache is not None:
+                cache[value] = first
+        if start is root or _is_below(first, start):
+            return first
+        candidates = _filter_below(_matches(self._buckets, self._unhashable, value), start)
+        return self._earliest(candidates, start, breadth_first) if candidates else None
+
+    def _earliest(self, candidates: List[TreeNode], start: TreeNode,
+                  breadth_first: bool) -> TreeNode:
+        if len(candidates) == 1:
+            return candidates[0]
+        if breadth_first:
+            return min(candidates, key=lambda node: self._level_key(node, start))
+        return min(candidates, key=lambda node: _path_key(node, start))
+
+    @staticmethod
+    def _level_key(node: TreeNode, start: TreeNode) -> tuple:
+        key = _path_key(node, start)
+        return (len(key), key)
+
+    def _scan(self, value: Any, start: TreeNode, breadth_first: bool) -> Optional[TreeNode]:
+        walk = self.tree._level_order if breadth_first else self.tree._pre_order
+        for node in walk(start):
+            if node.value == value:
+                return node
+        return None
+
+    def attached(self, node: TreeNode) -> None:
+        for item in self.tree._pre_order(node):
+            self._add(item.value, item)
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        for item in self.tree._pre_order(node):
+            self._discard(item.value, item)
+
+    def value_changed(self, node: TreeNode, old_value: Any) -> None:
+        self._discard(old_value, node)
+        self._add(node.value, node)
+
+    def reordered(self, node: TreeNode) -> None:
+        self._forget_firsts()
+
+
+class MetadataIndex(_TreeListener):
+    """Secondary index on one metadata key of every node of a tree.
+
+    Supports equality lookups through a hash table and ordered range
+    lookups through a sorted list of the distinct values. Nodes whose value
+    for the key is unhashable are kept aside and compared one by one.
+
+    Attributes:
+        tree (Tree): The indexed tree
+        key (str): The indexed metadata key
+    """
+
+    def __init__(self, tree: Tree, key: str):
+        """Initialize and build the index for one metadata key.
+
+        Args:
+            tree (Tree): The tree to index
+            key (str): The metadata key to index
+        """
+        self.tree = tree
+        self.key = key
+        self._buckets: Dict[Any, Dict[int, TreeNode]] = {}
+        self._unhashable: Dict[int, TreeNode] = {}
+        self._sorted: Optional[List[Any]] = None
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-index every node of the tree (e.g. after direct ``node.metadata`` edits)."""
+        self._buckets.clear()
+        self._unhashable.clear()
+        self._sorted = []
+        for node in self.tree._pre_order(self.tree.root):
+            self._add_node(node)
+
+    def __len__(self) -> int:
+        """Get the number of indexed nodes."""
+        return sum(len(bucket) for bucket in self._buckets.values()) + len(self._unhashable)
+
+    def _add_node(self, node: TreeNode) -> None:
+        value = node.metadata.get(self.key, _MISSING)
+        if value is _MISSING:
+            return
+        try:
+            bucket = self._buckets.get(value)
+        except TypeError:
+            self._unhashable[id(node)] = node
+            return
+        if bucket is not None:
+            bucket[id(node)] = node
+            return
+        self._buckets[value] = {id(node): node}
+        if self._sorted is not None:
+            try:
+                insort(self._sorted, value)
+            except TypeError:
+                self._sorted = None
+
+    def _discard(self, value: Any, node: TreeNode) -> None:
+        try:
+            bucket = self._buckets.get(value)
+        except TypeError:
+            self._unhashable.pop(id(node), None)
+            return
+        if bucket is None or bucket.pop(id(node), None) is None or bucket:
+            return
+        del self._buckets[value]
+        if self._sorted is not None:
+            index = bisect_left(self._sorted, value)
+            if index < len(self._sorted) and self._sorted[index] == value:
+                del self._sorted[index]
+
+    def _sorted_values(self) -> List[Any]:
+        if self._sorted is None:
+            try:
+                self._sorted = sorted(self._buckets)
+            except TypeError:
+                raise TypeError(f"values of metadata key {self.key!r} are not "
+                                f"mutually orderable") from None
+        return self._sorted
+
+    def find(self, value: Any, start: Optional[TreeNode] = None) -> List[TreeNode]:
+        """Get the nodes whose metadata value for the key equals ``value``.
+
+        Args:
+            value (Any): The metadata value to match
+            start (Optional[TreeNode]): Only return nodes in this subtree
+
+        Returns:
+            List[TreeNode]: Matching nodes, in no particular order
+        """
+        try:
+            bucket = self._buckets.get(value)
+        except TypeError:
+            bucket = None
+        found = list(bucket.values()) if bucket else []
+        if self._unhashable:
+            found.extend(node for node in self._unhashable.values()
+                         if node.metadata.get(self.key, _MISSING) == value)
+        return self._restrict(found, start)
+
+    def find_range(self, low: Any = None, high: Any = None, start: Optional[TreeNode] = None,
+                   include_low: bool = True, include_high: bool = True) -> List[TreeNode]:
+        """Get the nodes whose metadata value for the key lies in a range.
+
+        Args:
+            low (Any): Lower bound (None for no lower bound)
+            high (Any): Upper bound (None for no upper bound)
+            start (Optional[TreeNode]): Only return nodes in this subtree
+            include_low (bool): Whether the lower bound is inclusive
+            include_high (bool): Whether the upper bound is inclusive
+
+        Returns:
+            List[TreeNode]: Matching nodes, ordered by metadata value
+
+        Raises:
+            TypeError: If the indexed values cannot be ordered
+        """
+        values = self._sorted_values()
+        lo = 0 if low is None else (bisect_left if include_low else bisect_right)(values, low)
+        hi = (len(values) if high is None
+              else (bisect_right if include_high else bisect_left)(values, high))
+        found = []
+        for value in values[lo:hi]:
+            found.extend(self._buckets[value].values())
+        if self._unhashable:
+            key = self.key
+            extra = [node for node in self._unhashable.values()
+                     if _in_range(node.metadata[key], low, high, include_low, include_high)]
+            if extra:
+                found = sorted(found + extra, key=lambda node: node.metadata[key])
+        return self._restrict(found, start)
+
+    def _restrict(self, nodes: List[TreeNode], start: Optional[TreeNode]) -> List[TreeNode]:
+        if start is None or start is self.tree.root:
+            return nodes
+        return _filter_below(nodes, start)
+
+    def attached(self, node: TreeNode) -> None:
+        for item in self.tree._pre_order(node):
+            self._add_node(item)
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        key = self.key
+        for item in self.tree._pre_order(node):
+            value = item.metadata.get(key, _MISSING)
+            if value is not _MISSING:
+                self._discard(value, item)
+
+    def metadata_changed(self, node: TreeNode, key: str, old_value: Any) -> None:
+        if key != self.key:
+            return
+        if old_value is not _MISSING:
+            self._discard(old_value, node)
+        self._add_node(node)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class ChildIndex:
+    """Index over the children of one node, kept current by the node methods.
+
+    Enabled per node with ``node.enable_child_index()``. In hash mode the
+    children keep their order and values map to the children holding them.
+    In ordered mode the children list itself is kept sorted by
+    ``key(value)`` (stable, so equal keys stay in insertion order) next to a
+    parallel list of keys, so lookups and ranges bisect; ``sort_children``
+    and ``reverse_children`` leave such nodes in key order.
+
+    Edits through ``add_child``, ``add_node``, ``remove_child`` and
+    ``set_value`` keep the index current; call :meth:`rebuild` after
+    editing the children list or a child's ``value`` directly.
+
+    Attributes:
+        node (TreeNode): The node whose children are indexed
+        ordered (bool): Whether the children are kept sorted
+        key (Optional[Callable]): Sort key of ordered mode (None: the value)
+    """
+
+    def __init__(self, node: TreeNode, ordered: bool = False,
+                 key: Optional[Callable[[Any], Any]] = None):
+        """Initialize and build the index for a node.
+
+        Args:
+            node (TreeNode): The node whose children to index
+            ordered (bool): Keep the children sorted instead of in insertion order
+            key (Optional[Callable]): Sort key for ordered mode (default: the value)
+        """
+        self.node = node
+        self.ordered = ordered
+        self.key = key
+        self._key = key or _identity
+        self._buckets: Dict[Any, Any] = {}
+        self._unhashable: Dict[int, TreeNode] = {}
+        self._keys: List[Any] = []
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-index the children (sorting them again in ordered mode).
+
+        Raises:
+            TypeError: In ordered mode, if the keys cannot be ordered
+        """
+        node = self.node
+        children = node.children
+        if self.ordered:
+            key = self._key
+            keys = [key(child.value) for child in children]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self._keys = [keys[index] for index in order]
+            if any(index != position for position, index in enumerate(order)):
+                children[:] = [children[index] for index in order]
+                if node._tree is not None and node._tree._listeners:
+                    node._tree._reordered(node)
+            return
+        self._buckets.clear()
+        self._unhashable.clear()
+        for child in children:
+            self._add(child.value, child)
+        node._renumber_children()
+
+    def __len__(self) -> int:
+        """Get the number of indexed children."""
+        return len(self.node.children)
+
+    def _add(self, value: Any, child: TreeNode) -> None:
+        try:
+            entry = self._buckets.get(value)
+        except TypeError:
+            self._unhashable[id(child)] = child
+            return
+        if entry is None:
+            self._buckets[value] = child
+        elif isinstance(entry, _Bucket):
+            entry[id(child)] = child
+        else:
+            self._buckets[value] = _Bucket({id(entry): entry, id(child): child})
+
+    def _discard(self, value: Any, child: TreeNode) -> None:
+        try:
+            entry = self._buckets.get(value)
+        except TypeError:
+            self._unhashable.pop(id(child), None)
+            return
+        if entry is child:
+            del self._buckets[value]
+        elif isinstance(entry, _Bucket):
+            entry.pop(id(child), None)
+            if len(entry) == 1:
+                self._buckets[value] = next(iter(entry.values()))
+
+    def _scan(self, value: Any) -> Optional[TreeNode]:
+        for child in self.node.children:
+            if child.value == value:
+                return child
+        return None
+
+    def find(self, value: Any) -> Optional[TreeNode]:
+        """Get the first child holding a value, as a scan would find it.
+
+        Args:
+            value (Any): The value to look up
+
+        Returns:
+            Optional[TreeNode]: The first matching child, or None
+        """
+        if self.ordered:
+            children = self.node.children
+            keys = self._keys
+            try:
+                wanted = self._key(value)
+                index = bisect_left(keys, wanted)
+            except TypeError:
+                return self._scan(value)
+            while index < len(keys) and keys[index] == wanted:
+                if children[index].value == value:
+                    return children[index]
+                index += 1
+            return None
+        found = _matches(self._buckets, self._unhashable, value)
+        if len(found) > 1:
+            return min(found, key=self.node._child_index)
+        return found[0] if found else None
+
+    def find_range(self, low: Any = None, high: Any = None, include_low: bool = True,
+                   include_high: bool = True) -> List[TreeNode]:
+        """Get the children whose key lies in a range (ordered mode only).
+
+        Args:
+            low (Any): Lower bound (None for no lower bound)
+            high (Any): Upper bound (None for no upper bound)
+            include_low (bool): Whether the lower bound is inclusive
+            include_high (bool): Whether the upper bound is inclusive
+
+        Returns:
+            List[TreeNode]: Matching children, in key order
+
+        Raises:
+            ValueError: If the index is not ordered
+        """
+        if not self.ordered:
+            raise ValueError("range lookups need an ordered child index")
+        keys = self._keys
+        lo = 0 if low is None else (bisect_left if include_low else bisect_right)(keys, low)
+        hi = (len(keys) if high is None
+              else (bisect_right if include_high else bisect_left)(keys, high))
+        return self.node.children[lo:hi]
+
+    def index_of(self, child: TreeNode, key: Any = _MISSING) -> int:
+        """Get the position of a child by identity (ordered mode), or -1."""
+        children = self.node.children
+        keys = self._keys
+        try:
+            wanted = self._key(child.value) if key is _MISSING else key
+            index = bisect_left(keys, wanted)
+            while index < len(keys) and keys[index] == wanted:
+                if children[index] is child:
+                    return index
+                index += 1
+        except TypeError:
+            pass
+        for index, item in enumerate(children):
+            if item is child:
+                return index
+        return -1
+
+    def position_for(self, value: Any) -> int:
+        """Get the position a new child holding ``value`` would be inserted at.
+
+        Args:
+            value (Any): The value of the new child
+
+        Returns:
+            int: The insertion position (the end in hash mode)
+
+        Raises:
+            TypeError: In ordered mode, if the key cannot be compared with the others
+        """
+        if not self.ordered:
+            return len(self.node.children)
+        return bisect_right(self._keys, self._key(value))
+
+    def insert(self, child: TreeNode) -> None:
+        """Add a child to the node at its place (the end in hash mode)."""
+        node = self.node
+        if not self.ordered:
+            child._position = node._next_slot()
+            node._append_child(child)
+            self._add(child.value, child)
+            return
+        wanted = self._key(child.value)
+        keys = self._keys
+        index = bisect_right(keys, wanted)
+        if index == len(keys):
+            node._append_child(child)
+        else:
+            node.children.insert(index, child)
+        keys.insert(index, wanted)
+        child._position = None
+
+    def discard(self, child: TreeNode, index: int) -> None:
+        """Forget a child that was removed from position ``index``."""
+        if self.ordered:
+            del self._keys[index]
+        else:
+            self._discard(child.value, child)
+
+    def value_changed(self, child: TreeNode, old_value: Any) -> None:
+        """Re-index a child after ``set_value`` (moving it in ordered mode)."""
+        if not self.ordered:
+            self._discard(old_value, child)
+            self._add(child.value, child)
+            return
+        node = self.node
+        index = self.index_of(child, self._key(old_value))
+        if index < 0:
+            return
+        children = node.children
+        keys = self._keys
+        wanted = self._key(child.value)
+        target = bisect_right(keys, wanted)
+        if target > index:
+            target -= 1
+        del children[index]
+        del keys[index]
+        children.insert(target, child)
+        keys.insert(target, wanted)
+        if target != index and node._tree is not None and node._tree._listeners:
+            node._tree._reordered(node)
+
+
+def _in_range(value: Any, low: Any, high: Any, include_low: bool, include_high: bool) -> bool:
+    """Check a value against optional bounds, treating incomparable values as outside."""
+    try:
+        if low is not None and (value < low if include_low else value <= low):
+            return False
+        if high is not None and (value > high if include_high else value >= high):
+            return False
+    except TypeError:
+        return False
+    return True
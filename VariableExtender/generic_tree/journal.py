@@ -0,0 +1,405 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Journal - Append-only change log with snapshots for durable trees.
+
+A :class:`TreeJournal` listens to the edits of a tree and appends one JSON
+line per mutation to a log file, so making a change durable costs
+O(change) instead of rewriting the whole tree. Lines are buffered and
+written with a single ``fsync`` per batch: once ``batch_size`` operations
+are pending, at the first operation after ``sync_interval`` seconds, and
+on :meth:`TreeJournal.sync` / ``close``.
+
+Files, for a journal at ``path``:
+    ``path``: snapshot; a JSON header line ``{"seq": S}`` followed by the
+        tree JSON (as written by :meth:`Tree.dump`)
+    ``path.log``: operations after the snapshot; a header line
+        ``{"seq": S}`` then one operation per line
+    ``path.log.compacting``: the previous log while a compaction runs
+
+Operations address nodes by journal ids: at the sequence number in a
+log's header, the nodes are numbered ``0..n-1`` in pre-order, and new
+nodes take the following numbers in the order they are added. Each
+operation carries its sequence number, so replay skips what the snapshot
+already contains. :meth:`TreeJournal.compact` folds the log into a new
+snapshot; the snapshot file is written by a background thread from an
+immutable copy while new operations go to a fresh log.
+
+Only edits made through the tree and node methods are journaled (direct
+assignments to ``node.value`` or ``children`` are not seen).
+
+Example:
+    >>> journal = tree.enable_journal("config.tree")
+    >>> tree.root.set_metadata("version", 2)      # appended to config.tree.log
+    >>> journal.sync()
+    >>> tree = Tree.open_journal("config.tree")   # snapshot + log replay
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .generic_tree import Tree, TreeNode, _TreeListener
+except ImportError:
+    from generic_tree import Tree, TreeNode, _TreeListener
+
+_ENCODER = json.JSONEncoder(default=str, ensure_ascii=False, separators=(',', ':'))
+_LOG_SUFFIX = '.log'
+_COMPACTING_SUFFIX = '.log.compacting'
+
+
+def _fsync_directory(path: str) -> None:
+    """Make a rename in the directory of ``path`` durable (where supported)."""
+    try:
+        descriptor = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def _write_snapshot(tree: Tree, path: str, seq: int) -> None:
+    """Atomically replace the snapshot at ``path`` with ``tree`` at ``seq``."""
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(_ENCODER.encode({'seq': seq}) + '\n')
+        tree.dump(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    _fsync_directory(path)
+
+
+def _read_log(path: str) -> Tuple[Optional[int], List[Dict[str, Any]], int]:
+    """Read a log file.
+
+    Returns:
+        Tuple: The header sequence number (None if the file is missing or
+        empty), the operations, and the byte length of the valid prefix
+        (a torn last line from a crash is left out)
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None, [], 0
+    with f:
+        header_line = f.readline()
+        if not header_line.endswith(b'\n'):
+            return None, [], 0
+        header = json.loads(header_line)
+        operations = []
+        valid = len(header_line)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                operations.append(json.loads(line))
+            except ValueError:
+                break
+            valid += len(line)
+        return header['seq'], operations, valid
+
+
+class TreeJournal(_TreeListener):
+    """Appends the edits of a tree to a log file and compacts it into snapshots.
+
+    Use :meth:`Tree.enable_journal` to start journaling a tree and
+    :meth:`Tree.open_journal` to load one back.
+
+    Attributes:
+        tree (Tree): The journaled tree
+        path (str): Path of the snapshot file
+        seq (int): Sequence number of the last journaled operation
+        batch_size (int): Number of buffered operations that triggers a sync
+        sync_interval (float): Seconds after which buffered operations are synced
+    """
+
+    def __init__(self, tree: Tree, path: str, seq: int = 0, batch_size: int = 256,
+                 sync_interval: float = 1.0):
+        """Attach a journal to a tree whose state is at sequence number ``seq``.
+
+        The nodes are numbered in pre-order. No file is opened or written;
+        use :meth:`create` or :meth:`load`.
+
+        Args:
+            tree (Tree): The tree to journal
+            path (str): Path of the snapshot file
+            seq (int): Sequence number of the tree's current state
+            batch_size (int): Number of buffered operations that triggers a sync
+            sync_interval (float): Seconds after which buffered operations are synced
+        """
+        self.tree = tree
+        self.path = path
+        self.seq = seq
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self._ids: Dict[int, int] = {}
+        self._next_id = 0
+        self._buffer: List[str] = []
+        self._last_sync = time.monotonic()
+        self._log = None
+        self._compaction: Optional[threading.Thread] = None
+        self._compaction_error: Optional[BaseException] = None
+        self._number()
+
+    @classmethod
+    def create(cls, tree: Tree, path: str, **options: Any) -> TreeJournal:
+        """Write a snapshot of ``tree`` at ``path``, start an empty log and journal it.
+
+        Args:
+            tree (Tree): The tree to journal
+            path (str): Path of the snapshot file (overwritten)
+            **options: ``batch_size`` and ``sync_interval``
+
+        Returns:
+            TreeJournal: The journal (not yet registered on the tree)
+        """
+        _write_snapshot(tree, path, 0)
+        for stale in (path + _LOG_SUFFIX, path + _COMPACTING_SUFFIX):
+            if os.path.exists(stale):
+                os.remove(stale)
+        journal = cls(tree, path, 0, **options)
+        journal._start_log(0)
+        return journal
+
+    @classmethod
+    def load(cls, path: str, node_class: type = TreeNode,
+             **options: Any) -> TreeJournal:
+        """Load the snapshot at ``path`` and replay its logs.
+
+        Args:
+            path (str): Path of the snapshot file
+            node_class (type): Node type to build the tree from
+            **options: ``batch_size`` and ``sync_interval``
+
+        Returns:
+            TreeJournal: The journal of the loaded tree (not yet registered)
+
+        Raises:
+            ValueError: If a log does not continue the snapshot
+        """
+        with open(path, 'rb') as f:
+            seq = json.loads(f.readline())['seq']
+            tree = Tree.load(f, node_class)
+        journal = cls(tree, path, seq, **options)
+        nodes = list(tree._pre_order(tree.root))
+        log_path = path + _LOG_SUFFIX
+        valid = 0
+        for name in (path + _COMPACTING_SUFFIX, log_path):
+            log_seq, operations, valid = _read_log(name)
+            if log_seq is None:
+                continue
+            if log_seq > journal.seq:
+                raise ValueError(f"{name} starts at operation {log_seq}, "
+                                 f"after the last known operation {journal.seq}")
+            if log_seq == journal.seq:
+                nodes = list(tree._pre_order(tree.root))
+            for operation in operations:
+                if operation['seq'] > journal.seq:
+                    journal._replay(operation, nodes)
+                    journal.seq = operation['seq']
+        # Keep the numbering of the log that will be appended to.
+        live = {id(node) for node in tree._pre_order(tree.root)}
+        journal._ids = {id(node): index for index, node in enumerate(nodes)
+                        if node is not None and id(node) in live}
+        journal._next_id = len(nodes)
+        if os.path.exists(path + _COMPACTING_SUFFIX):
+            journal._checkpoint()
+        elif os.path.exists(log_path):
+            with open(log_path, 'r+b') as f:
+                f.truncate(valid)
+            journal._log = open(log_path, 'a', encoding='utf-8')
+        else:
+            journal._start_log(journal.seq)
+        return journal
+
+    def _replay(self, operation: Dict[str, Any], nodes: List[TreeNode]) -> None:
+        """Apply one logged operation; ``nodes`` maps journal ids to nodes."""
+        tree = self.tree
+        kind = operation['op']
+        node = nodes[operation['id']] if kind != 'add' else nodes[operation['parent']]
+        if kind == 'add':
+            data = operation['node']
+            child = type(tree.root)(value=data.get('value'))
+            if 'metadata' in data:
+                child.metadata = data['metadata']
+            Tree._build_from_dict(child, data.get('children', []))
+            tree.add_node(node, child)
+            if 'index' in operation:
+                children = node.children
+                children.pop()
+                children.insert(operation['index'], child)
+            first = operation['first']
+            nodes.extend([None] * (first - len(nodes)))
+            nodes.extend(tree._pre_order(child))
+        elif kind == 'del':
+            tree.remove_child(node.parent, node)
+        elif kind == 'value':
+            node.value = operation['value']
+        elif kind == 'meta':
+            node._store_metadata(operation['key'], operation['value'])
+        elif kind == 'unmeta':
+            node.metadata.pop(operation['key'], None)
+        elif kind == 'order':
+            node.children = [nodes[index] for index in operation['children']]
+            node._renumber_children()
+        else:
+            raise ValueError(f"unknown journal operation {kind!r}")
+
+    def _number(self) -> None:
+        """Number the nodes of the tree in pre-order."""
+        self._ids = {id(node): index
+                     for index, node in enumerate(self.tree._pre_order(self.tree.root))}
+        self._next_id = len(self._ids)
+
+    def _start_log(self, seq: int) -> None:
+        """Open a new, empty log whose ids are the current pre-order numbering."""
+        log_path = self.path + _LOG_SUFFIX
+        self._log = open(log_path, 'w', encoding='utf-8')
+        self._log.write(_ENCODER.encode({'seq': seq}) + '\n')
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def _append(self, operation: Dict[str, Any]) -> None:
+        self.seq += 1
+        operation['seq'] = self.seq
+        self._buffer.append(_ENCODER.encode(operation) + '\n')
+        if (len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+
+    def sync(self) -> None:
+        """Write the buffered operations and ``fsync`` the log."""
+        if self._buffer and self._log is not None:
+            self._log.write(''.join(self._buffer))
+            self._buffer.clear()
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        self._last_sync = time.monotonic()
+
+    def compact(self, background: bool = False) -> None:
+        """Fold the log into a new snapshot.
+
+        The current state is captured immediately (as an immutable copy) and
+        later operations go to a new log; writing the snapshot file, the
+        O(tree) part, can run in a background thread.
+
+        Args:
+            background (bool): Write the snapshot in a background thread
+        """
+        self.wait()
+        log_path = self.path + _LOG_SUFFIX
+        compacting_path = self.path + _COMPACTING_SUFFIX
+        if os.path.exists(compacting_path):
+            # A previous compaction did not finish; its log must not be replaced.
+            self._checkpoint()
+            return
+        self.sync()
+        if self._log is not None:
+            self._log.close()
+        if os.path.exists(log_path):
+            os.replace(log_path, compacting_path)
+        seq = self.seq
+        self._number()
+        self._start_log(seq)
+        frozen = self.tree.to_persistent()
+        node_class = type(self.tree.root)
+
+        def write() -> None:
+            try:
+                _write_snapshot(frozen.to_tree(node_class), self.path, seq)
+                if os.path.exists(compacting_path):
+                    os.remove(compacting_path)
+            except BaseException as error:
+                self._compaction_error = error
+
+        if background:
+            self._compaction = threading.Thread(target=write, name='tree-journal-compaction',
+                                                daemon=True)
+            self._compaction.start()
+        else:
+            write()
+            self._raise_compaction_error()
+
+    def _checkpoint(self) -> None:
+        """Write a snapshot of the current state synchronously and reset the logs."""
+        self.sync()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self._number()
+        _write_snapshot(self.tree, self.path, self.seq)
+        compacting_path = self.path + _COMPACTING_SUFFIX
+        if os.path.exists(compacting_path):
+            os.remove(compacting_path)
+        self._start_log(self.seq)
+
+    def wait(self) -> None:
+        """Wait for a background compaction to finish.
+
+        Raises:
+            Exception: The error of a failed background compaction
+        """
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+        self._raise_compaction_error()
+
+    def _raise_compaction_error(self) -> None:
+        error = self._compaction_error
+        if error is not None:
+            self._compaction_error = None
+            raise error
+
+    def close(self) -> None:
+        """Sync the log, finish any compaction and close the log file."""
+        self.sync()
+        self.wait()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def attached(self, node: TreeNode) -> None:
+        ids = self._ids
+        first = self._next_id
+        for item in self.tree._pre_order(node):
+            ids[id(item)] = self._next_id
+            self._next_id += 1
+        operation = {'op': 'add', 'parent': ids[id(node.parent)], 'first': first,
+                     'node': self.tree.to_dict(node)}
+        # Children of an ordered child index are inserted in place, not appended.
+        position = node.parent._child_index(node)
+        if position < len(node.parent.children) - 1:
+            operation['index'] = position
+        self._append(operation)
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        ids = self._ids
+        self._append({'op': 'del', 'id': ids[id(node)]})
+        for item in self.tree._pre_order(node):
+            ids.pop(id(item), None)
+
+    def value_changed(self, node: TreeNode, old_value: Any) -> None:
+        self._append({'op': 'value', 'id': self._ids[id(node)], 'value': node.value})
+
+    def metadata_changed(self, node: TreeNode, key: str, old_value: Any) -> None:
+        if key in node.metadata:
+            self._append({'op': 'meta', 'id': self._ids[id(node)], 'key': key,
+                          'value': node.metadata[key]})
+        else:
+            self._append({'op': 'unmeta', 'id': self._ids[id(node)], 'key': key})
+
+    def reordered(self, node: TreeNode) -> None:
+        ids = self._ids
+        self._append({'op': 'order', 'id': ids[id(node)],
+                      'children': [ids[id(child)] for child in node.children]})
@@ -0,0 +1,193 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""JSON Stream - Incremental loader for trees saved as JSON.
+
+:func:`load_tree` parses the layout written by :meth:`Tree.to_json` /
+:meth:`Tree.save_to_file` (``{"value": ..., "children": [...], "metadata": {...}}``)
+straight from a file object, reading it in fixed-size chunks and creating
+nodes as their opening brace is reached. Open nodes are kept on an explicit
+stack, so neither the depth of the tree nor the size of the file is limited
+by recursion or by holding the whole document in memory. Only node values
+and metadata are decoded as complete JSON values.
+
+Example:
+    >>> with open("tree.json", "rb") as f:
+    ...     tree = load_tree(f, progress=lambda read, nodes: print(read, nodes))
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Callable, Optional
+
+try:
+    from .generic_tree import Tree, TreeNode
+except ImportError:
+    from generic_tree import Tree, TreeNode
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+# Kinds of open containers on the parser stack.
+_OBJECT, _ARRAY = range(2)
+
+
+class _ChunkReader:
+    """Sliding text buffer over a file object, refilled on demand."""
+
+    def __init__(self, fp, chunk_size: int,
+                 progress: Optional[Callable[[int, int], None]]):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.consumed = 0
+        self.nodes = 0
+        self._decoder = None
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer; return False at end of input."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if isinstance(chunk, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder('utf-8')()
+            self.consumed += len(chunk)
+            text = self._decoder.decode(chunk, final=not chunk)
+        else:
+            self.consumed += len(chunk)
+            text = chunk
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        if self.progress is not None:
+            self.progress(self.consumed, self.nodes)
+        return bool(chunk)
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill() and self.pos >= len(self.buffer):
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def read_key(self) -> str:
+        if self.peek() != '"':
+            raise self.error("Expecting property name enclosed in double quotes")
+        while True:
+            try:
+                key, end = scanstring(self.buffer, self.pos + 1)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            self.pos = end
+            return key
+
+    def read_value(self) -> Any:
+        """Decode one complete JSON value, reading more input until it fits."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number cut by the end of the buffer ("12", "3." or "1e") may continue.
+            if (end == len(self.buffer) or self.buffer[end] in _NUMBER_CHARS) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def load_tree(fp, node_class: type = TreeNode,
+              progress: Optional[Callable[[int, int], None]] = None,
+              chunk_size: int = 1 << 16) -> Tree:
+    """Build a tree from a JSON file object without loading the whole document.
+
+    Args:
+        fp: Readable file object, in text or binary (UTF-8) mode
+        node_class (type): Node type to build the tree from
+        progress (Optional[Callable[[int, int], None]]): Called after every chunk
+            with the number of bytes (characters in text mode) read so far and
+            the number of nodes built
+        chunk_size (int): Number of bytes/characters read at a time
+
+    Returns:
+        Tree: The loaded tree
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+        ValueError: If the JSON does not describe a tree
+    """
+    reader = _ChunkReader(fp, chunk_size, progress)
+    if reader.peek() != '{':
+        raise ValueError("tree JSON must be an object with 'value' and 'children'")
+    reader.pos += 1
+    tree = Tree(node_class=node_class)
+    reader.nodes = 1
+    # Frames: [kind, node, first]
+    stack = [[_OBJECT, tree.root, True]]
+    while stack:
+        frame = stack[-1]
+        kind, node, first = frame
+        char = reader.peek()
+        if char == ('}' if kind == _OBJECT else ']'):
+            reader.pos += 1
+            stack.pop()
+            continue
+        if not first:
+            reader.expect(',')
+        frame[2] = False
+        if kind == _ARRAY:
+            char = reader.peek()
+            if char != '{':
+                if char in ('', ',', ']', '}'):
+                    raise reader.error("Expecting value")
+                raise ValueError("tree JSON children must be objects")
+            reader.pos += 1
+            child = node.add_child(None)
+            reader.nodes += 1
+            stack.append([_OBJECT, child, True])
+            continue
+        key = reader.read_key()
+        reader.expect(':')
+        if key == 'children':
+            if reader.peek() != '[':
+                raise ValueError("tree JSON 'children' must be a list")
+            reader.pos += 1
+            stack.append([_ARRAY, node, True])
+        elif key == 'value':
+            node.value = reader.read_value()
+        elif key == 'metadata':
+            node.metadata = reader.read_value()
+        else:
+            reader.read_value()
+
+    if reader.peek():
+        raise reader.error("Extra data")
+    tree._node_count = reader.nodes
+    if progress is not None:
+        progress(reader.consumed, reader.nodes)
+    return tree
@@ -0,0 +1,267 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Parallel - Process-pool execution of map, reduce and apply over a tree.
+
+:class:`ParallelExecutor` numbers the nodes in pre-order (through a
+:class:`FlatTree`) and cuts the tree into work units: every subtree of at
+most ``chunk_size`` nodes is kept whole, larger subtrees are split below
+their root. Because subtrees are contiguous in pre-order, consecutive units
+are packed into tasks that are plain index ranges of at most
+``chunk_size`` nodes. A task ships only what its function needs (the
+values, plus relative parent indexes and metadata for ``apply``) to a
+``ProcessPoolExecutor`` worker, and results are stitched back in pre-order.
+
+Functions run in other processes, so they (and the values) must be
+picklable: use module-level functions, not lambdas. With ``workers=1``, or
+when the tree fits in a single task, everything runs in the calling
+process.
+
+Example:
+    >>> def score(value):
+    ...     return value * value
+    >>> with ParallelExecutor(workers=4) as executor:
+    ...     scored = executor.map(tree, score)
+    ...     total = executor.reduce(scored, operator.add)
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .generic_tree import Tree, TreeNode, _MISSING, _same_items, _same_value
+    from .flat_tree import FlatTree, _index_typecode
+except ImportError:
+    from generic_tree import Tree, TreeNode, _MISSING, _same_items, _same_value
+    from flat_tree import FlatTree, _index_typecode
+
+# Tasks per worker when chunk_size is not given, so that uneven tasks balance out.
+_TASKS_PER_WORKER = 4
+_MIN_CHUNK_SIZE = 64
+
+
+def _work_ranges(size: array, end: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Cut the pre-order range ``[0, end)`` into tasks of at most ``chunk_size`` nodes.
+
+    A subtree that fits in ``chunk_size`` is never split; the root of a
+    larger one forms a unit of its own and its children are examined next.
+    """
+    ranges = []
+    task_start = 0
+    task_length = 0
+    index = 0
+    while index < end:
+        step = size[index] if size[index] <= chunk_size else 1
+        if task_length and task_length + step > chunk_size:
+            ranges.append((task_start, index))
+            task_start = index
+            task_length = 0
+        task_length += step
+        index += step
+    if task_length:
+        ranges.append((task_start, end))
+    return ranges
+
+
+def _fold(func: Callable[[Any, Any], Any], values: List[Any], accumulator: Any = None) -> Any:
+    """Fold values left to right the way :meth:`Tree.reduce` does."""
+    for value in values:
+        accumulator = func(accumulator, value) if accumulator is not None else value
+    return accumulator
+
+
+def _map_task(func: Callable[[Any], Any], values: List[Any]) -> List[Any]:
+    """Worker: map the values of one task."""
+    return [func(value) for value in values]
+
+
+def _reduce_task(func: Callable[[Any, Any], Any], values: List[Any]) -> Any:
+    """Worker: reduce the values of one task to a partial result."""
+    return _fold(func, values)
+
+
+def _apply_task(func: Callable[[TreeNode], None], values: List[Any], parents: array,
+                metadata: Dict[int, Dict[str, Any]]) -> Tuple[List[Any], List[Any]]:
+    """Worker: rebuild the subtrees of one task, apply ``func`` to each node in
+    pre-order and return the resulting values and metadata."""
+    nodes = []
+    for index, value in enumerate(values):
+        node = TreeNode(value=value, metadata=metadata.get(index, {}))
+        parent = parents[index]
+        if parent >= 0:
+            node.parent = nodes[parent]
+            nodes[parent].children.append(node)
+        nodes.append(node)
+    for node in nodes:
+        func(node)
+    return [node.value for node in nodes], [node.metadata for node in nodes]
+
+
+class ParallelExecutor:
+    """Runs per-node map, reduce and apply over a tree in worker processes.
+
+    Results are identical to :meth:`Tree.map` and :meth:`Tree.apply`, and
+    to :meth:`Tree.reduce` for associative reducers. The process pool is
+    created on first use and reused until :meth:`close`.
+
+    Attributes:
+        workers (int): Number of worker processes
+        chunk_size (Optional[int]): Maximum number of nodes per task
+            (None: sized from the tree and the number of workers)
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        """Initialize an executor.
+
+        Args:
+            workers (Optional[int]): Number of worker processes (default: CPU count)
+            chunk_size (Optional[int]): Maximum number of nodes per task
+
+        Raises:
+            ValueError: If ``workers`` or ``chunk_size`` is smaller than 1
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> ParallelExecutor:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _chunk_size(self, count: int) -> int:
+        """Get the task size to use for a tree of ``count`` nodes."""
+        if self.chunk_size is not None:
+            return self.chunk_size
+        tasks = self.workers * _TASKS_PER_WORKER
+        return max(_MIN_CHUNK_SIZE, -(-count // tasks))
+
+    def _plan(self, tree: Tree, node: Optional[TreeNode],
+              include_metadata: bool) -> Tuple[FlatTree, List[Tuple[int, int]]]:
+        """Flatten the subtree and cut it into task ranges."""
+        flat = FlatTree.from_tree(node or tree.root, include_metadata)
+        count = len(flat)
+        return flat, _work_ranges(flat.size, count, self._chunk_size(count))
+
+    def _run(self, task: Callable[..., Any], arguments: List[Tuple[Any, ...]]) -> List[Any]:
+        """Run a task function on each argument tuple, in order."""
+        if self.workers == 1 or len(arguments) <= 1:
+            return [task(*args) for args in arguments]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [self._pool.submit(task, *args) for args in arguments]
+        return [future.result() for future in futures]
+
+    def map(self, tree: Tree, func: Callable[[Any], Any],
+            node: Optional[TreeNode] = None) -> Tree:
+        """Apply a function to all values in parallel and return a new tree.
+
+        Args:
+            tree (Tree): The source tree
+            func (Callable): Picklable function applied to each node's value
+            node (Optional[TreeNode]): Node to start from (default: root)
+
+        Returns:
+            Tree: A new tree with transformed values, as :meth:`Tree.map`
+        """
+        flat, ranges = self._plan(tree, node, True)
+        values = flat.values
+        mapped: List[Any] = []
+        for chunk in self._run(_map_task, [(func, values[start:end])
+                                            for start, end in ranges]):
+            mapped.extend(chunk)
+        flat.values = mapped
+        result = flat.to_tree(type(node or tree.root))
+        if tree._value_index is not None:
+            result.enable_value_index()
+        return result
+
+    def reduce(self, tree: Tree, func: Callable[[Any, Any], Any],
+               node: Optional[TreeNode] = None, initial: Any = None) -> Any:
+        """Reduce the values in parallel.
+
+        Each task folds its contiguous pre-order slice of values, and the
+        partial results are folded in order, so the result equals
+        :meth:`Tree.reduce` whenever ``func`` is associative.
+
+        Args:
+            tree (Tree): The source tree
+            func (Callable): Picklable, associative reduction function
+            node (Optional[TreeNode]): Node to start from (default: root)
+            initial (Any): Initial accumulator value
+
+        Returns:
+            Any: The reduced value
+        """
+        flat, ranges = self._plan(tree, node, False)
+        values = flat.values
+        partials = self._run(_reduce_task, [(func, values[start:end])
+                                            for start, end in ranges])
+        return _fold(func, partials, initial)
+
+    def apply(self, tree: Tree, func: Callable[[TreeNode], None],
+              node: Optional[TreeNode] = None) -> None:
+        """Apply a function to all nodes in parallel.
+
+        ``func`` runs on copies of the nodes rebuilt in the worker: it sees
+        the node's value, metadata and the descendants shipped in the same
+        task, but not the parent of a task's top nodes. Changes it makes to
+        ``value`` and ``metadata`` are written back to the tree (through
+        ``set_value``/``set_metadata``, so indexes stay current); values and
+        metadata entries that come back equal, and of the same type, are
+        left untouched, so no-op updates keep the original objects and fire
+        no events. Structural changes are discarded.
+
+        Args:
+            tree (Tree): The tree to update
+            func (Callable): Picklable function applied to each node
+            node (Optional[TreeNode]): Node to start from (default: root)
+        """
+        start_node = node or tree.root
+        flat, ranges = self._plan(tree, start_node, True)
+        parent = flat.parent
+        metadata = flat.metadata
+        typecode = _index_typecode(len(flat))
+        arguments = []
+        for start, end in ranges:
+            parents = array(typecode, [p - start if p >= start else -1
+                                       for p in parent[start:end]])
+            task_metadata = {index - start: metadata[index]
+                             for index in range(start, end) if index in metadata}
+            arguments.append((func, flat.values[start:end], parents, task_metadata))
+        nodes = tree._pre_order(start_node)
+        for values, new_metadata in self._run(_apply_task, arguments):
+            for value, data in zip(values, new_metadata):
+                target = next(nodes)
+                # Results come back unpickled, hence always new objects.
+                if not _same_value(value, target.value):
+                    target.set_value(value)
+                if not _same_items(data, target.metadata):
+                    _write_metadata(target, data)
+
+
+def _write_metadata(node: TreeNode, data: Dict[str, Any]) -> None:
+    """Make a node's metadata equal ``data``, setting only the keys that differ."""
+    current = node.metadata
+    for key in [key for key in current if key not in data]:
+        node.remove_metadata(key)
+    for key, value in data.items():
+        old_value = current.get(key, _MISSING)
+        if old_value is _MISSING or not _same_value(old_value, value):
+            node.set_metadata(key, value)
@@ -0,0 +1,281 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Paths - Resolving value paths to nodes, with an LRU cache of prefixes.
+
+A value path names a node by the values on the way from the root, e.g.
+``"root/eu/fr/paris"`` (the convention of :meth:`Tree.from_paths`): each
+component matches the first child holding that value, as
+``get_child_by_value`` does. Paths may also be given as sequences of
+values, for values that are not strings.
+
+:class:`PathCache` remembers resolved paths and every prefix met on the
+way in a bounded LRU table. A cached path resolves with one dictionary
+lookup; an uncached one starts from its longest cached prefix and walks
+down the remaining components, O(depth) child lookups (each O(1) on nodes
+with a child index, see ``TreeNode.enable_child_index``).
+
+Registered on the tree (see ``Tree.enable_path_cache``), it drops only the
+entries an edit can affect: the paths under an attached or detached
+subtree, under the old and new value of a renamed node, or under a node
+whose children were reordered. The entries are also kept in a trie of
+components, so this costs the number of dropped entries, not the size of
+the cache.
+
+Resolving updates the LRU order, so the cache holds its own lock: threads
+sharing a tree's read lock (``ConcurrentTree.read``) may resolve at once.
+
+Example:
+    >>> tree = Tree.from_paths(["root/eu/fr/paris", "root/eu/de/berlin"])
+    >>> cache = tree.enable_path_cache(maxsize=10_000)
+    >>> paris = tree.resolve("root/eu/fr/paris")    # walks down, caching prefixes
+    >>> tree.resolve("root/eu/fr/paris") is paris   # one lookup
+    True
+    >>> tree.path_of(paris)
+    'root/eu/fr/paris'
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .generic_tree import Tree, TreeNode, _TreeListener
+except ImportError:
+    from generic_tree import Tree, TreeNode, _TreeListener
+
+PathLike = Union[str, Sequence[Any]]
+
+
+def split_path(path: PathLike, sep: str = "/") -> Tuple[Any, ...]:
+    """Split a path into its components, ignoring empty string components.
+
+    Args:
+        path (Union[str, Sequence]): Delimited string or sequence of values
+        sep (str): Separator between components of a string path
+
+    Returns:
+        Tuple[Any, ...]: The components, the root value first
+    """
+    if isinstance(path, str):
+        return tuple(part for part in path.split(sep) if part)
+    return tuple(path)
+
+
+def walk_path(root: TreeNode, parts: Sequence[Any], start: int = 1) -> Optional[TreeNode]:
+    """Follow ``parts[start:]`` down from ``root`` without any cache.
+
+    Args:
+        root (TreeNode): Node matching ``parts[start - 1]``
+        parts (Sequence[Any]): Path components
+        start (int): Index of the first component to follow
+
+    Returns:
+        Optional[TreeNode]: The node reached, or None if a component is missing
+    """
+    node = root
+    for index in range(start, len(parts)):
+        node = node.get_child_by_value(parts[index])
+        if node is None:
+            return None
+    return node
+
+
+def value_path(node: TreeNode) -> Tuple[Any, ...]:
+    """Get the values from the root down to a node."""
+    values = []
+    while node is not None:
+        values.append(node.value)
+        node = node.parent
+    values.reverse()
+    return tuple(values)
+
+
+class PathCache(_TreeListener):
+    """Bounded LRU cache from value paths to the nodes they resolve to.
+
+    Attributes:
+        tree (Tree): The tree whose paths are cached
+        maxsize (int): Maximum number of cached paths
+        hits (int): Resolutions answered by a cached full path
+        misses (int): Resolutions that walked at least one component
+    """
+
+    def __init__(self, tree: Tree, maxsize: int = 4096):
+        """Initialize an empty cache for a tree.
+
+        Args:
+            tree (Tree): The tree to resolve paths in
+            maxsize (int): Maximum number of cached paths
+
+        Raises:
+            ValueError: If ``maxsize`` is smaller than 1
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.tree = tree
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        # Lookups reorder and evict entries, even under a shared read lock.
+        self._lock = threading.RLock()
+        # Nested dicts of components mirroring the cached keys.
+        self._trie: Dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        """Get the number of cached paths."""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the lookup counters and cache size.
+
+        Returns:
+            Dict[str, int]: ``hits``, ``misses`` and ``entries``
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop every cached path (e.g. after direct ``node.value`` edits)."""
+        with self._lock:
+            self._entries.clear()
+            self._trie.clear()
+
+    def resolve(self, path: PathLike, sep: str = "/") -> Optional[TreeNode]:
+        """Get the node a path leads to.
+
+        Args:
+            path (Union[str, Sequence]): Delimited string or sequence of values
+            sep (str): Separator between components of a string path
+
+        Returns:
+            Optional[TreeNode]: The node, or None if the path does not exist
+        """
+        parts = split_path(path, sep)
+        with self._lock:
+            return self._resolve(parts)
+
+    def _resolve(self, parts: Tuple[Any, ...]) -> Optional[TreeNode]:
+        entries = self._entries
+        try:
+            node = entries.get(parts)
+        except TypeError:
+            # Unhashable components cannot be cached.
+            self.misses += 1
+            return self._walk_uncached(parts)
+        if node is not None:
+            entries.move_to_end(parts)
+            self.hits += 1
+            return node
+        self.misses += 1
+        if not parts:
+            return None
+        # Start from the longest cached prefix, else from the root.
+        depth = len(parts) - 1
+        while depth > 0:
+            node = entries.get(parts[:depth])
+            if node is not None:
+                break
+            depth -= 1
+        if node is None:
+            root = self.tree.root
+            if root.value != parts[0]:
+                return None
+            node = root
+            depth = 1
+            self._store(parts[:1], node)
+        for index in range(depth, len(parts)):
+            node = node.get_child_by_value(parts[index])
+            if node is None:
+                return None
+            self._store(parts[:index + 1], node)
+        return node
+
+    def _walk_uncached(self, parts: Tuple[Any, ...]) -> Optional[TreeNode]:
+        root = self.tree.root
+        if not parts or root.value != parts[0]:
+            return None
+        return walk_path(root, parts)
+
+    def _store(self, key: Tuple[Any, ...], node: TreeNode) -> None:
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            return
+        entries[key] = node
+        level = self._trie
+        for part in key:
+            level = level.setdefault(part, {})
+        if len(entries) > self.maxsize:
+            oldest, _ = entries.popitem(last=False)
+            self._prune(oldest)
+
+    def _prune(self, key: Tuple[Any, ...]) -> None:
+        """Remove the trie branch of an evicted key as far as it is unused."""
+        levels = [self._trie]
+        for part in key:
+            level = levels[-1].get(part)
+            if level is None:
+                return
+            levels.append(level)
+        entries = self._entries
+        for depth in range(len(key), 0, -1):
+            if levels[depth] or key[:depth] in entries:
+                return
+            del levels[depth - 1][key[depth - 1]]
+
+    def _drop_prefix(self, prefix: Tuple[Any, ...]) -> None:
+        """Drop every cached path starting with ``prefix``."""
+        level = self._trie
+        parent = None
+        for part in prefix:
+            parent = level
+            try:
+                level = level.get(part)
+            except TypeError:
+                return
+            if level is None:
+                return
+        entries = self._entries
+        stack: List[Tuple[Tuple[Any, ...], Dict[Any, Any]]] = [(prefix, level)]
+        while stack:
+            key, branch = stack.pop()
+            entries.pop(key, None)
+            stack.extend((key + (part,), below) for part, below in branch.items())
+        if parent is None:
+            self._trie = {}
+        else:
+            del parent[prefix[-1]]
+            self._prune(prefix[:-1])
+
+    def attached(self, node: TreeNode) -> None:
+        # The new child may now be the first one holding its value.
+        with self._lock:
+            self._drop_prefix(value_path(node))
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        with self._lock:
+            self._drop_prefix(value_path(parent) + (node.value,))
+
+    def value_changed(self, node: TreeNode, old_value: Any) -> None:
+        parent = () if node.parent is None else value_path(node.parent)
+        with self._lock:
+            self._drop_prefix(parent + (old_value,))
+            self._drop_prefix(parent + (node.value,))
+
+    def reordered(self, node: TreeNode) -> None:
+        path = value_path(node)
+        with self._lock:
+            level = self._trie
+            for part in path:
+                try:
+                    level = level.get(part)
+                except TypeError:
+                    return
+                if level is None:
+                    return
+            for part in list(level):
+                self._drop_prefix(path + (part,))
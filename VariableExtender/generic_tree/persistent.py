@@ -0,0 +1,553 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Persistent Tree - Immutable tree versions with structural sharing.
+
+A :class:`PersistentTree` never changes once built. Every edit returns a
+new version that copies only the nodes on the path from the root to the
+edited node (path copying) and shares every other subtree with the
+previous version. An edit therefore allocates ``depth + 1`` nodes, and a
+snapshot is simply a reference to the current version: keeping many
+versions around costs only the nodes they do not share, and rolling back
+means going back to an older reference.
+
+Nodes have no parent pointers (a shared subtree may hang below several
+versions), so nodes are addressed by their *path*: the tuple of child
+indexes leading from the root to the node, ``()`` being the root.
+
+Example:
+    >>> v1 = Tree(root_value="root").to_persistent()
+    >>> v2 = v1.add_child((), "a")
+    >>> v3 = v2.set_value((0,), "b")
+    >>> v1.get_node_count(), v2.node((0,)).value, v3.node((0,)).value
+    (1, 'a', 'b')
+    >>> v4 = v3.add_child((), "c")
+    >>> v4.root.children[0] is v3.root.children[0]
+    True
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+try:
+    from .generic_tree import Tree, TreeNode, TraversalMode
+except ImportError:
+    from generic_tree import Tree, TreeNode, TraversalMode
+
+Path = Tuple[int, ...]
+
+_NO_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+class PersistentNode:
+    """Immutable tree node whose subtrees may be shared between versions.
+
+    Attributes:
+        value (Any): The value stored in this node
+        children (Tuple[PersistentNode, ...]): Child nodes
+        metadata (Mapping[str, Any]): Read-only metadata key-value pairs
+        size (int): Number of nodes in the subtree rooted at this node
+    """
+    __slots__ = ('value', 'children', '_metadata', 'size')
+
+    def __init__(self, value: Any = None, children: Sequence[PersistentNode] = (),
+                 metadata: Optional[Mapping[str, Any]] = None):
+        """Initialize a node.
+
+        Args:
+            value (Any): The value stored in this node
+            children (Sequence[PersistentNode]): Child nodes (shared, not copied)
+            metadata (Optional[Mapping[str, Any]]): Metadata (copied)
+        """
+        children = tuple(children)
+        setter = object.__setattr__
+        setter(self, 'value', value)
+        setter(self, 'children', children)
+        setter(self, '_metadata', dict(metadata) if metadata else None)
+        setter(self, 'size', 1 + sum(child.size for child in children))
+
+    @classmethod
+    def _make(cls, value: Any, children: Tuple[PersistentNode, ...],
+              metadata: Optional[Dict[str, Any]], size: int) -> PersistentNode:
+        """Build a node from trusted parts without copying or recounting."""
+        node = object.__new__(cls)
+        setter = object.__setattr__
+        setter(node, 'value', value)
+        setter(node, 'children', children)
+        setter(node, '_metadata', metadata)
+        setter(node, 'size', size)
+        return node
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def metadata(self) -> Mapping[str, Any]:
+        """Read-only view of the metadata key-value pairs."""
+        metadata = self._metadata
+        return _NO_METADATA if metadata is None else MappingProxyType(metadata)
+
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """Get a metadata value by key.
+
+        Args:
+            key (str): The metadata key
+            default (Any): Default value if key doesn't exist
+
+        Returns:
+            Any: The metadata value or default
+        """
+        metadata = self._metadata
+        return default if metadata is None else metadata.get(key, default)
+
+    def has_metadata(self, key: str) -> bool:
+        """Check if a metadata key exists.
+
+        Args:
+            key (str): The metadata key
+
+        Returns:
+            bool: True if key exists, False otherwise
+        """
+        return self._metadata is not None and key in self._metadata
+
+    def is_leaf(self) -> bool:
+        """Check if this node has no children.
+
+        Returns:
+            bool: True if node has no children, False otherwise
+        """
+        return not self.children
+
+    def child_count(self) -> int:
+        """Get the number of direct children.
+
+        Returns:
+            int: Number of children
+        """
+        return len(self.children)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare values, metadata and structure; shared subtrees are skipped."""
+        if not isinstance(other, PersistentNode):
+            return NotImplemented
+        stack = [(self, other)]
+        while stack:
+            left, right = stack.pop()
+            if left is right:
+                continue
+            if (left.size != right.size or len(left.children) != len(right.children)
+                    or left.value != right.value
+                    or (left._metadata or {}) != (right._metadata or {})):
+                return False
+            stack.extend(zip(left.children, right.children))
+        return True
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"PersistentNode(value={self.value!r}, children={len(self.children)}, "
+                f"size={self.size})")
+
+
+class PersistentTree:
+    """An immutable version of a tree; edits return new versions.
+
+    Every editing method takes the path of the node to edit and returns a
+    new :class:`PersistentTree`. The edit copies the ``depth + 1`` nodes on
+    that path (and the child tuples along it) and shares all other subtrees
+    with ``self``, which stays valid and unchanged.
+
+    Attributes:
+        root (PersistentNode): The root node of this version
+    """
+    __slots__ = ('root',)
+
+    def __init__(self, root_value: Any = None, root: Optional[PersistentNode] = None):
+        """Initialize a version.
+
+        Args:
+            root_value (Any): The value for a new single-node tree
+            root (Optional[PersistentNode]): Existing root to wrap (overrides
+                ``root_value``)
+        """
+        object.__setattr__(self, 'root', root if root is not None else PersistentNode(root_value))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PersistentTree is immutable")
+
+    @classmethod
+    def from_tree(cls, source: Union[Tree, TreeNode], include_metadata: bool = True,
+                  share_identical: bool = False) -> PersistentTree:
+        """Build a persistent version of a tree or of the subtree below a node.
+
+        With ``share_identical``, subtrees with the same content digest (see
+        :mod:`hashing`) are built once and shared (hash-consing), which
+        shrinks highly repetitive trees.
+
+        Args:
+            source (Union[Tree, TreeNode]): Tree, or node whose subtree is converted
+            include_metadata (bool): Whether to copy node metadata
+            share_identical (bool): Store identical subtrees once
+
+        Returns:
+            PersistentTree: The persistent copy
+        """
+        root = source.root if isinstance(source, Tree) else source
+        make = PersistentNode._make
+        if share_identical:
+            try:
+                from .hashing import node_digest
+            except ImportError:
+                from hashing import node_digest
+            interned: Dict[bytes, PersistentNode] = {}
+            digests: Dict[int, bytes] = {}
+        # Post-order with an explicit stack; finished children wait on ``built``.
+        built: List[PersistentNode] = []
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            children = node.children
+            if not expanded and children:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+                continue
+            if children:
+                count = len(children)
+                kids = tuple(built[-count:])
+                del built[-count:]
+            else:
+                kids = ()
+            metadata = dict(node.metadata) if include_metadata and node.metadata else None
+            if share_identical:
+                digest = node_digest(node.value, metadata,
+                                     [digests[id(child)] for child in kids])
+                shared = interned.get(digest)
+                if shared is None:
+                    shared = interned[digest] = make(node.value, kids, metadata,
+                                                     1 + sum(child.size for child in kids))
+                    digests[id(shared)] = digest
+                built.append(shared)
+                continue
+            built.append(make(node.value, kids, metadata,
+                              1 + sum(child.size for child in kids)))
+        return cls(root=built[0])
+
+    def to_tree(self, node_class: type = TreeNode) -> Tree:
+        """Materialize this version as a mutable :class:`Tree`.
+
+        Shared subtrees are copied, so the result can be edited freely.
+
+        Args:
+            node_class (type): Node type to build the tree from
+
+        Returns:
+            Tree: A new tree with the same structure, values and metadata
+        """
+        root = self.root
+        tree = Tree(root_value=root.value, node_class=node_class)
+        if root._metadata:
+            tree.root.metadata = dict(root._metadata)
+        stack = [(root, tree.root)]
+        while stack:
+            source, target = stack.pop()
+            for child in source.children:
+                copied = target.add_child(child.value)
+                if child._metadata:
+                    copied.metadata = dict(child._metadata)
+                if child.children:
+                    stack.append((child, copied))
+        tree._node_count = root.size
+        return tree
+
+    def __len__(self) -> int:
+        return self.root.size
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PersistentTree):
+            return NotImplemented
+        return self.root == other.root
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PersistentTree(root={self.root.value!r}, nodes={self.root.size})"
+
+    def get_node_count(self) -> int:
+        """Get the total number of nodes (O(1)).
+
+        Returns:
+            int: Total node count
+        """
+        return self.root.size
+
+    def node(self, path: Sequence[int] = ()) -> PersistentNode:
+        """Get the node at a path.
+
+        Args:
+            path (Sequence[int]): Child indexes from the root (``()`` is the root)
+
+        Returns:
+            PersistentNode: The node at the path
+
+        Raises:
+            IndexError: If no node exists at the path
+        """
+        node = self.root
+        for index in path:
+            children = node.children
+            if not -len(children) <= index < len(children):
+                raise IndexError(f"no node at path {tuple(path)!r}")
+            node = children[index]
+        return node
+
+    def _replace(self, path: Sequence[int],
+                 edit: Callable[[PersistentNode], Optional[PersistentNode]]) -> PersistentTree:
+        """Return a version where the node at ``path`` is replaced by ``edit(node)``.
+
+        ``edit`` may return None to drop the node. Only the ancestors of the
+        node are copied; their sizes are adjusted by the size difference.
+        """
+        trail: List[Tuple[PersistentNode, int]] = []
+        node = self.root
+        for index in path:
+            children = node.children
+            if not -len(children) <= index < len(children):
+                raise IndexError(f"no node at path {tuple(path)!r}")
+            trail.append((node, index % len(children)))
+            node = children[index]
+        replacement = edit(node)
+        if replacement is node:
+            return self
+        if replacement is None and not trail:
+            raise ValueError("cannot remove the root of a tree")
+        delta = (replacement.size if replacement is not None else 0) - node.size
+        make = PersistentNode._make
+        for parent, index in reversed(trail):
+            children = parent.children
+            if replacement is None:
+                children = children[:index] + children[index + 1:]
+            else:
+                children = children[:index] + (replacement,) + children[index + 1:]
+            replacement = make(parent.value, children, parent._metadata, parent.size + delta)
+        return PersistentTree(root=replacement)
+
+    def set_value(self, path: Sequence[int], value: Any) -> PersistentTree:
+        """Return a version where the node at ``path`` holds ``value``.
+
+        Args:
+            path (Sequence[int]): Path of the node
+            value (Any): The new value
+
+        Returns:
+            PersistentTree: The new version
+        """
+        return self._replace(path, lambda node: PersistentNode._make(
+            value, node.children, node._metadata, node.size))
+
+    def set_metadata(self, path: Sequence[int], key: str, value: Any) -> PersistentTree:
+        """Return a version where metadata ``key`` of the node at ``path`` is ``value``.
+
+        Args:
+            path (Sequence[int]): Path of the node
+            key (str): The metadata key
+            value (Any): The metadata value
+
+        Returns:
+            PersistentTree: The new version
+        """
+        def edit(node: PersistentNode) -> PersistentNode:
+            metadata = dict(node._metadata) if node._metadata else {}
+            metadata[key] = value
+            return PersistentNode._make(node.value, node.children, metadata, node.size)
+        return self._replace(path, edit)
+
+    def remove_metadata(self, path: Sequence[int], key: str) -> PersistentTree:
+        """Return a version without metadata ``key`` on the node at ``path``.
+
+        Args:
+            path (Sequence[int]): Path of the node
+            key (str): The metadata key
+
+        Returns:
+            PersistentTree: The new version (``self`` if the key was absent)
+        """
+        def edit(node: PersistentNode) -> PersistentNode:
+            if not node.has_metadata(key):
+                return node
+            metadata = dict(node._metadata)
+            del metadata[key]
+            return PersistentNode._make(node.value, node.children, metadata or None, node.size)
+        return self._replace(path, edit)
+
+    def add_child(self, path: Sequence[int], value: Any,
+                  metadata: Optional[Mapping[str, Any]] = None) -> PersistentTree:
+        """Return a version with a new last child below the node at ``path``.
+
+        Args:
+            path (Sequence[int]): Path of the parent node
+            value (Any): The value for the new child
+            metadata (Optional[Mapping[str, Any]]): Metadata for the new child
+
+        Returns:
+            PersistentTree: The new version
+        """
+        return self.add_node(path, PersistentNode(value, metadata=metadata))
+
+    def add_node(self, path: Sequence[int], node: Union[PersistentNode, PersistentTree],
+                 index: Optional[int] = None) -> PersistentTree:
+        """Return a version with a subtree attached below the node at ``path``.
+
+        The subtree is shared, not copied; grafting the root of another
+        version (or of ``self``) is O(depth) as well.
+
+        Args:
+            path (Sequence[int]): Path of the parent node
+            node (Union[PersistentNode, PersistentTree]): Subtree to attach
+            index (Optional[int]): Position among the children (default: last)
+
+        Returns:
+            PersistentTree: The new version
+        """
+        subtree = node.root if isinstance(node, PersistentTree) else node
+
+        def edit(parent: PersistentNode) -> PersistentNode:
+            children = parent.children
+            position = len(children) if index is None else index
+            children = children[:position] + (subtree,) + children[position:]
+            return PersistentNode._make(parent.value, children, parent._metadata,
+                                        parent.size + subtree.size)
+        return self._replace(path, edit)
+
+    def replace(self, path: Sequence[int],
+                node: Union[PersistentNode, PersistentTree]) -> PersistentTree:
+        """Return a version where the subtree at ``path`` is ``node``.
+
+        Args:
+            path (Sequence[int]): Path of the subtree to replace
+            node (Union[PersistentNode, PersistentTree]): The new subtree
+
+        Returns:
+            PersistentTree: The new version
+        """
+        subtree = node.root if isinstance(node, PersistentTree) else node
+        return self._replace(path, lambda _: subtree)
+
+    def remove(self, path: Sequence[int]) -> PersistentTree:
+        """Return a version without the subtree at ``path``.
+
+        Args:
+            path (Sequence[int]): Path of the subtree to remove (not the root)
+
+        Returns:
+            PersistentTree: The new version
+
+        Raises:
+            ValueError: If ``path`` designates the root
+        """
+        return self._replace(path, lambda _: None)
+
+    def traverse(self, mode: TraversalMode = TraversalMode.PRE_ORDER,
+                 path: Sequence[int] = ()) -> Iterator[PersistentNode]:
+        """Traverse the nodes in the specified mode.
+
+        Args:
+            mode (TraversalMode): The traversal mode to use
+            path (Sequence[int]): Path of the node to start from (default: root)
+
+        Yields:
+            PersistentNode: Nodes in traversal order
+        """
+        start = self.node(path)
+        if mode == TraversalMode.PRE_ORDER:
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                yield node
+                stack.extend(reversed(node.children))
+        elif mode == TraversalMode.POST_ORDER:
+            frames = [(start, iter(start.children))]
+            while frames:
+                node, children = frames[-1]
+                child = next(children, None)
+                if child is None:
+                    frames.pop()
+                    yield node
+                else:
+                    frames.append((child, iter(child.children)))
+        elif mode == TraversalMode.LEVEL_ORDER:
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                yield node
+                queue.extend(node.children)
+        elif mode == TraversalMode.IN_ORDER:
+            pending = [(start, False)]
+            while pending:
+                node, expanded = pending.pop()
+                children = node.children
+                if expanded or not children:
+                    yield node
+                    continue
+                mid = len(children) // 2
+                pending.extend((child, False) for child in reversed(children[mid:]))
+                pending.append((node, True))
+                pending.extend((child, False) for child in reversed(children[:mid]))
+
+    def iter_paths(self, path: Sequence[int] = ()) -> Iterator[Tuple[Path, PersistentNode]]:
+        """Iterate over ``(path, node)`` pairs in pre-order.
+
+        Args:
+            path (Sequence[int]): Path of the node to start from (default: root)
+
+        Yields:
+            Tuple[Path, PersistentNode]: Each node with its path from the root
+        """
+        stack = [(tuple(path), self.node(path))]
+        while stack:
+            node_path, node = stack.pop()
+            yield node_path, node
+            children = node.children
+            for index in range(len(children) - 1, -1, -1):
+                stack.append((node_path + (index,), children[index]))
+
+    def find_path(self, value: Any) -> Optional[Path]:
+        """Find the path of the first node (in pre-order) holding a value.
+
+        Args:
+            value (Any): The value to search for
+
+        Returns:
+            Optional[Path]: Path of the node, or None if not found
+        """
+        for node_path, node in self.iter_paths():
+            if node.value == value:
+                return node_path
+        return None
+
+    def get_height(self, path: Sequence[int] = ()) -> int:
+        """Get the height of the tree (or of the subtree at ``path``).
+
+        Args:
+            path (Sequence[int]): Path of the subtree root (default: root)
+
+        Returns:
+            int: Height of the subtree
+        """
+        height = 0
+        stack = [(self.node(path), 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > height:
+                height = depth
+            if node.children:
+                depth += 1
+                stack.extend((child, depth) for child in node.children)
+        return height
@@ -0,0 +1,507 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Query - A small XPath-like query language compiled into one traversal.
+
+A query is a sequence of steps separated by ``/`` (child) or ``//``
+(descendant). It is evaluated from a virtual context above the start node,
+so ``/root`` selects the start node when its value is ``"root"`` and
+``//x`` selects the start node and all its descendants holding ``x``.
+
+Steps:
+    ``axis::test[predicate]...``  axis ``child``, ``descendant``, ``self``,
+        ``parent``, ``ancestor`` or ``sibling`` (default ``child``)
+    ``.`` and ``..``              shorthands for ``self::*`` and ``parent::*``
+
+Tests: ``*`` (any node), a name, a quoted string or a number, matching
+nodes whose value equals it.
+
+Predicates combine, with ``and``, ``or``, ``not`` and parentheses:
+    ``value`` (or ``.``), ``@key`` (metadata), ``depth`` (0 for the root of
+    the tree), ``children`` (child count), compared with ``=``, ``!=``,
+    ``<``, ``<=``, ``>``, ``>=``, ``^=`` (starts with), ``$=`` (ends with),
+    ``*=`` (contains) or ``~=`` (regular expression search) to a quoted
+    string, a number, ``true``, ``false`` or ``null``; alone, an operand
+    tests for truth (``@key`` for presence). ``leaf`` and ``root`` test the
+    node's position.
+
+The child and descendant steps of a query are compiled into a state
+machine run over a single pre-order traversal: each node carries the set
+of steps matched on its path, and subtrees where no step can match any
+more are skipped, in particular below the depth bounds that ``depth <= n``
+conditions put on the remaining steps. ``parent``, ``ancestor``,
+``sibling`` and ``self`` steps then move from each match locally. A query
+starting with one of them is relative to the start node itself.
+
+Compiled queries do not depend on a tree: :func:`compile_query` caches
+them by text and they can be run on any tree or subtree.
+
+Example:
+    >>> query = compile_query("//*[@type = 'region' and depth <= 3 and value ^= 'X']//*[leaf]")
+    >>> leaves = query.select(tree)
+    >>> tree.query("/root/eu/*[@population > 1000000]", limit=10)
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .generic_tree import Tree, TreeNode, _MISSING
+except ImportError:
+    from generic_tree import Tree, TreeNode, _MISSING
+
+AXES = ('child', 'descendant', 'self', 'parent', 'ancestor', 'sibling')
+_DOWNWARD = ('child', 'descendant')
+_UNBOUNDED = float('inf')
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?(?![\w.]))
+      | (?P<string>'[^']*'|"[^"]*")
+      | (?P<op>//|::|\.\.|!=|<=|>=|\^=|\$=|\*=|~=|[/\[\]()@=<>*.])
+      | (?P<name>[A-Za-z_][\w\-]*(?:\.[A-Za-z_][\w\-]*)*)
+    )""", re.VERBOSE)
+
+_COMPARE: Dict[str, Callable[[Any, Any], bool]] = {
+    '=': lambda left, right: left == right,
+    '!=': lambda left, right: left != right,
+    '<': lambda left, right: left < right,
+    '<=': lambda left, right: left <= right,
+    '>': lambda left, right: left > right,
+    '>=': lambda left, right: left >= right,
+    '^=': lambda left, right: isinstance(left, str) and left.startswith(right),
+    '$=': lambda left, right: isinstance(left, str) and left.endswith(right),
+    '*=': lambda left, right: isinstance(left, str) and right in left,
+    '~=': lambda left, right: isinstance(left, str) and right.search(left) is not None,
+}
+
+_CONSTANTS = {'true': True, 'false': False, 'null': None}
+
+
+def _tokenize(text: str) -> List[Tuple[str, str, int]]:
+    tokens = []
+    position = 0
+    end = len(text.rstrip())
+    while position < end:
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"unexpected character at {position} in query {text!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind), match.start(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Step:
+    """One compiled step: an axis, a node test and predicates."""
+    __slots__ = ('axis', 'test', 'predicates', 'max_depth')
+
+    def __init__(self, axis: str, test: Any, predicates: List[Callable[[TreeNode, int], bool]],
+                 max_depth: float):
+        self.axis = axis
+        self.test = test
+        self.predicates = predicates
+        self.max_depth = max_depth
+
+    def matches(self, node: TreeNode, depth: int) -> bool:
+        if self.test is not _MISSING and node.value != self.test:
+            return False
+        for predicate in self.predicates:
+            if not predicate(node, depth):
+                return False
+        return True
+
+
+class _Parser:
+    """Recursive-descent parser turning query text into steps."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def _peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.index + offset
+        if index < len(self.tokens):
+            kind, value, _ = self.tokens[index]
+            return kind, value
+        return None, None
+
+    def _error(self, message: str) -> ValueError:
+        if self.index < len(self.tokens):
+            where = f"at {self.tokens[self.index][2]}"
+        else:
+            where = "at the end"
+        return ValueError(f"{message} {where} in query {self.text!r}")
+
+    def _take(self, value: str) -> bool:
+        kind, token = self._peek()
+        if token == value and kind in ('op', 'name'):
+            self.index += 1
+            return True
+        return False
+
+    def _expect(self, value: str) -> None:
+        if not self._take(value):
+            raise self._error(f"expected {value!r}")
+
+    def parse(self) -> List[_Step]:
+        if not self.tokens:
+            raise self._error("empty query")
+        steps = []
+        axis = 'descendant' if self._take('//') else 'child'
+        if axis == 'child':
+            self._take('/')
+        while True:
+            steps.append(self._step(axis))
+            if self._take('//'):
+                axis = 'descendant'
+            elif self._take('/'):
+                axis = 'child'
+            elif self.index == len(self.tokens):
+                return steps
+            else:
+                raise self._error("expected '/' or '//'")
+
+    def _step(self, axis: str) -> _Step:
+        if axis == 'descendant' and self._peek()[1] in ('.', '..'):
+            raise self._error("'//' can only be followed by a child step")
+        if self._take('..'):
+            return self._finish_step('parent', _MISSING)
+        if self._take('.'):
+            return self._finish_step('self', _MISSING)
+        kind, value = self._peek()
+        if kind == 'name' and self._peek(1)[1] == '::':
+            if value not in AXES:
+                raise self._error(f"unknown axis {value!r}")
+            self.index += 2
+            if axis == 'descendant':
+                if value != 'child':
+                    raise self._error("'//' can only be followed by a child step")
+            else:
+                axis = value
+        return self._finish_step(axis, self._test())
+
+    def _test(self) -> Any:
+        if self._take('*'):
+            return _MISSING
+        kind, value = self._peek()
+        if kind in ('name', 'string', 'number'):
+            self.index += 1
+            return self._literal(kind, value)
+        raise self._error("expected a node test")
+
+    @staticmethod
+    def _literal(kind: str, value: str) -> Any:
+        if kind == 'string':
+            return value[1:-1]
+        if kind == 'number':
+            return float(value) if '.' in value else int(value)
+        return value
+
+    def _finish_step(self, axis: str, test: Any) -> _Step:
+        predicates = []
+        max_depth = _UNBOUNDED
+        while self._take('['):
+            tree = self._or()
+            self._expect(']')
+            predicates.append(_compile(tree))
+            max_depth = min(max_depth, _depth_bound(tree))
+        return _Step(axis, test, predicates, max_depth)
+
+    def _or(self) -> tuple:
+        parts = [self._and()]
+        while self._take('or'):
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else ('or', parts)
+
+    def _and(self) -> tuple:
+        parts = [self._not()]
+        while self._take('and'):
+            parts.append(self._not())
+        return parts[0] if len(parts) == 1 else ('and', parts)
+
+    def _not(self) -> tuple:
+        if self._take('not'):
+            return ('not', self._not())
+        if self._take('('):
+            inner = self._or()
+            self._expect(')')
+            return inner
+        operand = self._operand()
+        kind, op = self._peek()
+        if kind == 'op' and op in _COMPARE:
+            self.index += 1
+            right = self._constant()
+            if op == '~=':
+                if not isinstance(right, str):
+                    raise self._error("'~=' needs a string pattern")
+                right = re.compile(right)
+            return ('compare', operand, op, right)
+        return ('truth', operand)
+
+    def _operand(self) -> tuple:
+        if self._take('@'):
+            kind, value = self._peek()
+            if kind not in ('name', 'string'):
+                raise self._error("expected a metadata key")
+            self.index += 1
+            return ('metadata', self._literal(kind, value))
+        if self._take('.'):
+            return ('value',)
+        kind, value = self._peek()
+        if kind == 'name' and value in ('value', 'depth', 'children', 'leaf', 'root'):
+            self.index += 1
+            return (value,)
+        raise self._error("expected value, @key, depth, children, leaf or root")
+
+    def _constant(self) -> Any:
+        kind, value = self._peek()
+        if kind in ('string', 'number'):
+            self.index += 1
+            return self._literal(kind, value)
+        if kind == 'name' and value in _CONSTANTS:
+            self.index += 1
+            return _CONSTANTS[value]
+        raise self._error("expected a string, a number, true, false or null")
+
+
+def _operand_getter(operand: tuple) -> Callable[[TreeNode, int], Any]:
+    kind = operand[0]
+    if kind == 'value':
+        return lambda node, depth: node.value
+    if kind == 'metadata':
+        key = operand[1]
+        return lambda node, depth: node.metadata.get(key, _MISSING)
+    if kind == 'depth':
+        return lambda node, depth: depth
+    if kind == 'children':
+        return lambda node, depth: len(node.children)
+    if kind == 'leaf':
+        return lambda node, depth: not node.children
+    return lambda node, depth: node.parent is None
+
+
+def _compile(tree: tuple) -> Callable[[TreeNode, int], bool]:
+    """Turn a predicate syntax tree into a function of ``(node, depth)``."""
+    kind = tree[0]
+    if kind in ('and', 'or'):
+        parts = [_compile(part) for part in tree[1]]
+        if kind == 'and':
+            return lambda node, depth: all(part(node, depth) for part in parts)
+        return lambda node, depth: any(part(node, depth) for part in parts)
+    if kind == 'not':
+        inner = _compile(tree[1])
+        return lambda node, depth: not inner(node, depth)
+    get = _operand_getter(tree[1])
+    if kind == 'truth':
+        if tree[1][0] == 'metadata':
+            key = tree[1][1]
+            return lambda node, depth: key in node.metadata
+        return lambda node, depth: bool(get(node, depth))
+
+    compare = _COMPARE[tree[2]]
+    right = tree[3]
+
+    def test(node: TreeNode, depth: int) -> bool:
+        left = get(node, depth)
+        if left is _MISSING:
+            return False
+        try:
+            return bool(compare(left, right))
+        except TypeError:
+            return False
+    return test
+
+
+def _depth_bound(tree: tuple) -> float:
+    """Get the largest depth a predicate allows, from its ``depth <=/</=`` conjuncts."""
+    kind = tree[0]
+    if kind == 'and':
+        return min(_depth_bound(part) for part in tree[1])
+    if kind == 'or':
+        return max(_depth_bound(part) for part in tree[1])
+    if kind == 'compare' and tree[1] == ('depth',) and isinstance(tree[3], (int, float)) \
+            and not isinstance(tree[3], bool):
+        op, limit = tree[2], tree[3]
+        if op in ('<=', '='):
+            return limit
+        if op == '<':
+            return limit - 1 if isinstance(limit, int) else limit
+    return _UNBOUNDED
+
+
+class Query:
+    """A compiled query, reusable on any tree.
+
+    Attributes:
+        text (str): The query text
+    """
+
+    def __init__(self, text: str):
+        """Compile a query.
+
+        Args:
+            text (str): The query text
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        self.text = text
+        steps = _Parser(text).parse()
+        split = 0
+        while split < len(steps) and steps[split].axis in _DOWNWARD:
+            split += 1
+        self._downward = steps[:split]
+        self._local = steps[split:]
+        # _reach[j]: deepest depth at which step j can match and still lead to a result.
+        reach = [_UNBOUNDED] * (split + 1)
+        for index in range(split - 1, -1, -1):
+            reach[index] = min(steps[index].max_depth, reach[index + 1] - 1)
+        self._reach = reach
+
+    def __repr__(self) -> str:
+        return f"Query({self.text!r})"
+
+    def iterate(self, source: Union[Tree, TreeNode]) -> Iterator[TreeNode]:
+        """Yield the matching nodes lazily.
+
+        Child and descendant queries yield in pre-order; other steps yield
+        each node once, in the order reached.
+
+        Args:
+            source (Union[Tree, TreeNode]): Tree, or node to start from
+
+        Yields:
+            TreeNode: Matching nodes
+        """
+        start = source.root if isinstance(source, Tree) else source
+        if self._downward:
+            found = self._scan(start)
+        else:
+            found = iter((start,))
+        for step in self._local:
+            found = self._move(found, step)
+        return found
+
+    def select(self, source: Union[Tree, TreeNode], limit: Optional[int] = None) -> List[TreeNode]:
+        """Get the matching nodes.
+
+        Args:
+            source (Union[Tree, TreeNode]): Tree, or node to start from
+            limit (Optional[int]): Stop after this many matches
+
+        Returns:
+            List[TreeNode]: Matching nodes
+        """
+        found = []
+        if limit is not None and limit <= 0:
+            return found
+        for node in self.iterate(source):
+            found.append(node)
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+    def first(self, source: Union[Tree, TreeNode]) -> Optional[TreeNode]:
+        """Get the first matching node, stopping the traversal there.
+
+        Args:
+            source (Union[Tree, TreeNode]): Tree, or node to start from
+
+        Returns:
+            Optional[TreeNode]: The first match, or None
+        """
+        return next(self.iterate(source), None)
+
+    def _scan(self, start: TreeNode) -> Iterator[TreeNode]:
+        """Run the child/descendant steps as a state machine over one pre-order walk."""
+        steps = self._downward
+        reach = self._reach
+        last = len(steps)
+        # State j means "steps 1..j matched"; the virtual context has state 0.
+        if steps[0].axis == 'child':
+            initial = ((0,), ())
+        else:
+            initial = ((), (0,))
+        stack = [(start, start.get_depth(), initial[0], initial[1])]
+        while stack:
+            node, depth, waiting_child, waiting_below = stack.pop()
+            matched = set()
+            for state in waiting_child:
+                if steps[state].matches(node, depth):
+                    matched.add(state + 1)
+            for state in waiting_below:
+                if state + 1 not in matched and steps[state].matches(node, depth):
+                    matched.add(state + 1)
+            if last in matched:
+                yield node
+            if not node.children:
+                continue
+            below = depth + 1
+            next_child = []
+            next_below = [state for state in waiting_below if reach[state] >= below]
+            for state in matched:
+                if state < last and reach[state] >= below:
+                    if steps[state].axis == 'child':
+                        next_child.append(state)
+                    elif state not in next_below:
+                        next_below.append(state)
+            if not next_child and not next_below:
+                continue
+            next_child = tuple(next_child)
+            next_below = tuple(next_below)
+            for child in reversed(node.children):
+                stack.append((child, below, next_child, next_below))
+
+    @staticmethod
+    def _move(nodes: Iterator[TreeNode], step: _Step) -> Iterator[TreeNode]:
+        """Apply one step to each node, yielding every reached node once."""
+        seen = set()
+        axis = step.axis
+        for node in nodes:
+            if axis == 'self':
+                reached = [node]
+            elif axis == 'parent':
+                reached = [node.parent] if node.parent is not None else []
+            elif axis == 'ancestor':
+                reached = node.get_path_to_root()[:-1]
+                reached.reverse()
+            elif axis == 'sibling':
+                reached = [] if node.parent is None else [
+                    sibling for sibling in node.parent.children if sibling is not node]
+            elif axis == 'child':
+                reached = node.children
+            else:
+                reached = []
+                stack = list(reversed(node.children))
+                while stack:
+                    item = stack.pop()
+                    reached.append(item)
+                    stack.extend(reversed(item.children))
+            for item in reached:
+                if id(item) in seen:
+                    continue
+                seen.add(id(item))
+                if step.matches(item, item.get_depth()):
+                    yield item
+
+
+@lru_cache(maxsize=256)
+def compile_query(text: str) -> Query:
+    """Compile a query, reusing the compiled form of recently used texts.
+
+    Args:
+        text (str): The query text
+
+    Returns:
+        Query: The compiled query
+
+    Raises:
+        ValueError: If the query is malformed
+    """
+    return Query(text)
@@ -0,0 +1,163 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Search - Best-first and beam search with pluggable scoring and pruning.
+
+Both searches look for the best *goal* nodes (leaves by default) according
+to a ``score_fn(node)``, where higher scores are better, and return them as
+``(node, score)`` pairs, best first. They only score the nodes they reach,
+so on a huge tree most of it is never visited.
+
+:func:`best_first` keeps its frontier in a heap:
+
+- With an admissible ``bound_fn(node)``, an upper bound on the score of
+  every goal in the subtree of a node, it is a branch-and-bound search:
+  nodes are expanded in order of bound, subtrees whose bound cannot beat
+  the current k-th best goal are pruned, and the search stops as soon as
+  no frontier node can. The result is then the exact top-k.
+- Without a bound, it expands the best-scored node first (greedy) and
+  stops at the first ``k`` goals reached.
+
+:func:`beam_search` explores level by level and keeps only the ``width``
+best-scored nodes of each level, returning the best goals met on the way.
+It is not exact, but its cost is bounded by ``width`` times the depth (and
+fan-out) of the tree.
+
+Example:
+    >>> best = best_first(tree, lambda node: node.get_metadata("payoff", 0), k=3,
+    ...                   bound_fn=lambda node: node.get_metadata("max_payoff", 0))
+    >>> [(node.value, score) for node, score in best]
+    >>> tree.beam_search(evaluate, width=8)
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import heapq
+from itertools import count
+from typing import Any, Callable, List, Optional, Tuple
+
+try:
+    from .generic_tree import Tree, TreeNode
+except ImportError:
+    from generic_tree import Tree, TreeNode
+
+Scored = Tuple[TreeNode, Any]
+
+
+def _is_leaf(node: TreeNode) -> bool:
+    return not node.children
+
+
+def best_first(tree: Tree, score_fn: Callable[[TreeNode], Any], k: int = 1,
+               bound_fn: Optional[Callable[[TreeNode], Any]] = None,
+               goal: Optional[Callable[[TreeNode], bool]] = None,
+               start: Optional[TreeNode] = None,
+               max_expansions: Optional[int] = None) -> List[Scored]:
+    """Find the best goal nodes, expanding the most promising node first.
+
+    Args:
+        tree (Tree): The tree to search
+        score_fn (Callable): Score of a node (higher is better, must be a number)
+        k (int): Number of goals to return
+        bound_fn (Optional[Callable]): Upper bound on the scores of the goals in
+            a node's subtree, enabling exact pruned search
+        goal (Optional[Callable]): Which nodes are results (default: leaves)
+        start (Optional[TreeNode]): Node to start from (default: root)
+        max_expansions (Optional[int]): Stop after expanding this many nodes
+
+    Returns:
+        List[Tuple[TreeNode, Any]]: Up to ``k`` ``(node, score)`` pairs, best first
+
+    Raises:
+        ValueError: If ``k`` is smaller than 1
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    is_goal = goal or _is_leaf
+    tie = count()
+    root = start or tree.root
+    # Max-heaps through negated priorities; the counter breaks ties in visit order.
+    priority = bound_fn if bound_fn is not None else score_fn
+    frontier = [(-priority(root), next(tie), root)]
+    best: List[Tuple[Any, int, TreeNode]] = []
+    expansions = 0
+    while frontier:
+        negated, _, node = heapq.heappop(frontier)
+        if bound_fn is not None and len(best) == k and -negated <= best[0][0]:
+            break
+        score = -negated if bound_fn is None else score_fn(node)
+        if is_goal(node):
+            entry = (score, next(tie), node)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif score > best[0][0]:
+                heapq.heapreplace(best, entry)
+            if bound_fn is None and len(best) == k:
+                break
+        if max_expansions is not None and expansions >= max_expansions:
+            break
+        expansions += 1
+        threshold = best[0][0] if bound_fn is not None and len(best) == k else None
+        for child in node.children:
+            value = priority(child)
+            if threshold is not None and value <= threshold:
+                continue
+            heapq.heappush(frontier, (-value, next(tie), child))
+    best.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [(node, score) for score, _, node in best]
+
+
+def beam_search(tree: Tree, score_fn: Callable[[TreeNode], Any], width: int = 8, k: int = 1,
+                goal: Optional[Callable[[TreeNode], bool]] = None,
+                bound_fn: Optional[Callable[[TreeNode], Any]] = None,
+                start: Optional[TreeNode] = None,
+                max_depth: Optional[int] = None) -> List[Scored]:
+    """Search level by level, keeping only the best ``width`` nodes of each level.
+
+    Args:
+        tree (Tree): The tree to search
+        score_fn (Callable): Score of a node (higher is better, must be a number)
+        width (int): Number of nodes kept per level
+        k (int): Number of goals to return
+        goal (Optional[Callable]): Which nodes are results (default: leaves)
+        bound_fn (Optional[Callable]): Upper bound on the scores of the goals in
+            a node's subtree; children that cannot beat the k-th best goal
+            found so far are dropped before scoring
+        start (Optional[TreeNode]): Node to start from (default: root)
+        max_depth (Optional[int]): Levels to descend below the start node
+
+    Returns:
+        List[Tuple[TreeNode, Any]]: Up to ``k`` ``(node, score)`` pairs, best first
+
+    Raises:
+        ValueError: If ``width`` or ``k`` is smaller than 1
+    """
+    if width < 1 or k < 1:
+        raise ValueError("width and k must be at least 1")
+    is_goal = goal or _is_leaf
+    tie = count()
+    root = start or tree.root
+    beam = [(score_fn(root), next(tie), root)]
+    best: List[Tuple[Any, int, TreeNode]] = []
+    depth = 0
+    while beam:
+        for entry in beam:
+            if is_goal(entry[2]):
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry[0] > best[0][0]:
+                    heapq.heapreplace(best, entry)
+        if max_depth is not None and depth >= max_depth:
+            break
+        depth += 1
+        threshold = best[0][0] if bound_fn is not None and len(best) == k else None
+        candidates = []
+        for _, _, node in beam:
+            for child in node.children:
+                if threshold is not None and bound_fn(child) <= threshold:
+                    continue
+                candidates.append((score_fn(child), next(tie), child))
+        beam = heapq.nlargest(width, candidates, key=lambda entry: (entry[0], -entry[1]))
+    best.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [(node, score) for score, _, node in best]
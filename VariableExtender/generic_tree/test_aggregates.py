@@ -0,0 +1,124 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the cached subtree aggregates.
+"""
+
+import operator
+
+import pytest
+from generic_tree import Tree, TreeNode
+
+
+def _sample_tree():
+    tree = Tree(root_value=1)
+    a = tree.add_child(tree.root, 2)
+    b = tree.add_child(tree.root, 3)
+    a1 = tree.add_child(a, 4)
+    tree.add_child(a1, 5)
+    tree.add_child(b, 6)
+    return tree
+
+
+class TestSubtreeAggregates:
+    def test_builtin_statistics(self):
+        tree = _sample_tree()
+        aggregates = tree.enable_aggregates()
+        a = tree.root.children[0]
+        assert aggregates.size() == 6
+        assert aggregates.size(a) == 3
+        assert aggregates.height() == 3
+        assert aggregates.leaf_count() == 2
+        assert aggregates.is_balanced() is True
+        assert tree.get_height() == 3
+        assert tree.get_subtree_height(a) == 2
+        assert tree.get_subtree_size(a) == 3
+        assert tree.get_leaf_count() == 2
+
+    def test_same_answers_without_cache(self):
+        cached = _sample_tree()
+        cached.enable_aggregates()
+        plain = _sample_tree()
+        for tree in (cached, plain):
+            tree.add_child(tree.root.children[0].children[0].children[0], 7)
+        assert cached.get_height() == plain.get_height() == 4
+        assert cached.is_balanced() == plain.is_balanced() is False
+        assert cached.get_leaf_count() == plain.get_leaf_count()
+
+    def test_values_are_cached(self):
+        tree = _sample_tree()
+        aggregates = tree.enable_aggregates()
+        aggregates.height()
+        assert len(aggregates._stats) == 6
+        assert aggregates._stats_of(tree.root) is aggregates._stats_of(tree.root)
+
+    def test_edit_invalidates_only_path(self):
+        tree = _sample_tree()
+        aggregates = tree.enable_aggregates()
+        aggregates.height()
+        b = tree.root.children[1]
+        tree.add_child(b, 7)
+        assert id(tree.root) not in aggregates._stats
+        assert id(b) not in aggregates._stats
+        assert id(tree.root.children[0]) in aggregates._stats
+        assert aggregates.size() == 7
+        assert aggregates.leaf_count(b) == 2
+
+    def test_remove_and_graft_keep_counts(self):
+        tree = _sample_tree()
+        tree.enable_aggregates()
+        a = tree.root.children[0]
+        assert tree.remove_child(tree.root, a) is True
+        assert tree.get_node_count() == 3
+        assert tree.get_height() == 2
+        assert tree.remove_child(tree.root, a) is False
+        graft = TreeNode(value=10)
+        graft.add_child(11).add_child(12).add_child(13)
+        tree.add_node(tree.root, graft)
+        assert tree.get_node_count() == 7
+        assert tree.get_height() == 4
+        assert tree.is_balanced() is False
+
+    def test_detached_node_edits_are_ignored(self):
+        tree = _sample_tree()
+        aggregates = tree.enable_aggregates()
+        a = tree.root.children[0]
+        tree.remove_child(tree.root, a)
+        a.add_child(99)
+        assert aggregates.size() == 3
+
+    def test_custom_aggregates(self):
+        tree = _sample_tree()
+        aggregates = tree.enable_aggregates()
+        aggregates.register("total", lambda node: node.value, operator.add)
+        aggregates.register("path", lambda node: str(node.value), operator.add)
+        assert aggregates.get("total") == 21
+        assert aggregates.get("path") == "124536"
+        a = tree.root.children[0]
+        assert aggregates.get("total", a) == 11
+        a.set_value(20)
+        assert aggregates.get("total") == 39
+        tree.reverse_children()
+        assert aggregates.get("path") == "1362045"
+        assert aggregates.unregister("path") is True
+        with pytest.raises(KeyError):
+            aggregates.get("path")
+
+    def test_is_balanced_deep_chain(self):
+        tree = Tree(root_value=0)
+        node = tree.root
+        for i in range(1, 5000):
+            node = tree.add_child(node, i)
+        assert tree.is_balanced() is True
+        tree.add_child(tree.root, "short")
+        assert tree.is_balanced() is False
+        tree.enable_aggregates()
+        assert tree.is_balanced() is False
+        assert tree.get_height() == 4999
+
+    def test_disable(self):
+        tree = _sample_tree()
+        tree.enable_aggregates()
+        tree.disable_aggregates()
+        assert tree.aggregates is None
+        assert tree.get_height() == 3
@@ -0,0 +1,104 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the ancestor index (O(1) ancestor and LCA queries).
+"""
+
+import random
+
+import pytest
+from generic_tree import Tree
+
+
+def _random_tree(count=300, seed=7):
+    rng = random.Random(seed)
+    tree = Tree(root_value=0)
+    nodes = [tree.root]
+    for value in range(1, count):
+        nodes.append(tree.add_child(rng.choice(nodes), value))
+    return tree, nodes
+
+
+def _naive_lca(a, b):
+    ancestors = {id(node) for node in a.get_path_to_root()}
+    current = b
+    while id(current) not in ancestors:
+        current = current.parent
+    return current
+
+
+class TestAncestorIndex:
+    def test_matches_naive_queries(self):
+        tree, nodes = _random_tree()
+        ancestry = tree.enable_ancestor_index()
+        rng = random.Random(1)
+        for _ in range(500):
+            a, b = rng.choice(nodes), rng.choice(nodes)
+            assert ancestry.lca(a, b) is _naive_lca(a, b)
+            assert ancestry.is_ancestor(a, b) == any(n is a for n in b.get_path_to_root())
+            assert ancestry.depth(a) == a.get_depth()
+
+    def test_kth_ancestor(self):
+        tree, nodes = _random_tree()
+        ancestry = tree.enable_ancestor_index()
+        for node in nodes[::7]:
+            path = node.get_path_to_root()
+            for k in range(len(path)):
+                assert ancestry.kth_ancestor(node, k) is path[-1 - k]
+            assert ancestry.kth_ancestor(node, len(path)) is None
+            assert ancestry.kth_ancestor(node, -1) is None
+
+    def test_batch_queries(self):
+        tree, nodes = _random_tree()
+        ancestry = tree.enable_ancestor_index()
+        rng = random.Random(2)
+        pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(200)]
+        assert ancestry.lca_many(pairs) == [ancestry.lca(a, b) for a, b in pairs]
+        assert ancestry.is_ancestor_many(pairs) == [ancestry.is_ancestor(a, b) for a, b in pairs]
+        distances = ancestry.distance_many(pairs)
+        for (a, b), distance in zip(pairs, distances):
+            common = _naive_lca(a, b)
+            assert distance == a.get_depth() + b.get_depth() - 2 * common.get_depth()
+
+    def test_rebuilds_after_structural_edits(self):
+        tree = Tree(root_value="ceo")
+        cto = tree.add_child(tree.root, "cto")
+        dev = tree.add_child(cto, "dev")
+        cfo = tree.add_child(tree.root, "cfo")
+        ancestry = tree.enable_ancestor_index()
+        assert ancestry.lca(dev, cfo) is tree.root
+        acct = tree.add_child(cfo, "acct")
+        assert ancestry.lca(acct, cfo) is cfo
+        assert ancestry.depth(acct) == 2
+        tree.remove_child(tree.root, cto)
+        assert dev not in ancestry
+        with pytest.raises(ValueError):
+            ancestry.lca(dev, acct)
+
+    def test_common_ancestor_uses_index(self):
+        tree, nodes = _random_tree(count=100)
+        expected = [tree.get_common_ancestor(a, b) for a, b in zip(nodes, reversed(nodes))]
+        tree.enable_ancestor_index()
+        assert [tree.get_common_ancestor(a, b)
+                for a, b in zip(nodes, reversed(nodes))] == expected
+        other = Tree(root_value="other")
+        assert tree.get_common_ancestor(nodes[3], other.root) is None
+        tree.disable_ancestor_index()
+        assert tree.ancestor_index is None
+        assert tree.root._tree is None
+
+    def test_single_node_tree(self):
+        tree = Tree(root_value=1)
+        ancestry = tree.enable_ancestor_index()
+        assert ancestry.lca(tree.root, tree.root) is tree.root
+        assert ancestry.distance(tree.root, tree.root) == 0
+        assert ancestry.kth_ancestor(tree.root, 0) is tree.root
+
+
+class TestPathToRoot:
+    def test_deep_chain(self):
+        tree = Tree(root_value=0)
+        node = tree.root
+        for value in range(1, 5000):
+            node = tree.add_child(node, value)
+        assert [n.value for n in node.get_path_to_root()] == list(range(5000))
@@ -0,0 +1,97 @@
+# Generated by AI - Python Module
+
+"""
+Tests for asyncio traversal and bounded-concurrency node visitors.
+"""
+
+import asyncio
+
+import pytest
+from generic_tree import Tree, TraversalMode
+
+
+def _wide_tree(branches=5, leaves=8):
+    tree = Tree(root_value="r")
+    for i in range(branches):
+        branch = tree.add_child(tree.root, f"b{i}")
+        for j in range(leaves):
+            tree.add_child(branch, f"b{i}.{j}")
+    return tree
+
+
+class TestAsyncTree:
+    def test_atraverse_matches_traverse(self):
+        tree = _wide_tree()
+
+        async def collect(mode):
+            return [node.value async for node in tree.atraverse(mode, yield_every=3)]
+
+        for mode in TraversalMode:
+            expected = [node.value for node in tree.traverse(mode)]
+            assert asyncio.run(collect(mode)) == expected
+        with pytest.raises(ValueError):
+            asyncio.run(tree.atraverse(yield_every=0).__anext__())
+
+    def test_aapply_bounds_concurrency(self):
+        tree = _wide_tree()
+        state = {"running": 0, "peak": 0}
+
+        async def visit(node):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.001)
+            node.set_metadata("seen", True)
+            state["running"] -= 1
+
+        assert asyncio.run(tree.aapply(visit, concurrency=4)) == tree.get_node_count()
+        assert state["peak"] == 4
+        assert all(node.get_metadata("seen") for node in tree.traverse())
+        with pytest.raises(ValueError):
+            asyncio.run(tree.aapply(visit, concurrency=0))
+
+    def test_parent_first(self):
+        tree = _wide_tree()
+        finished = set()
+
+        async def visit(node):
+            assert node.parent is None or id(node.parent) in finished
+            await asyncio.sleep(0.001 * (len(str(node.value)) % 3))
+            if node.value == "b0":
+                tree.add_child(node, "late")
+            finished.add(id(node))
+
+        visited = asyncio.run(tree.aapply(visit, concurrency=8, parent_first=True))
+        assert visited == tree.get_node_count() == 47
+        assert visited == len(finished)
+
+    def test_failure_and_cancellation_stop_the_rest(self):
+        tree = _wide_tree()
+        started = []
+        cancelled = []
+
+        async def visit(node):
+            started.append(node.value)
+            try:
+                if node.value == "b0.2":
+                    raise KeyError(node.value)
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(node.value)
+                raise
+
+        with pytest.raises(KeyError):
+            asyncio.run(tree.aapply(visit, concurrency=5))
+        assert len(started) == 5
+        assert len(cancelled) == 4
+
+        async def cancel_walk():
+            walk = asyncio.ensure_future(tree.aapply(visit, concurrency=3))
+            await asyncio.sleep(0.01)
+            walk.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await walk
+
+        started.clear()
+        cancelled.clear()
+        asyncio.run(cancel_walk())
+        assert len(cancelled) == 3
@@ -0,0 +1,106 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the binary tree file format and its memory-mapped view.
+"""
+
+import os
+import tempfile
+
+import pytest
+from generic_tree import Tree, CompactTreeNode, TraversalMode
+from binary_tree import MappedTree, write_binary
+
+
+def _sample_tree():
+    tree = Tree(root_value={"name": "root"})
+    a = tree.add_child(tree.root, "shared")
+    a.set_metadata("info", {"rank": 1})
+    tree.add_child(a, [1, 2])
+    tree.add_child(a, "shared")
+    b = tree.add_child(tree.root, 3.5)
+    tree.add_child(b, None)
+    tree.add_child(b, "é\nline")
+    return tree
+
+
+@pytest.fixture
+def tmpfile():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield os.path.join(tmpdir, "tree.gtb")
+
+
+class TestBinaryTree:
+    def test_round_trip(self, tmpfile):
+        tree = _sample_tree()
+        tree.save_binary(tmpfile)
+        loaded = Tree.load_binary(tmpfile)
+        assert loaded.to_json() == tree.to_json()
+        assert loaded.get_node_count() == tree.get_node_count()
+        compact = Tree.load_binary(tmpfile, node_class=CompactTreeNode)
+        assert isinstance(compact.root, CompactTreeNode)
+        assert compact.to_json() == tree.to_json()
+
+    def test_without_metadata(self, tmpfile):
+        tree = _sample_tree()
+        tree.save_binary(tmpfile, include_metadata=False)
+        assert Tree.load_binary(tmpfile).to_json() == tree.to_json(include_metadata=False)
+
+    def test_values_are_interned(self, tmpfile):
+        tree = Tree(root_value="x")
+        for _ in range(100):
+            tree.add_child(tree.root, "a long repeated category name")
+        tree.save_binary(tmpfile)
+        single = os.path.getsize(tmpfile)
+        tree.add_child(tree.root, "a long repeated category name")
+        tree.save_binary(tmpfile)
+        assert os.path.getsize(tmpfile) - single <= 8 * 7
+
+    def test_mapped_navigation(self, tmpfile):
+        tree = _sample_tree()
+        tree.save_binary(tmpfile)
+        with Tree.open_binary(tmpfile) as mapped:
+            root = mapped.root
+            assert isinstance(mapped, MappedTree)
+            assert root.value == {"name": "root"}
+            assert root.is_root() and not root.is_leaf()
+            a, b = root.children
+            assert a.get_metadata("info") == {"rank": 1}
+            assert [child.value for child in a.children] == [[1, 2], "shared"]
+            leaf = b.children[1]
+            assert leaf.value == "é\nline"
+            assert leaf.parent == b
+            assert leaf.get_depth() == 2
+            path = [node.value for node in leaf.get_path_to_root()]
+            assert path == [{"name": "root"}, 3.5, "é\nline"]
+            assert mapped.node(leaf.index) == leaf
+
+    def test_flat_tree_queries(self, tmpfile):
+        tree = _sample_tree()
+        flat = tree.to_flat()
+        write_binary(flat, tmpfile)
+        with MappedTree(tmpfile) as mapped:
+            for mode in TraversalMode:
+                assert list(mapped.traverse(mode)) == list(flat.traverse(mode))
+            assert mapped.height() == flat.height()
+            assert mapped.leaves() == flat.leaves()
+            assert mapped.find("shared", 2) == flat.find("shared", 2)
+            assert mapped.subtree(1).to_tree().to_json() == flat.subtree(1).to_tree().to_json()
+
+    def test_containers_are_not_shared(self, tmpfile):
+        tree = Tree(root_value=[1])
+        tree.add_child(tree.root, [1])
+        tree.save_binary(tmpfile)
+        with Tree.open_binary(tmpfile) as mapped:
+            first = mapped.root.value
+            first.append(2)
+            assert mapped.node(1).value == [1]
+
+    def test_rejects_other_files(self, tmpfile):
+        with open(tmpfile, 'w') as f:
+            f.write('{"value": 1, "children": []}')
+        with pytest.raises(ValueError):
+            Tree.open_binary(tmpfile)
+        open(tmpfile, 'w').close()
+        with pytest.raises(ValueError):
+            Tree.open_binary(tmpfile)
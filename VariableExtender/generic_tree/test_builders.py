@@ -0,0 +1,83 @@
+# Generated by AI - Python Module
+
+"""
+Tests for bulk tree construction from edges, parent arrays and paths.
+"""
+
+import pytest
+from generic_tree import Tree, CompactTreeNode
+
+
+def _values(tree):
+    return [node.value for node in tree.traverse()]
+
+
+class TestFromEdges:
+    def test_edges_in_any_order(self):
+        edges = [("a", "a1"), ("root", "a"), ("root", "b"), ("a", "a2")]
+        tree = Tree.from_edges(edge for edge in edges)
+        assert _values(tree) == ["root", "a", "a1", "a2", "b"]
+        assert tree.get_node_count() == 5
+        assert tree.root.children[0].children[1].parent is tree.root.children[0]
+        assert tree.root.children[1].get_index() == 1
+
+    def test_declared_root_and_node_class(self):
+        tree = Tree.from_edges([(None, "only")], node_class=CompactTreeNode)
+        assert isinstance(tree.root, CompactTreeNode)
+        assert tree.get_node_count() == 1
+
+    def test_errors(self):
+        with pytest.raises(ValueError, match="more than one parent"):
+            Tree.from_edges([("r", "a"), ("r", "b"), ("b", "a")])
+        with pytest.raises(ValueError, match="2 roots"):
+            Tree.from_edges([("r", "a"), ("x", "y")])
+        with pytest.raises(ValueError, match="cycle"):
+            Tree.from_edges([("r", "a"), ("b", "c"), ("c", "b")])
+        with pytest.raises(ValueError, match="cycle"):
+            Tree.from_edges([("a", "a")])
+        with pytest.raises(ValueError, match="no edges"):
+            Tree.from_edges([])
+
+
+class TestFromParentArray:
+    def test_forward_references(self):
+        tree = Tree.from_parent_array(["a1", "a", "root", "b"], iter([1, 2, -1, 2]))
+        assert _values(tree) == ["root", "a", "a1", "b"]
+        assert tree.get_node_count() == 4
+        assert tree.get_height() == 2
+
+    def test_deep_chain(self):
+        count = 50000
+        tree = Tree.from_parent_array(range(count), (i - 1 for i in range(count)))
+        assert tree.get_node_count() == count
+        assert tree.get_height() == count - 1
+
+    def test_errors(self):
+        with pytest.raises(ValueError, match="different lengths"):
+            Tree.from_parent_array([1, 2], [None])
+        with pytest.raises(ValueError, match="out of range"):
+            Tree.from_parent_array([1, 2], [None, 5])
+        with pytest.raises(ValueError, match="roots"):
+            Tree.from_parent_array([1, 2], [None, None])
+        with pytest.raises(ValueError, match="cycle"):
+            Tree.from_parent_array([0, 1, 2], [None, 2, 1])
+        with pytest.raises(ValueError, match="cycle"):
+            Tree.from_parent_array([0, 1], [None, 1])
+
+
+class TestFromPaths:
+    def test_shared_prefixes(self):
+        tree = Tree.from_paths(["r/a/b", "r/a/c", "r/d", "r//a/e/"])
+        assert _values(tree) == ["r", "a", "b", "c", "e", "d"]
+        assert tree.get_node_count() == 6
+        assert tree.find_path("e") == ["r", "a", "e"]
+
+    def test_separator_and_sequences(self):
+        tree = Tree.from_paths(iter(["r.x.y", ("r", "x", 3)]), sep=".")
+        assert _values(tree) == ["r", "x", "y", 3]
+
+    def test_errors(self):
+        with pytest.raises(ValueError, match="does not start at the root"):
+            Tree.from_paths(["r/a", "s/b"])
+        with pytest.raises(ValueError, match="no paths"):
+            Tree.from_paths(["", "/"])
@@ -0,0 +1,134 @@
+# Generated by AI - Python Module
+
+"""
+Tests for tree diff and patch.
+"""
+
+import json
+import random
+
+import pytest
+from generic_tree import Tree
+
+
+def _random_tree(count=400, seed=11):
+    rng = random.Random(seed)
+    tree = Tree(root_value=0)
+    nodes = [tree.root]
+    for value in range(1, count):
+        nodes.append(tree.add_child(rng.choice(nodes), value))
+    return tree
+
+
+def _mutate(tree, seed, edits=30):
+    rng = random.Random(seed)
+    next_value = 10000
+    for _ in range(edits):
+        nodes = tree.get_all_nodes()
+        node = rng.choice(nodes)
+        action = rng.randrange(6)
+        if action == 0:
+            node.set_value(f"v{rng.randrange(100)}")
+        elif action == 1:
+            node.set_metadata(rng.choice("abc"), rng.randrange(5))
+        elif action == 2 and node.parent is not None:
+            tree.remove_child(node.parent, node)
+        elif action == 3:
+            tree.add_child(node, next_value)
+            next_value += 1
+        elif action == 4 and len(node.children) > 1:
+            node.children.reverse()
+        elif action == 5 and node.metadata:
+            node.remove_metadata(next(iter(node.metadata)))
+
+
+class TestDiffPatch:
+    def test_identical_trees_give_empty_script(self):
+        assert _random_tree().diff(_random_tree()) == []
+
+    @pytest.mark.parametrize("seed", range(8))
+    def test_patch_reproduces_target(self, seed):
+        old = _random_tree()
+        new = _random_tree()
+        _mutate(new, seed)
+        script = old.diff(new)
+        old.apply_patch(json.loads(json.dumps(script)))
+        assert old.equals(new)
+        assert old.to_json() == new.to_json()
+        assert old.get_node_count() == new.get_node_count()
+
+    def test_operations(self):
+        old = Tree(root_value="r")
+        for name in "abc":
+            old.add_child(old.root, name)
+        old.root.children[0].set_metadata("k", 1)
+        new = Tree(root_value="r")
+        for name in "cbd":
+            new.add_child(new.root, name)
+        new.add_child(new.root.children[1], "b1")
+        script = old.diff(new)
+        kinds = {op["op"] for op in script}
+        assert "move" in kinds and "insert" in kinds
+        old.apply_patch(script)
+        assert old.equals(new)
+
+    def test_value_and_metadata_updates(self):
+        old = Tree(root_value="r")
+        old.add_child(old.root, "a").set_metadata("k", 1)
+        new = Tree(root_value="R")
+        new.add_child(new.root, "a").set_metadata("j", 2)
+        script = old.diff(new)
+        assert script == [
+            {"op": "update", "path": [], "value": "R"},
+            {"op": "metadata", "path": [0], "set": {"j": 2}, "unset": ["k"]},
+        ]
+
+    def test_patch_keeps_indexes_current(self):
+        old, new = _random_tree(), _random_tree()
+        _mutate(new, 99)
+        index = old.enable_value_index()
+        hashes = old.enable_hashing()
+        new.enable_hashing()
+        old.apply_patch(old.diff(new))
+        assert hashes.digest() == new.hashes.digest()
+        for node in old.get_all_nodes():
+            assert index.find(node.value) is not None
+
+    def test_only_changed_paths_are_visited(self):
+        old, new = _random_tree(2000), _random_tree(2000)
+        old.enable_hashing().digest()
+        new.enable_hashing().digest()
+        leaf = new.get_all_leaf_nodes()[-1]
+        leaf.set_value("changed")
+        visited = []
+        digest = new.hashes.digest
+        new.hashes.digest = lambda node=None: visited.append(node) or digest(node)
+        script = old.diff(new)
+        assert len(script) == 1
+        assert script[0]["op"] == "update" and script[0]["value"] == "changed"
+        assert len(visited) < 200
+
+    def test_bad_operations(self):
+        tree = Tree(root_value="r")
+        with pytest.raises(ValueError):
+            tree.apply_patch([{"op": "explode", "path": []}])
+        with pytest.raises(IndexError):
+            tree.apply_patch([{"op": "delete", "path": [3]}])
+
+    def test_order_clash_with_ordered_child_index_is_rejected(self):
+        old = Tree(root_value="r")
+        old.root.enable_child_index(ordered=True)
+        old.add_child(old.add_child(old.root, "a"), "a1")
+        old.add_child(old.add_child(old.root, "b"), "b1")
+        new = Tree(root_value="r")
+        new.add_child(new.add_child(new.root, "b"), "b1x")
+        new.add_child(new.add_child(new.root, "a"), "a1")
+        script = old.diff(new)
+        with pytest.raises(ValueError):
+            old.apply_patch(script)
+        assert [child.children[0].value for child in old.root.children] == ["a1", "b1"]
+        insert = {"op": "insert", "path": [], "index": 0, "node": {"value": "c"}}
+        with pytest.raises(ValueError):
+            old.apply_patch([insert])
+        old.apply_patch([dict(insert, index=2)])
+        assert [child.value for child in old.root.children] == ["a", "b", "c"]
@@ -0,0 +1,117 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the array-backed FlatTree representation.
+"""
+
+import pickle
+
+import pytest
+from generic_tree import Tree, TraversalMode, CompactTreeNode
+from flat_tree import FlatTree
+
+
+def _sample_tree():
+    tree = Tree(root_value="r")
+    a = tree.add_child(tree.root, "a")
+    b = tree.add_child(tree.root, "b")
+    c = tree.add_child(tree.root, "c")
+    tree.add_child(a, "a1")
+    tree.add_child(a, "a2").set_metadata("k", 1)
+    tree.add_child(a, "a3")
+    tree.add_child(b, "b1")
+    tree.add_child(c, "c1")
+    tree.add_child(c, "c2")
+    tree.root.set_metadata("root", True)
+    return tree
+
+
+class TestFlatTreeConversion:
+    def test_columns(self):
+        flat = _sample_tree().to_flat()
+        assert flat.values == ["r", "a", "a1", "a2", "a3", "b", "b1", "c", "c1", "c2"]
+        assert list(flat.parent) == [-1, 0, 1, 1, 1, 0, 5, 0, 7, 7]
+        assert list(flat.first_child) == [1, 2, -1, -1, -1, 6, -1, 8, -1, -1]
+        assert list(flat.next_sibling) == [-1, 5, 3, 4, -1, 7, -1, -1, 9, -1]
+        assert list(flat.depth) == [0, 1, 2, 2, 2, 1, 2, 1, 2, 2]
+        assert list(flat.size) == [10, 4, 1, 1, 1, 2, 1, 3, 1, 1]
+        assert flat.metadata == {0: {"root": True}, 3: {"k": 1}}
+
+    def test_round_trip(self):
+        tree = _sample_tree()
+        restored = tree.to_flat().to_tree()
+        assert restored.to_json() == tree.to_json()
+        assert restored.get_node_count() == tree.get_node_count()
+
+    def test_round_trip_compact_nodes(self):
+        restored = _sample_tree().to_flat().to_tree(node_class=CompactTreeNode)
+        assert isinstance(restored.root.children[0], CompactTreeNode)
+
+    def test_without_metadata(self):
+        assert _sample_tree().to_flat(include_metadata=False).metadata == {}
+
+    def test_from_node(self):
+        tree = _sample_tree()
+        flat = tree.to_flat(tree.root.children[0])
+        assert flat.values == ["a", "a1", "a2", "a3"]
+        assert flat.parent[0] == -1
+
+    def test_pickle(self):
+        flat = _sample_tree().to_flat()
+        restored = pickle.loads(pickle.dumps(flat))
+        assert restored.values == flat.values
+        assert restored.size == flat.size
+
+    def test_deep_chain(self):
+        tree = Tree(root_value=0)
+        node = tree.root
+        for i in range(1, 20000):
+            node = tree.add_child(node, i)
+        flat = tree.to_flat()
+        assert flat.height() == 19999
+        assert flat.to_tree().get_height() == 19999
+
+
+class TestFlatTreeQueries:
+    @pytest.mark.parametrize("mode", list(TraversalMode))
+    def test_traversal_matches_tree(self, mode):
+        tree = _sample_tree()
+        flat = tree.to_flat()
+        expected = [n.value for n in tree.traverse(mode)]
+        assert [flat.values[i] for i in flat.traverse(mode)] == expected
+
+    @pytest.mark.parametrize("mode", list(TraversalMode))
+    def test_subtree_traversal_matches_tree(self, mode):
+        tree = _sample_tree()
+        flat = tree.to_flat()
+        start = tree.root.children[2]
+        expected = [n.value for n in tree.traverse(mode, start)]
+        assert [flat.values[i] for i in flat.traverse(mode, 7)] == expected
+
+    def test_height_and_leaves(self):
+        flat = _sample_tree().to_flat()
+        assert flat.height() == 2
+        assert flat.height(5) == 1
+        assert flat.height(2) == 0
+        assert [flat.values[i] for i in flat.leaves()] == ["a1", "a2", "a3", "b1", "c1", "c2"]
+        assert [flat.values[i] for i in flat.leaves(7)] == ["c1", "c2"]
+
+    def test_navigation(self):
+        flat = _sample_tree().to_flat()
+        assert flat.children(0) == [1, 5, 7]
+        assert flat.path_to_root(9) == [0, 7, 9]
+        assert flat.find("b1") == 6
+        assert flat.find("b1", start=7) == -1
+        assert flat.get_metadata(3, "k") == 1
+        assert flat.get_metadata(4, "k", "none") == "none"
+        assert len(flat) == flat.get_node_count() == 10
+
+    def test_subtree_slice(self):
+        flat = _sample_tree().to_flat()
+        sub = flat.subtree(1)
+        assert sub.values == ["a", "a1", "a2", "a3"]
+        assert list(sub.parent) == [-1, 0, 0, 0]
+        assert list(sub.next_sibling) == [-1, 2, 3, -1]
+        assert list(sub.depth) == [0, 1, 1, 1]
+        assert sub.metadata == {2: {"k": 1}}
+        assert sub.to_tree().to_json() == _sample_tree().to_json(_sample_tree().root.children[0])
@@ -9,7 +9,7 @@ import pytest
 import json
 import tempfile
 import os
-from generic_tree import Tree, TreeNode, TraversalMode
+from generic_tree import Tree, TreeNode, CompactTreeNode, TraversalMode
 
 
 class TestTreeNodeBasics:
@@ -101,6 +101,18 @@ class TestTreeNodeChildren:
         parent.add_node(child)
         assert parent.children[0].get_metadata("color") == "red"
 
+    def test_add_node_moves_and_rejects_cycles(self):
+        parent = TreeNode(value=1)
+        first = parent.add_child(2)
+        second = parent.add_child(3)
+        leaf = first.add_child(4)
+        second.add_node(first)
+        assert first.parent is second and parent.children == [second]
+        with pytest.raises(ValueError):
+            leaf.add_node(parent)
+        with pytest.raises(ValueError):
+            first.add_node(first)
+
     def test_remove_child_success(self):
         parent = TreeNode(value=1)
         child = parent.add_child(2)
@@ -434,6 +446,59 @@ class TestTreeBasics:
         assert tree.get_node_count() == 1
 
 
+class TestTreeAddNode:
+    def test_move_within_tree_keeps_count(self):
+        tree = Tree(root_value="r")
+        a = tree.add_child(tree.root, "a")
+        b = tree.add_child(tree.root, "b")
+        tree.add_child(a, "a1")
+        tree.add_child(a, "a2")
+        assert tree.get_node_count() == 5
+        tree.add_node(b, a)
+        assert a.parent is b
+        assert tree.get_node_count() == 5 == len(list(tree.traverse()))
+        tree.add_node(tree.root, TreeNode(value="c"))
+        assert tree.get_node_count() == 6
+
+    def test_node_of_another_tree_is_rejected(self):
+        source = Tree(root_value="s")
+        branch = source.add_child(source.root, "branch")
+        source.add_child(branch, "leaf")
+        target = Tree(root_value="t")
+        with pytest.raises(ValueError):
+            target.add_node(target.root, branch)
+        assert branch.parent is source.root
+        assert source.get_node_count() == 3 and target.get_node_count() == 1
+        source.remove_child(source.root, branch)
+        target.add_node(target.root, branch)
+        assert source.get_node_count() == 1 and target.get_node_count() == 3
+
+    def test_move_below_own_descendant_is_rejected(self):
+        tree = Tree(root_value="r")
+        a = tree.add_child(tree.root, "a")
+        a1 = tree.add_child(a, "a1")
+        with pytest.raises(ValueError):
+            tree.add_node(a1, a)
+        with pytest.raises(ValueError):
+            tree.add_node(a1, tree.root)
+        assert tree.get_node_count() == 3
+
+    def test_incomparable_key_leaves_tree_unchanged(self):
+        tree = Tree(root_value="r")
+        p = tree.add_child(tree.root, "p")
+        p.enable_child_index(ordered=True)
+        tree.add_child(p, "s")
+        q = tree.add_child(tree.root, "q")
+        one = tree.add_child(q, 1)
+        with pytest.raises(TypeError):
+            tree.add_node(p, one)
+        assert one.parent is q and q.children == [one]
+        with pytest.raises(TypeError):
+            tree.add_child(p, 2)
+        assert [child.value for child in p.children] == ["s"]
+        assert tree.get_node_count() == 5 == len(list(tree.traverse()))
+
+
 class TestTreeSearchOperations:
     def test_get_node_by_value_found(self):
         tree = Tree()
@@ -769,6 +834,55 @@ class TestTreeFunctionalOperations:
         ancestor = tree.get_common_ancestor(c1, c2)
         assert ancestor is tree.root
 
+    def test_map_counts_nodes_and_copies_metadata(self):
+        tree = Tree(root_value=1)
+        child = tree.add_child(tree.root, 2)
+        tree.add_child(child, 3).set_metadata("k", [1])
+        mapped = tree.map(lambda x: x * 10)
+        assert mapped.get_node_count() == 3
+        assert [n.value for n in mapped.traverse()] == [10, 20, 30]
+        leaf = mapped.root.children[0].children[0]
+        assert leaf.parent is mapped.root.children[0]
+        assert leaf.metadata == {"k": [1]}
+        leaf.set_metadata("k", None)
+        assert tree.root.children[0].children[0].metadata == {"k": [1]}
+
+    def test_filter_prunes_subtrees_and_counts_nodes(self):
+        tree = Tree(root_value=1)
+        dropped = tree.add_child(tree.root, 2)
+        tree.add_child(dropped, 4)
+        tree.add_child(tree.root, None)
+        filtered = tree.filter(lambda x: x != 2)
+        assert [n.value for n in filtered.traverse()] == [1, None]
+        assert filtered.get_node_count() == 2
+
+    def test_map_with_metadata(self):
+        tree = Tree(root_value="a")
+        tree.add_child(tree.root, "b").set_metadata("n", 1)
+        mapped = tree.map_with_metadata(lambda value, meta: (value.upper(), {**meta, "seen": True}))
+        assert mapped.root.metadata == {"seen": True}
+        assert mapped.root.children[0].metadata == {"n": 1, "seen": True}
+        assert mapped.root.children[0].value == "B"
+
+    def test_map_filter_matches_filter_then_map(self):
+        tree = Tree(root_value=0)
+        nodes = [tree.root]
+        for i in range(1, 40):
+            nodes.append(tree.add_child(nodes[i // 3], i))
+        fused = tree.map_filter(lambda x: -x, lambda x: x % 5 != 4)
+        chained = tree.filter(lambda x: x % 5 != 4).map(lambda x: -x)
+        assert fused.to_json() == chained.to_json()
+        assert fused.get_node_count() == chained.get_node_count() == len(fused.get_all_nodes())
+        assert tree.map_filter(str, lambda x: False).get_node_count() == 1
+
+    def test_map_filter_deep_tree(self):
+        tree = Tree(root_value=0)
+        node = tree.root
+        for i in range(1, 20000):
+            node = tree.add_child(node, i)
+        assert tree.map(str).get_node_count() == 20000
+        assert tree.filter(lambda x: x < 15000).get_node_count() == 15000
+
 
 class TestTreeAdvancedOperations:
     def test_clear_removes_children(self):
@@ -1042,5 +1156,248 @@ class TestTreeTraversalVariations:
         assert values[0] == 2
 
 
+class TestTreeDeepTraversal:
+    DEPTH = 20000
+
+    def _chain(self):
+        tree = Tree(root_value=0)
+        node = tree.root
+        for i in range(1, self.DEPTH):
+            node = tree.add_child(node, i)
+        return tree, node
+
+    def _sample_tree(self):
+        tree = Tree(root_value="r")
+        a = tree.add_child(tree.root, "a")
+        b = tree.add_child(tree.root, "b")
+        c = tree.add_child(tree.root, "c")
+        tree.add_child(a, "a1")
+        tree.add_child(a, "a2")
+        tree.add_child(a, "a3")
+        tree.add_child(b, "b1")
+        tree.add_child(c, "c1")
+        tree.add_child(c, "c2")
+        return tree
+
+    def test_all_modes_on_deep_chain(self):
+        tree, _ = self._chain()
+        expected = list(range(self.DEPTH))
+        for mode in (TraversalMode.PRE_ORDER, TraversalMode.LEVEL_ORDER, TraversalMode.IN_ORDER):
+            assert [n.value for n in tree.traverse(mode)] == expected
+        assert [n.value for n in tree.traverse(TraversalMode.POST_ORDER)] == expected[::-1]
+
+    def test_walkers_on_deep_chain(self):
+        tree, leaf = self._chain()
+        assert len(tree.get_all_nodes()) == self.DEPTH
+        assert tree.get_all_leaf_nodes() == [leaf]
+        assert tree.get_height() == self.DEPTH - 1
+        assert tree.breadth_first_search(self.DEPTH - 1) is leaf
+        assert tree.find_path(self.DEPTH - 1) == list(range(self.DEPTH))
+        assert tree.reduce(lambda a, b: a + b) == sum(range(self.DEPTH))
+        assert tree._count_nodes(tree.root) == self.DEPTH
+        assert tree.root.clone().get_child_by_index(0).value == 1
+
+    def test_in_order_splits_children(self):
+        tree = self._sample_tree()
+        values = [n.value for n in tree.traverse(TraversalMode.IN_ORDER)]
+        assert values == ["a1", "a", "a2", "a3", "r", "b", "b1", "c1", "c", "c2"]
+
+    def test_post_order_sample(self):
+        tree = self._sample_tree()
+        values = [n.value for n in tree.traverse(TraversalMode.POST_ORDER)]
+        assert values == ["a1", "a2", "a3", "a", "b1", "b", "c1", "c2", "c", "r"]
+
+    def test_find_path_after_backtracking(self):
+        tree = self._sample_tree()
+        assert tree.find_path("c2") == ["r", "c", "c2"]
+        assert tree.find_path("missing") is None
+
+
+class TestTreeNodeIdentityBookkeeping:
+    def _wide(self, count=10):
+        parent = TreeNode(value="p")
+        children = [parent.add_child(i % 3) for i in range(count)]
+        return parent, children
+
+    def test_remove_child_matches_identity_not_equality(self):
+        parent = TreeNode(value="p")
+        parent.add_child(1)
+        assert parent.remove_child(TreeNode(value=1)) is False
+        assert parent.child_count() == 1
+
+    def test_remove_equal_children_removes_the_given_one(self):
+        parent, children = self._wide()
+        assert parent.remove_child(children[3]) is True
+        assert children[3].parent is None
+        assert all(a is b for a, b in zip(parent.children, children[:3] + children[4:]))
+
+    def test_indexes_after_many_removals(self):
+        parent, children = self._wide(50)
+        for child in children[::2]:
+            assert parent.remove_child(child)
+        survivors = children[1::2]
+        for index, child in enumerate(survivors):
+            assert child.get_index() == index
+        assert parent.remove_child(children[0]) is False
+        extra = parent.add_child("extra")
+        assert extra.get_index() == len(survivors)
+
+    def test_sibling_navigation(self):
+        parent, children = self._wide(4)
+        assert children[1].get_previous_sibling() is children[0]
+        assert children[1].get_next_sibling() is children[2]
+        assert children[0].get_previous_sibling() is None
+        assert children[3].get_next_sibling() is None
+        assert parent.get_next_sibling() is None
+        assert parent.get_index() is None
+
+    def test_index_survives_external_reordering(self):
+        parent, children = self._wide(5)
+        parent.remove_child(children[1])
+        parent.children.reverse()
+        assert children[0].get_index() == 3
+        assert children[4].get_index() == 0
+        assert parent.remove_child(children[2]) is True
+        assert [c.get_index() for c in parent.children] == [0, 1, 2]
+
+    def test_get_siblings_keeps_order(self):
+        tree = Tree(root_value="r")
+        nodes = [tree.add_child(tree.root, "x") for _ in range(4)]
+        siblings = tree.get_siblings(nodes[2])
+        assert len(siblings) == 3
+        assert all(a is b for a, b in zip(siblings, nodes[:2] + nodes[3:]))
+
+
+class TestCompactTreeNode:
+    def test_no_instance_dict(self):
+        node = CompactTreeNode(value=1)
+        assert not hasattr(node, "__dict__")
+
+    def test_leaf_containers_are_not_allocated(self):
+        node = CompactTreeNode(value=1)
+        assert node.children == []
+        assert node.metadata == {}
+        assert node._children is None
+        assert node._metadata is None
+        assert node.children is CompactTreeNode().children
+
+    def test_shared_empty_containers_are_read_only(self):
+        node = CompactTreeNode()
+        with pytest.raises(TypeError):
+            node.children.append(CompactTreeNode())
+        with pytest.raises(TypeError):
+            node.metadata["key"] = "value"
+        node.children.reverse()
+        node.children.sort()
+        assert CompactTreeNode().children == []
+
+    def test_add_child_allocates_and_propagates_class(self):
+        parent = CompactTreeNode(value="p")
+        child = parent.add_child("c")
+        assert isinstance(child, CompactTreeNode)
+        assert child.parent is parent
+        assert parent.children == [child]
+        assert not parent.is_leaf()
+        assert child.is_leaf()
+
+    def test_metadata_api(self):
+        node = CompactTreeNode()
+        assert node.get_metadata("missing", 5) == 5
+        node.set_metadata("key", "value")
+        assert node.has_metadata("key")
+        assert node.get_metadata("key") == "value"
+        node.clear_metadata()
+        assert node._metadata is None
+        assert not node.has_metadata("key")
+
+    def test_remove_child_and_navigation(self):
+        parent = CompactTreeNode()
+        children = [parent.add_child(i) for i in range(3)]
+        assert parent.remove_child(children[1])
+        assert children[0].get_next_sibling() is children[2]
+        assert children[1].parent is None
+
+    def test_clone_keeps_leaves_lean(self):
+        parent = CompactTreeNode(value="p")
+        child = parent.add_child("c")
+        child.set_metadata("k", 1)
+        parent.add_child("leaf")
+        cloned = parent.clone()
+        assert isinstance(cloned, CompactTreeNode)
+        assert [c.value for c in cloned.children] == ["c", "leaf"]
+        assert cloned.children[0].get_metadata("k") == 1
+        assert cloned._metadata is None
+        assert cloned.children[1]._metadata is None
+
+    def test_tree_with_compact_nodes(self):
+        tree = Tree(root_value="root", node_class=CompactTreeNode)
+        a = tree.add_child(tree.root, "a")
+        tree.add_child(a, "a1")
+        tree.add_child(tree.root, "b")
+        assert isinstance(tree.root, CompactTreeNode)
+        assert tree.get_node_count() == 4
+        post_order = [n.value for n in tree.traverse(TraversalMode.POST_ORDER)]
+        assert post_order == ["a1", "a", "b", "root"]
+        tree.sort_children(reverse=True)
+        tree.reverse_children()
+        assert tree.find_path("a1") == ["root", "a", "a1"]
+        mapped = tree.map(str.upper)
+        assert isinstance(mapped.root, CompactTreeNode)
+        assert [n.value for n in mapped.traverse()] == ["ROOT", "A", "A1", "B"]
+
+    def test_json_round_trip(self):
+        tree = Tree(root_value="root", node_class=CompactTreeNode)
+        tree.add_child(tree.root, "a").set_metadata("k", 1)
+        loaded = Tree.from_json(tree.to_json(), node_class=CompactTreeNode)
+        assert isinstance(loaded.root.children[0], CompactTreeNode)
+        assert loaded.to_json() == tree.to_json()
+
+
+class TestTreeStreamingJson:
+    @staticmethod
+    def _sample_tree():
+        tree = Tree(root_value={"name": "root", "tags": [1, 2]})
+        a = tree.add_child(tree.root, "a\nline é")
+        a.set_metadata("info", {"nested": [1, {"deep": None}]})
+        tree.add_child(a, [1, [], {}])
+        b = tree.add_child(tree.root, object())
+        b.set_metadata("flag", True)
+        tree.add_child(b, 3.5)
+        return tree
+
+    @pytest.mark.parametrize("indent", [None, 0, 2, 4, "\t"])
+    @pytest.mark.parametrize("include_metadata", [True, False])
+    def test_matches_json_dumps(self, indent, include_metadata):
+        tree = self._sample_tree()
+        expected = json.dumps(tree.to_dict(include_metadata=include_metadata),
+                              indent=indent, default=str)
+        assert tree.to_json(include_metadata=include_metadata, indent=indent) == expected
+
+    def test_dump_to_file_object(self):
+        import io
+        tree = self._sample_tree()
+        buffer = io.StringIO()
+        tree.dump(buffer, node=tree.root.children[0], indent=2)
+        assert buffer.getvalue() == json.dumps(tree.to_dict(tree.root.children[0]),
+                                               indent=2, default=str)
+
+    def test_save_to_file_streams_same_bytes(self):
+        tree = self._sample_tree()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "tree.json")
+            tree.save_to_file(filepath)
+            with open(filepath, 'r', encoding='utf-8') as f:
+                assert f.read() == json.dumps(tree.to_dict(), indent=2, default=str)
+
+    def test_deep_tree(self):
+        tree = Tree(root_value=0)
+        node = tree.root
+        for value in range(1, 5000):
+            node = tree.add_child(node, value)
+        text = tree.to_json()
+        assert text.count('"value"') == 5000
+        assert tree.to_dict()['children'][0]['children'][0]['value'] == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,137 @@
+# Generated by AI - Python Module
+
+"""
+Tests for Merkle subtree hashing, tree equality and duplicate detection.
+"""
+
+import pytest
+from generic_tree import Tree, CompactTreeNode
+from hashing import SubtreeHashes, node_digest
+from diffing import diff_trees
+
+
+def _repetitive_tree(node_class=None):
+    tree = Tree(root_value="root") if node_class is None else Tree(root_value="root",
+                                                                    node_class=node_class)
+    for name in ("x", "y", "z"):
+        branch = tree.add_child(tree.root, name)
+        for leaf in ("a", "b"):
+            tree.add_child(branch, "common").set_metadata("leaf", leaf)
+        tree.add_child(tree.root.children[0], name)
+    return tree
+
+
+class TestSubtreeHashes:
+    def test_digest_depends_on_content(self):
+        assert node_digest(1, None, []) != node_digest("1", None, [])
+        assert node_digest(1, {"k": 1}, []) != node_digest(1, None, [])
+        assert node_digest({"a": 1, "b": 2}, None, []) == node_digest({"b": 2, "a": 1}, None, [])
+        left, right = node_digest("l", None, []), node_digest("r", None, [])
+        assert node_digest(0, None, [left, right]) != node_digest(0, None, [right, left])
+
+    def test_equal_trees_have_equal_digests(self):
+        a = _repetitive_tree()
+        b = _repetitive_tree(node_class=CompactTreeNode)
+        assert a.enable_hashing().digest() == b.enable_hashing().digest()
+        assert a.equals(b)
+        assert a.hashes.size() == a.get_node_count()
+
+    def test_edits_invalidate_path_only(self):
+        tree = _repetitive_tree()
+        hashes = tree.enable_hashing()
+        before = hashes.digest()
+        untouched = tree.root.children[1]
+        untouched_digest = hashes.digest(untouched)
+        target = tree.root.children[0].children[0]
+        target.set_metadata("leaf", "changed")
+        assert id(untouched) in hashes._cache
+        assert id(tree.root) not in hashes._cache
+        assert hashes.digest() != before
+        assert hashes.digest(untouched) == untouched_digest
+        target.set_metadata("leaf", "a")
+        assert hashes.digest() == before
+
+    def test_structural_edits(self):
+        tree = _repetitive_tree()
+        other = _repetitive_tree()
+        tree.enable_hashing()
+        other.enable_hashing()
+        assert tree.equals(other)
+        extra = tree.add_child(tree.root.children[2], "extra")
+        assert not tree.equals(other)
+        tree.remove_child(extra.parent, extra)
+        assert tree.equals(other)
+        tree.reverse_children()
+        assert not tree.equals(other)
+
+    def test_equals_without_hashing(self):
+        a, b = _repetitive_tree(), _repetitive_tree()
+        assert a.equals(b)
+        b.root.children[1].children[0].set_metadata("leaf", "other")
+        assert not a.equals(b)
+
+    def test_find_duplicate_subtrees(self):
+        tree = _repetitive_tree()
+        groups = tree.find_duplicate_subtrees()
+        assert [[node.get_metadata("leaf") for node in group] for group in groups] == [
+            ["a", "a", "a"], ["b", "b", "b"]
+        ]
+        assert tree.find_duplicate_subtrees(min_size=2) == []
+        copy = tree.root.children[1].clone()
+        tree.add_node(tree.root, copy)
+        assert tree.find_duplicate_subtrees(min_size=2) == [[tree.root.children[1], copy]]
+        assert SubtreeHashes(tree).find_duplicates(tree.root.children[2]) == []
+
+    def test_hash_consing(self):
+        tree = _repetitive_tree()
+        shared = tree.to_persistent(share_identical=True)
+        assert shared.get_node_count() == tree.get_node_count()
+        assert shared.node((1, 0)) is shared.node((2, 0))
+        assert shared.node((1, 0)) is not shared.node((1, 1))
+        assert shared.to_tree().equals(tree)
+
+    @pytest.mark.parametrize("left, right", [
+        ({1: "x"}, {"1": "x"}),
+        ((1, 2), [1, 2]),
+        (1, True),
+        (1, 1.0),
+        (0, False),
+        ([1], [True]),
+        ({1}, frozenset({1})),
+        (b"a", "a"),
+        ("a\x00b", ["a", "b"]),
+    ])
+    def test_typed_values_never_collide(self, left, right):
+        assert node_digest(left, None, []) != node_digest(right, None, [])
+        plain_left, plain_right = Tree(root_value=left), Tree(root_value=right)
+        assert not plain_left.equals(plain_right)
+        plain_left.enable_hashing()
+        plain_right.enable_hashing()
+        assert not plain_left.equals(plain_right)
+        assert diff_trees(plain_left, plain_right) != []
+
+    def test_canonical_encoding_is_order_and_sign_insensitive(self):
+        assert node_digest({"b": [1, 2.5], "a": {3, 4}}, {"k": (None,)}, []) \
+            == node_digest({"a": {4, 3}, "b": [1, 2.5]}, {"k": (None,)}, [])
+        assert node_digest(-0.0, None, []) == node_digest(0.0, None, [])
+        assert node_digest(10 ** 5000, None, []) != node_digest(10 ** 5000 + 1, None, [])
+
+    def test_other_objects_fall_back_to_equality(self):
+        class Point:
+            def __init__(self, x):
+                self.x = x
+
+            def __eq__(self, other):
+                return isinstance(other, Point) and other.x == self.x
+
+        a, b = Tree(root_value=Point(1)), Tree(root_value=Point(1))
+        assert node_digest(a.root.value, None, []) != node_digest(b.root.value, None, [])
+        assert not a.enable_hashing().is_canonical()
+        b.enable_hashing()
+        assert a.equals(b)
+        b.root.set_value(Point(2))
+        assert not a.equals(b)
+        nan = Tree(root_value=float("nan"))
+        assert not nan.enable_hashing().is_canonical()
+        assert not nan.equals(Tree(root_value=float("nan")))
+        assert _repetitive_tree().enable_hashing().is_canonical()
@@ -0,0 +1,110 @@
+# Generated by AI - Python Module
+
+"""
+Tests for heavy-light path aggregates (path sum/min/max with point updates).
+"""
+
+import random
+
+import pytest
+from generic_tree import Tree, TreeNode, CompactTreeNode
+from heavy_light import PathAggregates
+
+
+def _random_tree(count=400, spread=6, seed=11, node_class=TreeNode):
+    rng = random.Random(seed)
+    tree = Tree(root_value=rng.randint(-50, 50), node_class=node_class)
+    nodes = [tree.root]
+    for index in range(1, count):
+        parent = nodes[rng.randrange(max(0, index - spread), index)]
+        nodes.append(tree.add_child(parent, rng.randint(-50, 50)))
+    return tree, nodes
+
+
+def _naive_path(a, b):
+    up, down = a.get_path_to_root(), b.get_path_to_root()
+    shared = 0
+    while shared < min(len(up), len(down)) and up[shared] is down[shared]:
+        shared += 1
+    return [node.value for node in up[shared - 1:] + down[shared:]]
+
+
+class TestPathAggregates:
+    @pytest.mark.parametrize("node_class", [TreeNode, CompactTreeNode])
+    def test_matches_naive_paths(self, node_class):
+        tree, nodes = _random_tree(node_class=node_class)
+        paths = tree.enable_path_aggregates()
+        rng = random.Random(3)
+        for _ in range(300):
+            a, b = rng.choice(nodes), rng.choice(nodes)
+            weights = _naive_path(a, b)
+            assert paths.path_sum(a, b) == sum(weights)
+            assert paths.path_min(a, b) == min(weights)
+            assert paths.path_max(a, b) == max(weights)
+        assert paths.query(nodes[5], nodes[5], "max") == nodes[5].value
+
+    def test_point_updates_follow_edits(self):
+        tree, nodes = _random_tree()
+        paths = tree.enable_path_aggregates()
+        rng = random.Random(4)
+        for _ in range(200):
+            rng.choice(nodes).set_value(rng.randint(-1000, 1000))
+            a, b = rng.choice(nodes), rng.choice(nodes)
+            weights = _naive_path(a, b)
+            assert paths.query(a, b) == sum(weights)
+            assert paths.query(a, b, "min") == min(weights)
+
+    def test_metadata_weights_and_manual_update(self):
+        tree = Tree(root_value="root")
+        a = tree.add_child(tree.root, "a")
+        b = tree.add_child(a, "b")
+        c = tree.add_child(tree.root, "c")
+        for node, weight in [(tree.root, 1), (a, 2), (b, 3), (c, 4)]:
+            node.set_metadata("weight", weight)
+        paths = tree.enable_path_aggregates(lambda node: node.get_metadata("weight", 0))
+        assert tree.enable_path_aggregates() is paths
+        assert paths.path_sum(b, c) == 10
+        b.set_metadata("weight", 30)
+        assert paths.path_sum(b, c) == 37
+        assert paths.path_max(b, c) == 30
+        b.metadata["weight"] = -5
+        paths.update(b)
+        assert paths.path_min(b, c) == -5
+
+    def test_batch_queries(self):
+        tree, nodes = _random_tree()
+        paths = tree.enable_path_aggregates()
+        rng = random.Random(5)
+        pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(200)]
+        for op in ("sum", "min", "max"):
+            assert paths.query_many(pairs, op) == [paths.query(a, b, op) for a, b in pairs]
+        with pytest.raises(ValueError):
+            paths.query_many(pairs, "mean")
+
+    def test_rebuilds_after_structural_edits(self):
+        tree, nodes = _random_tree(count=50)
+        paths = tree.enable_path_aggregates()
+        leaf = tree.add_child(nodes[10], 1000)
+        assert paths.path_max(leaf, nodes[0]) == 1000
+        assert paths.path_sum(leaf, nodes[10]) == 1000 + nodes[10].value
+        branch = nodes[1]
+        tree.remove_child(branch.parent, branch)
+        assert branch not in paths
+        with pytest.raises(ValueError):
+            paths.path_sum(branch, nodes[0])
+        other = Tree(root_value=1)
+        with pytest.raises(ValueError):
+            paths.query_many([(nodes[0], other.root)])
+        tree.disable_path_aggregates()
+        assert tree.path_aggregates is None
+        assert tree.root._tree is None
+
+    def test_single_node_and_deep_chain(self):
+        tree = Tree(root_value=7)
+        assert PathAggregates(tree).path_sum(tree.root, tree.root) == 7
+        node = tree.root
+        for value in range(1, 3000):
+            node = tree.add_child(node, value)
+        paths = tree.enable_path_aggregates()
+        assert paths.path_sum(tree.root, node) == 7 + sum(range(1, 3000))
+        assert paths.path_min(node, node.parent.parent) == 2997
@@ -0,0 +1,404 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the incrementally maintained tree indexes.
+"""
+
+import os
+import tempfile
+
+import pytest
+from generic_tree import Tree, TreeNode, CompactTreeNode, TraversalMode
+
+
+class _Unhashable:
+    """Unhashable value counting the equality checks made against it."""
+    __hash__ = None
+    comparisons = 0
+
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, other):
+        _Unhashable.comparisons += 1
+        return isinstance(other, _Unhashable) and other.name == self.name
+
+
+def _sample_tree(node_class=TreeNode):
+    tree = Tree(root_value="r", node_class=node_class)
+    a = tree.add_child(tree.root, "a")
+    b = tree.add_child(tree.root, "b")
+    tree.add_child(a, "x")
+    tree.add_child(a, "a1")
+    tree.add_child(b, "x")
+    tree.add_child(tree.root, "x")
+    return tree
+
+
+class TestValueIndex:
+    def test_lookups_match_scans(self):
+        plain = _sample_tree()
+        indexed = _sample_tree()
+        index = indexed.enable_value_index()
+        for value in ["r", "a", "b", "x", "a1", "missing"]:
+            expected = plain.get_node_by_value(value)
+            found = indexed.get_node_by_value(value)
+            assert (found is None) == (expected is None)
+            if found is not None:
+                assert indexed.find_path(value) == plain.find_path(value)
+        assert index.hits > 0
+        assert index.misses == 1
+
+    def test_first_match_order(self):
+        tree = _sample_tree()
+        tree.enable_value_index()
+        a, b, top_x = tree.root.children
+        assert tree.get_node_by_value("x") is a.children[0]
+        assert tree.depth_first_search("x") is a.children[0]
+        assert tree.breadth_first_search("x") is top_x
+        assert tree.get_node_by_value("x", start=b) is b.children[0]
+        assert tree.find_path("x", start=b) == ["b", "x"]
+        assert tree.get_node_by_value("a1", start=b) is None
+
+    def test_maintained_on_structural_edits(self):
+        tree = _sample_tree()
+        index = tree.enable_value_index()
+        a = tree.root.children[0]
+        new = tree.add_child(a, "new")
+        assert tree.get_node_by_value("new") is new
+        tree.remove_child(tree.root, a)
+        assert tree.get_node_by_value("a1") is None
+        assert tree.get_node_by_value("new") is None
+        grafted = TreeNode(value="g")
+        grafted.add_child("g1")
+        tree.add_node(tree.root, grafted)
+        assert tree.get_node_by_value("g1").parent is grafted
+        node_level = grafted.add_child("g2")
+        assert tree.get_node_by_value("g2") is node_level
+        tree.clear()
+        assert tree.get_node_by_value("g") is None
+        assert tree.get_node_by_value("r") is tree.root
+        assert len(index) == 1
+
+    def test_detached_subtree_stops_updating(self):
+        tree = _sample_tree()
+        tree.enable_value_index()
+        a = tree.root.children[0]
+        tree.remove_child(tree.root, a)
+        a.add_child("orphan")
+        a.set_value("renamed")
+        assert tree.get_node_by_value("orphan") is None
+        assert tree.get_node_by_value("renamed") is None
+
+    def test_set_value(self):
+        tree = _sample_tree()
+        tree.enable_value_index()
+        b = tree.root.children[1]
+        b.set_value("bee")
+        assert tree.get_node_by_value("b") is None
+        assert tree.get_node_by_value("bee") is b
+
+    def test_unhashable_values(self):
+        tree = Tree(root_value="r")
+        listed = tree.add_child(tree.root, [1, 2])
+        tree.add_child(tree.root, {"k": 1})
+        index = tree.enable_value_index()
+        assert tree.get_node_by_value([1, 2]) is listed
+        assert tree.breadth_first_search({"k": 1}) is tree.root.children[1]
+        assert index.fallbacks == 2
+        tree.remove_child(tree.root, listed)
+        assert tree.get_node_by_value([1, 2]) is None
+
+    def test_unhashable_nodes_keep_hashable_lookups_fast(self):
+        tree = Tree(root_value="r")
+        odd = tree.add_child(tree.root, _Unhashable("odd"))
+        for number in range(200):
+            tree.add_child(tree.root, f"n{number}")
+        frozen = tree.add_child(tree.root, frozenset({1}))
+        raw = tree.add_child(tree.root, b"raw")
+        index = tree.enable_value_index()
+        _Unhashable.comparisons = 0
+        assert tree.get_node_by_value("n150") is tree.root.children[151]
+        assert tree.get_node_by_value(("n", 1)) is None
+        assert _Unhashable.comparisons == 0
+        assert tree.get_node_by_value(_Unhashable("odd")) is odd
+        assert tree.get_node_by_value({1}) is frozen
+        assert tree.get_node_by_value(bytearray(b"raw")) is raw
+        assert index.fallbacks == 3
+
+    def test_map_keeps_index(self):
+        tree = _sample_tree()
+        tree.enable_value_index()
+        mapped = tree.map(str.upper)
+        assert mapped.value_index is not None
+        assert mapped.get_node_by_value("A1").value == "A1"
+
+    def test_disable(self):
+        tree = _sample_tree(CompactTreeNode)
+        tree.enable_value_index()
+        tree.disable_value_index()
+        assert tree.value_index is None
+        assert all(node._tree is None for node in tree.traverse())
+        assert tree.get_node_by_value("a1").value == "a1"
+
+    def test_sorting_keeps_first_match_order(self):
+        tree = _sample_tree()
+        tree.enable_value_index()
+        tree.sort_children(reverse=True)
+        expected = [n for n in tree.traverse(TraversalMode.PRE_ORDER) if n.value == "x"][0]
+        assert tree.get_node_by_value("x") is expected
+
+    def test_first_match_is_cached_for_common_values(self, monkeypatch):
+        import indexes
+        tree = Tree(root_value="r")
+        branches = [tree.add_child(tree.root, f"b{i}") for i in range(20)]
+        for branch in branches:
+            for _ in range(10):
+                tree.add_child(tree.add_child(branch, "mid"), "common")
+        index = tree.enable_value_index()
+        walks = []
+        path_key = indexes._path_key
+        monkeypatch.setattr(indexes, "_path_key",
+                            lambda node, start: walks.append(node) or path_key(node, start))
+        first = branches[0].children[0].children[0]
+        assert tree.get_node_by_value("common") is first
+        walks.clear()
+        for _ in range(50):
+            assert tree.get_node_by_value("common") is first
+            assert tree.get_node_by_value("common", start=branches[0]) is first
+        assert walks == []
+        assert tree.get_node_by_value("common", start=branches[3]) is \
+            branches[3].children[0].children[0]
+        earlier = tree.add_child(tree.root.children[0], "common")
+        assert tree.get_node_by_value("common") is first
+        first.set_value("renamed")
+        assert tree.get_node_by_value("common") is branches[0].children[1].children[0]
+        tree.reverse_children(branches[0])
+        assert tree.get_node_by_value("common") is earlier
+        assert tree.breadth_first_search("common") is earlier
+        tree.remove_child(branches[0], earlier)
+        assert tree.get_node_by_value("common") is branches[0].children[0].children[0]
+        assert index.stats()["hits"] > 100
+
+    def test_stats(self):
+        tree = _sample_tree()
+        index = tree.enable_value_index()
+        tree.get_node_by_value("a")
+        tree.get_node_by_value("missing")
+        assert index.stats()["hits"] == 1
+        assert index.stats()["misses"] == 1
+        index.reset_stats()
+        assert index.hits == index.misses == index.fallbacks == 0
+
+
+def _permission_tree():
+    tree = Tree(root_value="root")
+    eu = tree.add_child(tree.root, "eu")
+    us = tree.add_child(tree.root, "us")
+    for parent, names in ((eu, ["fr", "de"]), (us, ["ny", "ca"])):
+        for level, name in enumerate(names):
+            node = tree.add_child(parent, name)
+            node.set_metadata("owner", "alice" if name in ("fr", "ny") else "bob")
+            node.set_metadata("level", level + (10 if parent is us else 0))
+    eu.set_metadata("owner", "alice")
+    return tree
+
+
+def _values(nodes):
+    return sorted(node.value for node in nodes)
+
+
+class TestMetadataIndex:
+    def test_equality_matches_scan(self):
+        tree = _permission_tree()
+        scanned = _values(tree.find_by_metadata("owner", "alice"))
+        tree.create_metadata_index("owner")
+        assert _values(tree.find_by_metadata("owner", "alice")) == scanned == ["eu", "fr", "ny"]
+        assert tree.find_by_metadata("owner", "nobody") == []
+
+    def test_start_restricts_to_subtree(self):
+        tree = _permission_tree()
+        tree.create_metadata_index("owner")
+        eu = tree.root.children[0]
+        assert _values(tree.find_by_metadata("owner", "alice", start=eu)) == ["eu", "fr"]
+        assert _values(tree.find_by_metadata("owner", "bob", start=eu.children[0])) == []
+
+    def test_range_lookups(self):
+        tree = _permission_tree()
+        scanned = [n.value for n in tree.find_by_metadata_range("level", 1, 10)]
+        tree.create_metadata_index("level")
+        assert [n.value for n in tree.find_by_metadata_range("level", 1, 10)] == scanned
+        assert scanned == ["de", "ny"]
+        assert [n.value for n in tree.find_by_metadata_range("level", 0, 10, include_low=False,
+                                                              include_high=False)] == ["de"]
+        assert [n.value for n in tree.find_by_metadata_range("level", low=10)] == ["ny", "ca"]
+        us = tree.root.children[1]
+        found = tree.find_by_metadata_range("level", high=100, start=us)
+        assert [n.value for n in found] == ["ny", "ca"]
+
+    def test_maintained_on_metadata_edits(self):
+        tree = _permission_tree()
+        index = tree.create_metadata_index("owner")
+        fr = tree.root.children[0].children[0]
+        fr.set_metadata("owner", "carol")
+        assert _values(tree.find_by_metadata("owner", "carol")) == ["fr"]
+        assert "fr" not in _values(tree.find_by_metadata("owner", "alice"))
+        fr.clear_metadata()
+        assert tree.find_by_metadata("owner", "carol") == []
+        assert len(index) == 4
+
+    def test_maintained_on_structural_edits(self):
+        tree = _permission_tree()
+        tree.create_metadata_index("level")
+        us = tree.root.children[1]
+        tree.remove_child(tree.root, us)
+        assert tree.find_by_metadata_range("level", low=10) == []
+        moved = TreeNode(value="it", metadata={"level": 3})
+        tree.add_node(tree.root.children[0], moved)
+        assert tree.find_by_metadata("level", 3) == [moved]
+        new = tree.add_child(moved, "rome")
+        new.set_metadata("level", 2)
+        assert [n.value for n in tree.find_by_metadata_range("level", 2, 3)] == ["rome", "it"]
+
+    def test_unhashable_values(self):
+        tree = _permission_tree()
+        tree.create_metadata_index("tags")
+        fr = tree.root.children[0].children[0]
+        fr.set_metadata("tags", ["a", "b"])
+        assert tree.find_by_metadata("tags", ["a", "b"]) == [fr]
+        assert tree.find_by_metadata_range("tags", ["a"], ["z"]) == [fr]
+
+    def test_unorderable_range_raises(self):
+        tree = _permission_tree()
+        tree.create_metadata_index("owner")
+        tree.root.set_metadata("owner", 5)
+        assert tree.find_by_metadata("owner", 5) == [tree.root]
+        with pytest.raises(TypeError):
+            tree.find_by_metadata_range("owner", "a", "z")
+        tree.root.clear_metadata()
+        assert [n.value for n in tree.find_by_metadata_range("owner", "b", "c")] == ["de", "ca"]
+
+    def test_drop_and_get(self):
+        tree = _permission_tree()
+        index = tree.create_metadata_index("owner")
+        assert tree.create_metadata_index("owner") is index
+        assert tree.get_metadata_index("owner") is index
+        tree.enable_value_index()
+        assert tree.drop_metadata_index("owner") is True
+        assert tree.drop_metadata_index("owner") is False
+        assert tree.get_metadata_index("owner") is None
+        assert tree.root._tree is tree
+        tree.disable_value_index()
+        assert tree.root._tree is None
+
+
+class TestChildIndex:
+    @pytest.mark.parametrize("node_class", [TreeNode, CompactTreeNode])
+    def test_hash_lookups_follow_edits(self, node_class):
+        tree = Tree(root_value="dir", node_class=node_class)
+        root = tree.root
+        for i in range(50):
+            tree.add_child(root, f"f{i}")
+        root.enable_child_index()
+        dup = tree.add_child(root, "f3")
+        assert root.get_child_by_value("f3") is root.children[3]
+        assert root.get_child_by_value("missing") is None
+        tree.remove_child(root, root.children[3])
+        assert root.get_child_by_value("f3") is dup
+        root.children[10].set_value("renamed")
+        assert root.get_child_by_value("f11") is None
+        assert root.get_child_by_value("renamed") is root.children[10]
+        tree.reverse_children()
+        assert root.get_child_by_value("f3") is dup
+        tree.add_child(root, "f49")
+        assert root.get_child_by_value("f49") is root.children[1]
+        tree.add_child(root, ["unhashable"])
+        assert root.get_child_by_value(["unhashable"]) is root.children[-1]
+        assert root.get_child_by_value("f0") is root.children[-3]
+        other = Tree(root_value="other")
+        moved = root.children[0]
+        tree.remove_child(root, moved)
+        other.add_node(other.root, moved)
+        assert root.get_child_by_value("f49") is root.children[0]
+        root.disable_child_index()
+        assert root.child_index is None
+        assert root.get_child_by_value("f49") is root.children[0]
+
+    def test_unhashable_children_do_not_disable_the_index(self, monkeypatch):
+        from indexes import ChildIndex
+        tree = Tree(root_value="wide")
+        root = tree.root
+        for number in range(500):
+            tree.add_child(root, f"c{number}")
+        tree.add_child(root, [1, 2])
+        late = tree.add_child(root, _Unhashable("u"))
+        early = tree.add_child(root, _Unhashable("u"))
+        tree.reverse_children()
+        root.enable_child_index()
+        monkeypatch.setattr(ChildIndex, "_scan", None)
+        _Unhashable.comparisons = 0
+        assert root.get_child_by_value("c10") is root.children[-11]
+        assert _Unhashable.comparisons == 0
+        assert root.get_child_by_value([1, 2]) is root.children[2]
+        assert root.get_child_by_value(_Unhashable("u")) is early
+        assert root.children[0] is early and root.children[1] is late
+
+    @pytest.mark.parametrize("node_class", [TreeNode, CompactTreeNode])
+    def test_ordered_mode(self, node_class):
+        tree = Tree(root_value="dir", node_class=node_class)
+        root = tree.root
+        for name in ["m", "c", "x", "a"]:
+            tree.add_child(root, name)
+        index = root.enable_child_index(ordered=True)
+        assert root.enable_child_index(ordered=True) is index
+        assert [child.value for child in root.children] == ["a", "c", "m", "x"]
+        b = tree.add_child(root, "b")
+        tree.add_child(root, "z")
+        assert [child.value for child in root.children] == ["a", "b", "c", "m", "x", "z"]
+        assert root.get_child_by_value("b") is b
+        assert b.get_index() == 1
+        assert [c.value for c in root.get_children_in_range("b", "m")] == ["b", "c", "m"]
+        assert [c.value for c in root.get_children_in_range("b", "m", include_low=False,
+                                                            include_high=False)] == ["c"]
+        b.set_value("y")
+        assert [child.value for child in root.children] == ["a", "c", "m", "x", "y", "z"]
+        tree.sort_children(reverse=True)
+        tree.reverse_children()
+        assert [child.value for child in root.children] == ["a", "c", "m", "x", "y", "z"]
+        assert tree.remove_child(root, root.get_child_by_value("m"))
+        assert root.get_child_by_value("m") is None
+        assert [c.value for c in root.get_children_in_range(high="x")] == ["a", "c", "x"]
+        assert tree.get_node_count() == 6
+
+    def test_ordered_key_and_unindexed_range(self):
+        tree = Tree(root_value="dir")
+        root = tree.root
+        for name in ["beta", "Alpha", "gamma", "alpha"]:
+            tree.add_child(root, name)
+        assert [c.value for c in root.get_children_in_range("b", None)] == ["beta", "gamma"]
+        root.enable_child_index(ordered=True, key=str.lower)
+        assert [child.value for child in root.children] == ["Alpha", "alpha", "beta", "gamma"]
+        assert root.get_child_by_value("alpha") is root.children[1]
+        assert root.get_child_by_value("ALPHA") is None
+        root.enable_child_index()
+        assert root.child_index.ordered is False
+        with pytest.raises(ValueError):
+            root.child_index.find_range("a", "b")
+
+    def test_ordered_edits_are_journaled_and_patched(self):
+        source = Tree(root_value="dir")
+        source.root.enable_child_index(ordered=True)
+        for name in ["m", "c"]:
+            source.add_child(source.root, name)
+        target = Tree(root_value="dir")
+        for name in ["a", "c", "d", "m"]:
+            target.add_child(target.root, name)
+        source.apply_patch(source.diff(target))
+        assert source.equals(target)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "dir.journal")
+            journal = source.enable_journal(path)
+            source.add_child(source.root, "b")
+            source.root.children[0].set_value("n")
+            journal.close()
+            assert Tree.open_journal(path).to_json() == source.to_json()
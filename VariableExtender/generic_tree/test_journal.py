@@ -0,0 +1,120 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the append-only tree journal (log replay and compaction).
+"""
+
+import os
+import tempfile
+
+import pytest
+from generic_tree import Tree, CompactTreeNode
+
+
+def _sample_tree():
+    tree = Tree(root_value="r")
+    a = tree.add_child(tree.root, "a")
+    tree.add_child(a, "a1")
+    tree.add_child(tree.root, "b").set_metadata("k", 1)
+    return tree
+
+
+def _edit(tree):
+    a, b = tree.root.children
+    tree.add_child(b, "b1").set_metadata("x", [1, 2])
+    a.set_value("A")
+    b.remove_metadata("k")
+    tree.remove_child(a, a.children[0])
+    moved = tree.add_child(tree.root, "c")
+    tree.add_child(moved, "c1")
+    tree.sort_children(reverse=True)
+    tree.root.set_metadata("version", 2)
+
+
+@pytest.fixture
+def path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield os.path.join(tmpdir, "tree.journal")
+
+
+class TestTreeJournal:
+    def test_replay_reproduces_edits(self, path):
+        tree = _sample_tree()
+        journal = tree.enable_journal(path)
+        _edit(tree)
+        journal.sync()
+        loaded = Tree.open_journal(path)
+        assert loaded.to_json() == tree.to_json()
+        assert loaded.get_node_count() == tree.get_node_count()
+        tree.disable_journal()
+        loaded.disable_journal()
+
+    def test_log_grows_with_changes_only(self, path):
+        tree = Tree(root_value="r")
+        for i in range(500):
+            tree.add_child(tree.root, i)
+        journal = tree.enable_journal(path, batch_size=1)
+        snapshot_size = os.path.getsize(path)
+        log_size = os.path.getsize(path + ".log")
+        tree.root.children[10].set_metadata("k", "v")
+        assert os.path.getsize(path) == snapshot_size
+        assert os.path.getsize(path + ".log") - log_size < 100
+        journal.close()
+
+    def test_reopen_and_continue(self, path):
+        tree = _sample_tree()
+        tree.enable_journal(path)
+        _edit(tree)
+        tree.disable_journal()
+        loaded = Tree.open_journal(path, node_class=CompactTreeNode)
+        loaded.add_child(loaded.root.children[0], "more")
+        loaded.root.children[1].set_value("B")
+        expected = loaded.to_json()
+        loaded.disable_journal()
+        assert Tree.open_journal(path).to_json() == expected
+
+    @pytest.mark.parametrize("background", [False, True])
+    def test_compaction(self, path, background):
+        tree = _sample_tree()
+        journal = tree.enable_journal(path)
+        _edit(tree)
+        journal.compact(background=background)
+        tree.add_child(tree.root, "after")
+        tree.root.children[0].set_value("changed")
+        journal.wait()
+        journal.sync()
+        assert not os.path.exists(path + ".log.compacting")
+        with open(path + ".log", encoding="utf-8") as f:
+            assert len(f.readlines()) == 3
+        loaded = Tree.open_journal(path)
+        assert loaded.to_json() == tree.to_json()
+        loaded.disable_journal()
+        tree.disable_journal()
+
+    def test_interrupted_compaction_and_torn_line(self, path):
+        tree = _sample_tree()
+        journal = tree.enable_journal(path)
+        tree.add_child(tree.root, "before")
+        journal.sync()
+        os.replace(path + ".log", path + ".log.compacting")
+        journal._number()
+        journal._start_log(journal.seq)
+        tree.add_child(tree.root.children[0], "after")
+        journal.sync()
+        with open(path + ".log", "a", encoding="utf-8") as f:
+            f.write('{"op": "value", "id"')
+        expected = tree.to_json()
+        journal.close()
+        loaded = Tree.open_journal(path)
+        assert loaded.to_json() == expected
+        assert not os.path.exists(path + ".log.compacting")
+        loaded.disable_journal()
+
+    def test_missing_history(self, path):
+        tree = _sample_tree()
+        journal = tree.enable_journal(path)
+        journal.close()
+        with open(path + ".log", "w", encoding="utf-8") as f:
+            f.write('{"seq": 5}\n')
+        with pytest.raises(ValueError):
+            Tree.open_journal(path)
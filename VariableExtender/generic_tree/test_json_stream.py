@@ -0,0 +1,106 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the incremental JSON tree loader.
+"""
+
+import io
+import json
+import os
+import tempfile
+
+import pytest
+from generic_tree import Tree, CompactTreeNode
+
+
+def _sample_tree():
+    tree = Tree(root_value={"name": "root", "ids": [1, 2]})
+    a = tree.add_child(tree.root, "a\nline é")
+    a.set_metadata("info", {"nested": [1, {"deep": None}]})
+    tree.add_child(a, 12345678901234567890)
+    b = tree.add_child(tree.root, -3.5e10)
+    b.set_metadata("flag", True)
+    tree.add_child(b, None)
+    tree.add_child(b, [True, False])
+    return tree
+
+
+class TestStreamingLoad:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 64, 1 << 16])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_round_trip_any_chunking(self, chunk_size, indent):
+        tree = _sample_tree()
+        text = tree.to_json(indent=indent)
+        for fp in (io.StringIO(text), io.BytesIO(text.encode('utf-8'))):
+            loaded = Tree.load(fp, chunk_size=chunk_size)
+            assert loaded.to_json(indent=indent) == text
+            assert loaded.get_node_count() == tree.get_node_count()
+
+    def test_key_order_and_unknown_keys(self):
+        text = ('{"children": [{"metadata": {"k": 1}, "extra": [1, {"x": 2}], '
+                '"value": "a"}], "value": "root"}')
+        loaded = Tree.load(io.StringIO(text), chunk_size=3)
+        assert loaded.root.value == "root"
+        assert loaded.root.children[0].value == "a"
+        assert loaded.root.children[0].get_metadata("k") == 1
+        assert loaded.to_dict() == Tree.from_json(text).to_dict()
+
+    def test_node_class(self):
+        text = _sample_tree().to_json()
+        loaded = Tree.load(io.StringIO(text), node_class=CompactTreeNode)
+        assert all(isinstance(node, CompactTreeNode) for node in loaded.traverse())
+        assert loaded.to_json() == text
+
+    def test_deep_tree(self):
+        tree = Tree(root_value=0)
+        node = tree.root
+        for value in range(1, 5000):
+            node = tree.add_child(node, value)
+        loaded = Tree.load(io.StringIO(tree.to_json()))
+        assert loaded.get_height() == 4999
+        assert loaded.get_node_count() == 5000
+
+    def test_progress_and_load_from_file(self):
+        tree = _sample_tree()
+        reports = []
+
+        def progress(read, nodes):
+            reports.append((read, nodes))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "tree.json")
+            tree.save_to_file(filepath)
+            size = os.path.getsize(filepath)
+            loaded = Tree.load_from_file(filepath, progress=progress)
+        assert loaded.to_json() == tree.to_json()
+        assert reports[-1] == (size, tree.get_node_count())
+        assert [read for read, _ in reports] == sorted(read for read, _ in reports)
+
+    @pytest.mark.parametrize("text", [
+        '{"value": 1,}',
+        '{"value": 1} extra',
+        '{"value": tru}',
+        '{"value": 1',
+        '{"children": [{"value": 2},]}',
+    ])
+    def test_invalid_json(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            Tree.load(io.StringIO(text), chunk_size=2)
+
+    @pytest.mark.parametrize("text", ['[1, 2]', '{"children": [1]}', '{"children": {}}'])
+    def test_not_a_tree(self, text):
+        with pytest.raises(ValueError):
+            Tree.load(io.StringIO(text))
+
+
+class TestFromDict:
+    def test_counts_nodes_and_handles_depth(self):
+        data = {'value': 0, 'children': []}
+        level = data
+        for value in range(1, 5000):
+            child = {'value': value, 'children': []}
+            level['children'].append(child)
+            level = child
+        tree = Tree.from_dict(data)
+        assert tree.get_node_count() == 5000
+        assert tree.get_height() == 4999
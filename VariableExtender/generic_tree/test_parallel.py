@@ -0,0 +1,139 @@
+# Generated by AI - Python Module
+
+"""
+Tests for process-pool map/reduce/apply over trees.
+"""
+
+import operator
+import random
+
+import pytest
+from generic_tree import Tree, CompactTreeNode, _TreeListener
+from flat_tree import FlatTree
+from parallel import ParallelExecutor, _work_ranges
+
+
+def _random_tree(count=500, seed=3, node_class=None):
+    rng = random.Random(seed)
+    tree = Tree(root_value=0) if node_class is None else Tree(root_value=0, node_class=node_class)
+    nodes = [tree.root]
+    for value in range(1, count):
+        nodes.append(tree.add_child(rng.choice(nodes[-20:]), value))
+    return tree
+
+
+def _square(value):
+    return value * value
+
+
+def _concat(left, right):
+    return left + right
+
+
+def _tag(node):
+    node.value = node.value + 1
+    node.set_metadata("double", node.value * 2)
+
+
+def _noop(node):
+    node.value = list(node.value)
+
+
+def _retag(node):
+    node.metadata.pop("old", None)
+    if node.value[0] % 2:
+        node.set_metadata("odd", True)
+
+
+class _Recorder(_TreeListener):
+    def __init__(self):
+        self.events = []
+
+    def value_changed(self, node, old_value):
+        self.events.append(("value", node.value[0]))
+
+    def metadata_changed(self, node, key, old_value):
+        self.events.append((key, node.value[0]))
+
+
+class TestWorkRanges:
+    def test_ranges_cover_tree_within_chunk_size(self):
+        flat = FlatTree.from_tree(_random_tree())
+        ranges = _work_ranges(flat.size, len(flat), 37)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(flat)
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        assert all(0 < end - start <= 37 for start, end in ranges)
+
+    def test_small_subtrees_are_not_split(self):
+        flat = FlatTree.from_tree(_random_tree())
+        ranges = _work_ranges(flat.size, len(flat), 50)
+        for index in range(len(flat)):
+            if flat.size[index] <= 50:
+                end = index + flat.size[index]
+                assert any(start <= index and end <= stop for start, stop in ranges)
+
+
+class TestParallelExecutor:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_map_matches_sequential(self, workers):
+        tree = _random_tree()
+        tree.root.children[0].set_metadata("k", "v")
+        with ParallelExecutor(workers=workers, chunk_size=60) as executor:
+            mapped = executor.map(tree, _square)
+        expected = tree.map(_square)
+        assert mapped.to_json() == expected.to_json()
+        assert mapped.get_node_count() == tree.get_node_count()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_reduce_matches_sequential(self, workers):
+        tree = _random_tree()
+        tree.apply(lambda node: setattr(node, "value", str(node.value)))
+        with ParallelExecutor(workers=workers, chunk_size=45) as executor:
+            assert executor.reduce(tree, _concat) == tree.reduce(_concat)
+            assert executor.reduce(tree, _concat, initial="x") == tree.reduce(_concat, initial="x")
+            subtree = tree.root.children[0]
+            assert executor.reduce(tree, _concat, subtree) == tree.reduce(_concat, subtree)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_apply_writes_values_and_metadata_back(self, workers):
+        tree = _random_tree(node_class=CompactTreeNode)
+        expected = _random_tree(node_class=CompactTreeNode)
+        expected.apply(_tag)
+        index = tree.enable_value_index()
+        with ParallelExecutor(workers=workers, chunk_size=30) as executor:
+            executor.apply(tree, _tag)
+        assert [n.value for n in tree.traverse()] == [n.value for n in expected.traverse()]
+        assert tree.to_json() == expected.to_json()
+        assert index.find(1) is tree.root
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_apply_skips_unchanged_values_and_metadata(self, workers):
+        tree = Tree(root_value=[0])
+        for number in range(1, 7):
+            tree.add_child(tree.root, [number]).set_metadata("keep", number)
+        tree.root.children[2].set_metadata("old", "x")
+        tree.root.children[3].set_metadata("odd", True)
+        before = [node.value for node in tree.traverse()]
+        recorder = _Recorder()
+        tree._add_listener(recorder)
+        with ParallelExecutor(workers=workers, chunk_size=2) as executor:
+            executor.apply(tree, _noop)
+            assert recorder.events == []
+            assert all(a is b for a, b in zip(before, [node.value for node in tree.traverse()]))
+            executor.apply(tree, _retag)
+        assert sorted(recorder.events) == [("odd", 1), ("odd", 3), ("odd", 5), ("old", 3)]
+        assert all(a is b for a, b in zip(before, [node.value for node in tree.traverse()]))
+        assert [node.get_metadata("keep") for node in tree.root.children] == list(range(1, 7))
+
+    def test_tree_shortcuts(self):
+        tree = _random_tree(200)
+        assert tree.parallel_reduce(operator.add, workers=2, chunk_size=50) == sum(range(200))
+        assert tree.parallel_map(_square, workers=1).to_json() == tree.map(_square).to_json()
+        tree.parallel_apply(_tag, workers=2, chunk_size=50)
+        assert tree.root.value == 1
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            ParallelExecutor(workers=0)
+        with pytest.raises(ValueError):
+            ParallelExecutor(chunk_size=0)
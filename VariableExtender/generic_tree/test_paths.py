@@ -0,0 +1,98 @@
+# Generated by AI - Python Module
+
+"""
+Tests for value path resolution and the resolved-path cache.
+"""
+
+import pytest
+from generic_tree import Tree, CompactTreeNode
+from paths import PathCache
+
+
+def _geo_tree(node_class=None):
+    paths = ["root/eu/fr/paris", "root/eu/fr/lyon", "root/eu/de/berlin", "root/us/ny"]
+    if node_class is None:
+        return Tree.from_paths(paths)
+    return Tree.from_paths(paths, node_class=node_class)
+
+
+class TestResolve:
+    @pytest.mark.parametrize("cached", [False, True])
+    def test_resolve_and_path_of(self, cached):
+        tree = _geo_tree()
+        if cached:
+            tree.enable_path_cache()
+        paris = tree.resolve("root/eu/fr/paris")
+        assert paris.value == "paris"
+        assert tree.resolve("/root/eu/fr/paris/") is paris
+        assert tree.resolve(["root", "eu", "fr"]) is paris.parent
+        assert tree.resolve("root.us.ny", sep=".").value == "ny"
+        assert tree.resolve("root") is tree.root
+        assert tree.resolve("root/eu/it") is None
+        assert tree.resolve("other/eu") is None
+        assert tree.resolve("") is None
+        assert tree.path_of(paris) == "root/eu/fr/paris"
+        assert tree.path_of(tree.root, sep=".") == "root"
+
+    def test_hot_paths_hit_the_cache(self):
+        tree = _geo_tree(CompactTreeNode)
+        cache = tree.enable_path_cache()
+        assert tree.enable_path_cache() is cache
+        tree.resolve("root/eu/fr/paris")
+        assert len(cache) == 4
+        assert tree.resolve("root/eu/fr/paris").value == "paris"
+        assert tree.resolve("root/eu/fr/lyon").value == "lyon"
+        assert cache.stats() == {"hits": 1, "misses": 2, "entries": 5}
+
+    def test_edits_invalidate_affected_entries_only(self):
+        tree = _geo_tree()
+        cache = tree.enable_path_cache()
+        for path in ["root/eu/fr/paris", "root/eu/fr/lyon", "root/eu/de/berlin", "root/us/ny"]:
+            tree.resolve(path)
+        fr = tree.resolve("root/eu/fr")
+        tree.add_child(fr, "nice")
+        assert ("root", "eu", "fr", "paris") in cache._entries
+        assert tree.resolve("root/eu/fr/nice").value == "nice"
+        de = tree.resolve("root/eu/de")
+        de.set_value("germany")
+        assert ("root", "eu", "de", "berlin") not in cache._entries
+        assert ("root", "eu", "fr", "paris") in cache._entries
+        assert tree.resolve("root/eu/de/berlin") is None
+        assert tree.resolve("root/eu/germany/berlin").value == "berlin"
+        tree.remove_child(tree.root, tree.resolve("root/us"))
+        assert tree.resolve("root/us/ny") is None
+        assert ("root", "eu") in cache._entries
+        # A duplicate value: the first child in order wins, even after reordering.
+        other = tree.add_child(tree.root, "eu")
+        tree.add_child(other, "fr")
+        first_fr = tree.resolve("root/eu/fr")
+        tree.reverse_children(tree.root)
+        assert tree.resolve("root/eu/fr") is not first_fr
+        assert tree.resolve("root/eu/fr") is other.children[0]
+        tree.root.set_value("world")
+        assert len(cache) == 0
+        assert tree.resolve("world/eu/fr") is other.children[0]
+
+    def test_lru_eviction_keeps_trie_small(self):
+        tree = Tree(root_value="r")
+        for i in range(20):
+            tree.add_child(tree.add_child(tree.root, f"d{i}"), "leaf")
+        cache = tree.enable_path_cache(maxsize=5)
+        for i in range(20):
+            assert tree.resolve(f"r/d{i}/leaf").value == "leaf"
+        assert len(cache) == 5
+        assert len(cache._trie["r"]) <= 3
+        cache.clear()
+        assert tree.resolve("r/d3/leaf") is not None
+        with pytest.raises(ValueError):
+            PathCache(tree, maxsize=0)
+        tree.disable_path_cache()
+        assert tree.path_cache is None
+        assert tree.root._tree is None
+
+    def test_unhashable_components(self):
+        tree = Tree(root_value="r")
+        node = tree.add_child(tree.root, ["a"])
+        tree.enable_path_cache()
+        assert tree.resolve(["r", ["a"]]) is node
+        assert tree.path_of(node) == "r/['a']"
@@ -0,0 +1,131 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the persistent (immutable, structurally shared) tree.
+"""
+
+import pytest
+from generic_tree import Tree, TraversalMode, CompactTreeNode
+from persistent import PersistentTree, PersistentNode
+
+
+def _sample_tree():
+    tree = Tree(root_value="r")
+    a = tree.add_child(tree.root, "a")
+    b = tree.add_child(tree.root, "b")
+    tree.add_child(a, "a1")
+    tree.add_child(a, "a2").set_metadata("k", 1)
+    tree.add_child(b, "b1")
+    tree.root.set_metadata("root", True)
+    return tree
+
+
+class TestPersistentConversion:
+    def test_round_trip(self):
+        tree = _sample_tree()
+        version = tree.to_persistent()
+        assert version.get_node_count() == 6
+        restored = version.to_tree()
+        assert restored.to_json() == tree.to_json()
+        assert restored.get_node_count() == 6
+
+    def test_round_trip_compact_nodes(self):
+        restored = _sample_tree().to_persistent().to_tree(node_class=CompactTreeNode)
+        assert isinstance(restored.root.children[0], CompactTreeNode)
+
+    def test_subtree_and_without_metadata(self):
+        tree = _sample_tree()
+        version = PersistentTree.from_tree(tree.root.children[0], include_metadata=False)
+        assert [node.value for node in version.traverse()] == ["a", "a1", "a2"]
+        assert not version.node((1,)).metadata
+
+    def test_traversal_modes_match_tree(self):
+        tree = _sample_tree()
+        version = tree.to_persistent()
+        for mode in TraversalMode:
+            assert ([node.value for node in version.traverse(mode)]
+                    == [node.value for node in tree.traverse(mode)])
+
+    def test_deep_tree(self):
+        tree = Tree(root_value=0)
+        node = tree.root
+        for value in range(1, 5000):
+            node = tree.add_child(node, value)
+        version = tree.to_persistent()
+        assert version.get_height() == 4999
+        assert version.to_tree().get_height() == 4999
+
+
+class TestPersistentEdits:
+    def test_edits_leave_previous_versions_unchanged(self):
+        v1 = _sample_tree().to_persistent()
+        v2 = v1.set_value((0, 1), "A2")
+        v3 = v2.add_child((1,), "b2", metadata={"new": True})
+        v4 = v3.remove((0,))
+        assert v1.node((0, 1)).value == "a2"
+        assert v2.node((0, 1)).value == "A2"
+        assert v2.get_node_count() == 6
+        assert v3.get_node_count() == 7
+        assert v3.node((1, 1)).get_metadata("new") is True
+        assert v4.get_node_count() == 4
+        assert [node.value for node in v4.traverse()] == ["r", "b", "b1", "b2"]
+
+    def test_unchanged_subtrees_are_shared(self):
+        v1 = _sample_tree().to_persistent()
+        v2 = v1.set_value((0, 0), "x")
+        assert v2.root is not v1.root
+        assert v2.node((0,)) is not v1.node((0,))
+        assert v2.node((0, 1)) is v1.node((0, 1))
+        assert v2.node((1,)) is v1.node((1,))
+
+    def test_metadata(self):
+        v1 = _sample_tree().to_persistent()
+        v2 = v1.set_metadata((0,), "k", "v")
+        v3 = v2.remove_metadata((), "root")
+        assert not v1.node((0,)).has_metadata("k")
+        assert v2.node((0,)).get_metadata("k") == "v"
+        assert v3.root.get_metadata("root") is None
+        assert v3.remove_metadata((), "root") is v3
+        with pytest.raises(TypeError):
+            v2.node((0,)).metadata["k"] = "w"
+
+    def test_add_node_and_replace_share_subtrees(self):
+        base = _sample_tree().to_persistent()
+        other = PersistentTree("x").add_child((), "y")
+        grafted = base.add_node((1,), other, index=0)
+        assert grafted.node((1, 0)) is other.root
+        assert grafted.get_node_count() == base.get_node_count() + 2
+        replaced = base.replace((0,), other)
+        assert replaced.get_node_count() == 1 + 2 + 2
+        assert replaced.node((0, 0)).value == "y"
+
+    def test_invalid_paths(self):
+        version = _sample_tree().to_persistent()
+        with pytest.raises(IndexError):
+            version.node((5,))
+        with pytest.raises(IndexError):
+            version.set_value((0, 0, 0), "z")
+        with pytest.raises(ValueError):
+            version.remove(())
+
+    def test_nodes_are_immutable(self):
+        version = _sample_tree().to_persistent()
+        with pytest.raises(AttributeError):
+            version.root.value = "changed"
+        with pytest.raises(AttributeError):
+            version.root = PersistentNode("other")
+
+    def test_find_path_and_equality(self):
+        v1 = _sample_tree().to_persistent()
+        assert v1.find_path("b1") == (1, 0)
+        assert v1.find_path("missing") is None
+        assert v1 == _sample_tree().to_persistent()
+        assert v1.set_value((1,), "B") != v1
+        assert [path for path, _ in v1.iter_paths((0,))] == [(0,), (0, 0), (0, 1)]
+
+    def test_many_versions(self):
+        versions = [PersistentTree(0)]
+        for value in range(1, 200):
+            versions.append(versions[-1].add_child((), value))
+        assert [v.get_node_count() for v in versions[:3]] == [1, 2, 3]
+        assert versions[-1].node((0,)) is versions[1].node((0,))
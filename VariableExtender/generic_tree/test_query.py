@@ -0,0 +1,113 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the XPath-like tree query language.
+"""
+
+import pytest
+from generic_tree import Tree, TreeNode, CompactTreeNode
+import query as query_module
+from query import Query, compile_query
+
+
+def _world(node_class=TreeNode):
+    tree = Tree.from_paths(["root/eu/fr/paris", "root/eu/fr/lyon", "root/eu/de/berlin",
+                            "root/us/ny/nyc", "root/us/xland/xtown"], node_class=node_class)
+    for path, kind in [("root/eu", "continent"), ("root/us", "country"),
+                       ("root/eu/fr", "region"), ("root/eu/de", "region"),
+                       ("root/us/xland", "region"), ("root/us/ny", "region")]:
+        tree.resolve(path).set_metadata("type", kind)
+    tree.resolve("root/eu/fr/paris").set_metadata("population", 2_100_000)
+    tree.resolve("root/eu/fr/lyon").set_metadata("population", 520_000)
+    return tree
+
+
+def _values(nodes):
+    return [node.value for node in nodes]
+
+
+class TestQuery:
+    @pytest.mark.parametrize("node_class", [TreeNode, CompactTreeNode])
+    def test_child_and_descendant_steps(self, node_class):
+        tree = _world(node_class)
+        assert _values(tree.query("/root/eu/*")) == ["fr", "de"]
+        assert _values(tree.query("root/eu/fr/*")) == ["paris", "lyon"]
+        assert _values(tree.query("//fr")) == ["fr"]
+        assert _values(tree.query("/root//*[leaf]")) == ["paris", "lyon", "berlin", "nyc", "xtown"]
+        assert _values(tree.query("//eu//*")) == ["fr", "paris", "lyon", "de", "berlin"]
+        assert _values(tree.query("/other")) == []
+        assert _values(tree.query("//*[depth = 0]")) == ["root"]
+
+    def test_predicates(self):
+        tree = _world()
+        text = "//*[@type = 'region' and depth <= 3 and value ^= 'x']//*[leaf]"
+        assert _values(tree.query(text)) == ["xtown"]
+        assert _values(tree.query("//*[@population > 1000000]")) == ["paris"]
+        assert _values(tree.query("//*[@population]")) == ["paris", "lyon"]
+        assert _values(tree.query("//*[not @type and children > 0]")) == ["root"]
+        assert _values(tree.query("//*[value $= 'on' or value *= 'erl']")) == ["lyon", "berlin"]
+        assert _values(tree.query("//*[value ~= '^n.c$']")) == ["nyc"]
+        assert _values(tree.query("//*[@type != 'region'][@type]")) == ["eu", "us"]
+        assert _values(tree.query("//*[(@type = 'country' or @type = 'continent') and not root]")) \
+            == ["eu", "us"]
+        assert _values(tree.query("//*[@population < 'a']")) == []
+
+    def test_local_axes(self):
+        tree = _world()
+        assert _values(tree.query("//paris/..")) == ["fr"]
+        assert _values(tree.query("//paris/ancestor::*[@type]")) == ["fr", "eu"]
+        assert _values(tree.query("//fr/sibling::*")) == ["de"]
+        assert _values(tree.query("//*[leaf]/parent::*[@type = 'region']/sibling::*")) \
+            == ["de", "fr", "xland", "ny"]
+        assert _values(tree.query("//de/../fr/*")) == ["paris", "lyon"]
+        assert _values(tree.query("//de/..//*[leaf]")) == ["paris", "lyon", "berlin"]
+        lyon = tree.resolve("root/eu/fr/lyon")
+        assert _values(tree.query("ancestor::*", start=lyon)) == ["fr", "eu", "root"]
+        assert _values(tree.query("self::*[@population]", start=lyon)) == ["lyon"]
+
+    def test_start_limit_and_literals(self):
+        tree = Tree(root_value="r")
+        numbers = tree.add_child(tree.root, "numbers")
+        for value in [1, 2, 3, 2.5, "4"]:
+            tree.add_child(numbers, value)
+        tree.add_child(tree.root, "odd name")
+        assert _values(tree.query("/r/numbers/2")) == [2]
+        assert _values(tree.query("/r/numbers/'4'")) == ["4"]
+        assert _values(tree.query("/r/'odd name'")) == ["odd name"]
+        assert _values(tree.query("//*[value >= 2]", start=numbers)) == [2, 3, 2.5]
+        assert _values(tree.query("//*[value >= 2]", limit=2)) == [2, 3]
+        assert tree.query("//*", limit=0) == []
+        assert compile_query("//*[value = 3]").first(tree).value == 3
+
+    def test_depth_bounds_prune_the_traversal(self, monkeypatch):
+        tree = Tree(root_value=0)
+        chain = tree.root
+        for depth in range(1, 200):
+            chain = tree.add_child(chain, depth)
+        tested = []
+        original = query_module._Step.matches
+
+        def counting(step, node, depth):
+            tested.append(node.value)
+            return original(step, node, depth)
+
+        monkeypatch.setattr(query_module._Step, "matches", counting)
+        assert _values(tree.query("//*[depth < 3]/*")) == [1, 2, 3]
+        assert max(tested) == 3
+        tested.clear()
+        assert _values(tree.query("/0/1/*[value > 100]")) == []
+        assert max(tested) == 2
+
+    def test_compiled_queries_are_cached_and_reusable(self):
+        query = compile_query("//fr/*")
+        assert compile_query("//fr/*") is query
+        assert _values(query.select(_world())) == ["paris", "lyon"]
+        europe = _world(CompactTreeNode).resolve("root/eu")
+        assert _values(query.select(europe)) == ["paris", "lyon"]
+        assert repr(query) == "Query('//fr/*')"
+
+    @pytest.mark.parametrize("text", ["", "/", "//descendant::x", "a[", "a[@]", "a[value ~= 3]",
+                                      "a b", "nowhere::x", "a[value = ]", "a/$", "a//.."])
+    def test_syntax_errors(self, text):
+        with pytest.raises(ValueError):
+            Query(text)
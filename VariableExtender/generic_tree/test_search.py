@@ -0,0 +1,115 @@
+# Generated by AI - Python Module
+
+"""
+Tests for best-first and beam search.
+"""
+
+import pytest
+from generic_tree import Tree, TraversalMode
+
+
+def _game_tree(fan_out=4, depth=5):
+    """Complete tree whose leaves have payoff = their value; internal nodes
+    carry the best payoff below them as an admissible bound."""
+    tree = Tree(root_value=0)
+    level = [tree.root]
+    counter = 0
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for _ in range(fan_out):
+                counter += 1
+                next_level.append(tree.add_child(parent, (counter * 7919) % 1000))
+        level = next_level
+    for node in tree.traverse(TraversalMode.POST_ORDER):
+        bound = node.value if not node.children else max(
+            child.get_metadata("bound") for child in node.children)
+        node.set_metadata("bound", bound)
+    return tree
+
+
+def _payoff(node):
+    return node.value
+
+
+def _bound(node):
+    return node.get_metadata("bound")
+
+
+class TestBestFirst:
+    def test_bounded_search_is_exact_and_prunes(self):
+        tree = _game_tree()
+        expected = sorted((leaf.value for leaf in tree.get_all_leaf_nodes()), reverse=True)[:3]
+        scored = []
+
+        def counting(node):
+            scored.append(node)
+            return node.value
+
+        found = tree.best_first(counting, k=3, bound_fn=_bound)
+        assert [score for _, score in found] == expected
+        assert all(not node.children and node.value == score for node, score in found)
+        assert len(scored) < tree.get_node_count() // 10
+
+    def test_greedy_stops_at_first_goals(self):
+        tree = Tree(root_value="r")
+        good = tree.add_child(tree.root, "good")
+        tree.add_child(good, "g1").set_metadata("s", 5)
+        good.set_metadata("s", 9)
+        bad = tree.add_child(tree.root, "bad")
+        bad.set_metadata("s", 1)
+        tree.add_child(bad, "b1").set_metadata("s", 100)
+        found = tree.best_first(lambda node: node.get_metadata("s", 0))
+        assert [(node.value, score) for node, score in found] == [("g1", 5)]
+        found = tree.best_first(lambda node: node.get_metadata("s", 0), k=5)
+        assert [node.value for node, _ in found] == ["b1", "g1"]
+
+    def test_goal_start_and_budget(self):
+        tree = _game_tree(fan_out=3, depth=3)
+        branch = tree.root.children[1]
+        found = tree.best_first(_payoff, k=2, node=branch,
+                                goal=lambda node: node.get_depth() == 2)
+        assert all(node.parent is branch for node, _ in found)
+        assert [score for _, score in found] == sorted(
+            (child.value for child in branch.children), reverse=True)[:2]
+        assert tree.best_first(_payoff, k=3, max_expansions=0) == []
+        with pytest.raises(ValueError):
+            tree.best_first(_payoff, k=0)
+
+
+class TestBeamSearch:
+    def test_wide_beam_is_exhaustive(self):
+        tree = _game_tree(fan_out=3, depth=4)
+        best = max(leaf.value for leaf in tree.get_all_leaf_nodes())
+        found = tree.beam_search(_payoff, width=3 ** 4)
+        assert found[0][1] == best
+
+    def test_narrow_beam_follows_scores(self):
+        tree = Tree(root_value="r")
+        lure = tree.add_child(tree.root, "lure")
+        lure.set_metadata("s", 10)
+        tree.add_child(lure, "trap").set_metadata("s", 1)
+        hidden = tree.add_child(tree.root, "hidden")
+        hidden.set_metadata("s", 0)
+        tree.add_child(hidden, "prize").set_metadata("s", 50)
+        score = lambda node: node.get_metadata("s", 0)
+        assert [node.value for node, _ in tree.beam_search(score, width=1)] == ["trap"]
+        assert [node.value for node, _ in tree.beam_search(score, width=2)] == ["prize"]
+        assert tree.beam_search(score, width=2, max_depth=0) == []
+
+    def test_bound_drops_children_before_scoring(self):
+        tree = _game_tree(fan_out=4, depth=4)
+        scored = []
+
+        def counting(node):
+            scored.append(node)
+            return node.value
+
+        pruned = tree.beam_search(counting, width=4 ** 4, k=2, bound_fn=_bound)
+        full_count = len(scored)
+        scored.clear()
+        exhaustive = tree.beam_search(counting, width=4 ** 4, k=2)
+        assert pruned == exhaustive
+        assert full_count <= len(scored)
+        with pytest.raises(ValueError):
+            tree.beam_search(_payoff, width=0)
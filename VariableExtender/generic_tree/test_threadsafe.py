@@ -0,0 +1,175 @@
+# Generated by AI - Python Module
+
+"""
+Tests for the readers/writer lock and the thread-safe tree wrapper.
+"""
+
+import sys
+import threading
+
+import pytest
+from generic_tree import Tree, CompactTreeNode, TraversalMode
+from threadsafe import ConcurrentTree, RWLock
+
+
+def _values(nodes):
+    return [node.value for node in nodes]
+
+
+class TestRWLock:
+    def test_readers_share_writer_excludes(self):
+        lock = RWLock()
+        lock.acquire_read()
+        other = threading.Thread(target=lambda: (lock.acquire_read(), lock.release_read()))
+        other.start()
+        other.join(timeout=5)
+        assert not other.is_alive()
+        entered = threading.Event()
+
+        def write():
+            with lock.writing():
+                entered.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        assert not entered.wait(0.1)
+        lock.release_read()
+        writer.join(timeout=5)
+        assert entered.is_set()
+
+    def test_reentrancy_and_misuse(self):
+        lock = RWLock()
+        with lock.writing():
+            with lock.writing():
+                with lock.reading():
+                    pass
+        with lock.reading():
+            with lock.reading():
+                pass
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+        with pytest.raises(RuntimeError):
+            lock.release_read()
+        with pytest.raises(RuntimeError):
+            lock.release_write()
+
+
+class TestConcurrentTree:
+    def test_snapshot_shares_unchanged_subtrees(self):
+        shared = ConcurrentTree(Tree(root_value="r", node_class=CompactTreeNode))
+        with shared.transaction() as tree:
+            a = tree.add_child(tree.root, "a")
+            tree.add_child(a, "a1")
+            b = tree.add_child(tree.root, "b")
+        first = shared.snapshot()
+        assert shared.snapshot().root is first.root
+        assert _values(shared.traverse(TraversalMode.POST_ORDER)) == ["a1", "a", "b", "r"]
+        shared.set_value(b, "B")
+        second = shared.snapshot()
+        assert first.node((1,)).value == "b"
+        assert second.node((1,)).value == "B"
+        assert second.node((0,)) is first.node((0,))
+        shared.add_child(a, "a2")
+        b.set_metadata("k", 1)
+        third = shared.snapshot()
+        assert _values(third.traverse()) == ["r", "a", "a1", "a2", "B"]
+        assert third.node((1,)).metadata == {"k": 1}
+        assert third.to_tree().equals(shared.tree)
+
+    def test_transaction_counts_versions(self):
+        shared = ConcurrentTree()
+        with shared.transaction() as tree:
+            with shared.transaction():
+                tree.add_child(tree.root, 1)
+            tree.reverse_children()
+        assert shared.version == 1
+        with pytest.raises(KeyError):
+            with shared.transaction() as tree:
+                tree.add_child(tree.root, 2)
+                raise KeyError("abort")
+        assert shared.version == 2
+        assert shared.get_node_count() == 3
+        assert shared.remove_child(shared.tree.root, shared.tree.root.children[0])
+        assert _values(shared.traverse()) == [None, 2]
+
+    def test_readers_never_see_partial_batches(self):
+        shared = ConcurrentTree(Tree(root_value=0))
+        errors = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                # Every batch adds two children with the same value.
+                values = _values(shared.traverse())[1:]
+                if len(values) % 2 or values[::2] != values[1::2]:
+                    errors.append(values)
+                with shared.read() as tree:
+                    if tree.get_node_count() % 2 == 0:
+                        errors.append("count")
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(200):
+            with shared.transaction() as tree:
+                tree.add_child(tree.root, i)
+                tree.add_child(tree.root, i)
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=10)
+        assert errors == []
+        assert shared.get_node_count() == 401
+
+    def test_concurrent_readers_share_lookup_caches(self):
+        tree = Tree(root_value="r")
+        for i in range(30):
+            branch = tree.add_child(tree.root, f"b{i}")
+            for j in range(5):
+                tree.add_child(branch, f"l{j}")
+        tree.enable_path_cache(maxsize=8)
+        tree.enable_hashing()
+        tree.enable_aggregates()
+        shared = ConcurrentTree(tree)
+        errors = []
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+        def reader(seed):
+            try:
+                for round_ in range(3000):
+                    i, j = (seed * 7 + round_) % 30, round_ % 5
+                    with shared.read() as live:
+                        node = live.resolve(f"r/b{i}/l{j}")
+                        if node is None or node.value != f"l{j}" or node.parent.value != f"b{i}":
+                            errors.append((i, j))
+                        live.hashes.digest(node.parent)
+                        live.aggregates.size(node.parent)
+            except Exception as error:  # pragma: no cover - reported below
+                errors.append(error)
+
+        try:
+            threads = [threading.Thread(target=reader, args=(seed,)) for seed in range(8)]
+            for thread in threads:
+                thread.start()
+            for round_ in range(50):
+                with shared.transaction() as live:
+                    live.root.children[round_ % 30].children[0].set_value("l0")
+                    live.hashes.clear()
+                    live.aggregates.clear()
+            for thread in threads:
+                thread.join(timeout=30)
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert errors == []
+        assert len(tree.path_cache) <= 8
+
+    def test_close_and_refresh(self):
+        shared = ConcurrentTree(Tree(root_value="r"))
+        shared.tree.root.value = "direct"
+        assert shared.snapshot().root.value == "direct"
+        shared.tree.root.value = "again"
+        assert shared.snapshot().root.value == "direct"
+        shared.refresh()
+        assert shared.snapshot().root.value == "again"
+        shared.close()
+        assert shared.tree._listeners == []
@@ -0,0 +1,366 @@
+# Generated by AI - Python Module
+# -*- coding: utf-8 -*-
+"""Thread Safe - Shared trees for many reader threads and a writer.
+
+:class:`ConcurrentTree` wraps a :class:`Tree` behind a :class:`RWLock`:
+
+- ``read()`` holds the read lock and gives access to the live nodes; any
+  number of threads may read at the same time. Lookups that update a
+  cache as they go (path resolution, digests, subtree aggregates) lock
+  that cache themselves.
+- ``transaction()`` holds the write lock for a batch of edits, so readers
+  see either none or all of them, and pays the locking cost once per batch.
+- ``snapshot()`` returns the current version as an immutable
+  :class:`PersistentTree` and ``traverse()`` iterates over it. The lock is
+  held only while the snapshot is fetched, never while iterating, so slow
+  consumers do not block the writer and never see half-applied edits.
+
+Snapshots are cheap: one :class:`PersistentNode` is cached per tree node
+and, like the digests of :mod:`hashing`, an edit only drops the cached
+nodes on the path to the root. The first snapshot after a transaction
+rebuilds those paths and shares every other subtree with the previous
+snapshot; later snapshots of the same version cost nothing.
+
+Edits must go through ``transaction()`` (or the wrapper's edit methods).
+Editing the wrapped tree from another thread without the write lock is
+not synchronized, and direct assignments such as ``node.value = x`` are
+not seen by the snapshot cache (call ``refresh()`` afterwards).
+
+Example:
+    >>> shared = ConcurrentTree(Tree(root_value="root"))
+    >>> with shared.transaction() as tree:           # writer thread
+    ...     a = tree.add_child(tree.root, "a")
+    ...     tree.add_child(a, "a1")
+    >>> [node.value for node in shared.traverse()]   # any reader thread
+    ['root', 'a', 'a1']
+    >>> with shared.read() as tree:
+    ...     tree.get_node_count()
+    3
+
+Author: AI Assistant
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from .generic_tree import Tree, TreeNode, TraversalMode, _TreeListener
+    from .persistent import PersistentNode, PersistentTree
+except ImportError:
+    from generic_tree import Tree, TreeNode, TraversalMode, _TreeListener
+    from persistent import PersistentNode, PersistentTree
+
+
+class RWLock:
+    """Readers/writer lock preferring writers.
+
+    Many threads may hold the read lock together; the write lock is
+    exclusive. Waiting writers block new readers, so a steady stream of
+    readers cannot starve the writer. Both locks are reentrant, and the
+    thread holding the write lock may also take the read lock. Upgrading a
+    read lock to a write lock is refused, as two upgrading readers would
+    wait for each other forever.
+    """
+
+    def __init__(self):
+        """Initialize an unlocked lock."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def _held_reads(self) -> List[bool]:
+        held = getattr(self._local, 'reads', None)
+        if held is None:
+            held = self._local.reads = []
+        return held
+
+    def acquire_read(self) -> None:
+        """Acquire the read lock, waiting while a writer holds or awaits it."""
+        held = self._held_reads()
+        if held or self._writer == threading.get_ident():
+            # Nested inside a read or write lock of this thread.
+            held.append(False)
+            return
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        held.append(True)
+
+    def release_read(self) -> None:
+        """Release the read lock.
+
+        Raises:
+            RuntimeError: If this thread does not hold the read lock
+        """
+        held = self._held_reads()
+        if not held:
+            raise RuntimeError("read lock released without being held")
+        if held.pop():
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Acquire the write lock, waiting for current readers and writer.
+
+        Raises:
+            RuntimeError: If this thread holds the read lock
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if self._held_reads():
+            raise RuntimeError("cannot upgrade a read lock to a write lock")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        """Release the write lock.
+
+        Raises:
+            RuntimeError: If this thread does not hold the write lock
+        """
+        if self._writer != threading.get_ident():
+            raise RuntimeError("write lock released without being held")
+        self._write_depth -= 1
+        if not self._write_depth:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        """Hold the read lock for the duration of a ``with`` block."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Hold the write lock for the duration of a ``with`` block."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class _SnapshotCache(_TreeListener):
+    """Persistent copies of the subtrees of a tree, dropped on the edited paths."""
+
+    def __init__(self, tree: Tree):
+        self.tree = tree
+        self._cache: Dict[int, PersistentNode] = {}
+
+    def build(self) -> PersistentTree:
+        """Get the current version, rebuilding only the uncached nodes."""
+        cache = self._cache
+        root = self.tree.root
+        cached = cache.get(id(root))
+        if cached is not None:
+            return PersistentTree(root=cached)
+        make = PersistentNode._make
+        order = []
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            if id(current) in cache:
+                continue
+            order.append(current)
+            stack.extend(current.children)
+        for item in reversed(order):
+            kids = tuple(cache[id(child)] for child in item.children)
+            cache[id(item)] = make(item.value, kids,
+                                   dict(item.metadata) if item.metadata else None,
+                                   1 + sum(child.size for child in kids))
+        return PersistentTree(root=cache[id(root)])
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _invalidate_path(self, node: Optional[TreeNode]) -> None:
+        """Drop cached nodes from ``node`` up to the first uncached ancestor."""
+        cache = self._cache
+        while node is not None and cache.pop(id(node), None) is not None:
+            node = node.parent
+
+    def _evict_subtree(self, node: TreeNode) -> None:
+        cache = self._cache
+        for item in self.tree._pre_order(node):
+            cache.pop(id(item), None)
+
+    def attached(self, node: TreeNode) -> None:
+        self._evict_subtree(node)
+        self._invalidate_path(node.parent)
+
+    def detached(self, node: TreeNode, parent: TreeNode) -> None:
+        self._evict_subtree(node)
+        self._invalidate_path(parent)
+
+    def value_changed(self, node: TreeNode, old_value: Any) -> None:
+        self._invalidate_path(node)
+
+    def metadata_changed(self, node: TreeNode, key: str, old_value: Any) -> None:
+        self._invalidate_path(node)
+
+    def reordered(self, node: TreeNode) -> None:
+        self._invalidate_path(node)
+
+
+class ConcurrentTree:
+    """A :class:`Tree` shared between threads.
+
+    Attributes:
+        tree (Tree): The wrapped tree (only touch it through the wrapper)
+        lock (RWLock): The lock guarding the tree
+    """
+
+    def __init__(self, tree: Optional[Tree] = None):
+        """Wrap a tree.
+
+        Args:
+            tree (Optional[Tree]): The tree to share (default: a new empty tree)
+        """
+        self.tree = tree if tree is not None else Tree()
+        self.lock = RWLock()
+        self._version = 0
+        self._snapshots = _SnapshotCache(self.tree)
+        # Readers share the read lock, so building the snapshot needs its own.
+        self._snapshot_lock = threading.Lock()
+        self.tree._add_listener(self._snapshots)
+
+    @property
+    def version(self) -> int:
+        """Number of write transactions committed so far."""
+        return self._version
+
+    @contextmanager
+    def read(self) -> Iterator[Tree]:
+        """Hold the read lock and give access to the live tree.
+
+        Nodes obtained inside the block must not be used after it. Any
+        read-only method may be called: the lookup caches that fill on
+        read (``PathCache``, ``SubtreeHashes``, ``SubtreeAggregates``) have
+        their own locks, and the child position hints that lookups may
+        renumber are only ever rewritten with the same values.
+
+        Yields:
+            Tree: The wrapped tree, not to be edited
+        """
+        with self.lock.reading():
+            yield self.tree
+
+    @contextmanager
+    def transaction(self) -> Iterator[Tree]:
+        """Hold the write lock for a batch of edits.
+
+        Readers wait until the batch is over and then see all of it.
+        Transactions nest; the version counts outermost transactions only.
+        Edits made before an exception escapes the block are kept.
+
+        Yields:
+            Tree: The wrapped tree, to edit freely
+        """
+        self.lock.acquire_write()
+        try:
+            yield self.tree
+        finally:
+            if self.lock._write_depth == 1:
+                self._version += 1
+            self.lock.release_write()
+
+    def snapshot(self) -> PersistentTree:
+        """Get an immutable copy of the current version.
+
+        Returns:
+            PersistentTree: The current version, sharing unchanged subtrees
+            with the previous snapshots
+        """
+        with self.lock.reading():
+            with self._snapshot_lock:
+                return self._snapshots.build()
+
+    def traverse(self, mode: TraversalMode = TraversalMode.PRE_ORDER) -> Iterator[PersistentNode]:
+        """Iterate over a snapshot, without holding any lock while iterating.
+
+        Args:
+            mode (TraversalMode): The traversal mode to use
+
+        Returns:
+            Iterator[PersistentNode]: Nodes of the version current at the call
+        """
+        return self.snapshot().traverse(mode)
+
+    def refresh(self) -> None:
+        """Drop the cached snapshot nodes (e.g. after direct ``node.value`` edits)."""
+        with self.lock.writing():
+            self._snapshots.clear()
+
+    def get_node_count(self) -> int:
+        """Get the number of nodes under the read lock.
+
+        Returns:
+            int: Total number of nodes
+        """
+        with self.lock.reading():
+            return self.tree.get_node_count()
+
+    def add_child(self, parent: TreeNode, value: Any) -> TreeNode:
+        """Add a child in a single-edit transaction.
+
+        Args:
+            parent (TreeNode): The parent node
+            value (Any): The value for the new child
+
+        Returns:
+            TreeNode: The newly created child node
+        """
+        with self.transaction() as tree:
+            return tree.add_child(parent, value)
+
+    def remove_child(self, parent: TreeNode, child: TreeNode) -> bool:
+        """Remove a child in a single-edit transaction.
+
+        Args:
+            parent (TreeNode): The parent node
+            child (TreeNode): The child to remove
+
+        Returns:
+            bool: True if removal was successful, False otherwise
+        """
+        with self.transaction() as tree:
+            return tree.remove_child(parent, child)
+
+    def set_value(self, node: TreeNode, value: Any) -> None:
+        """Replace the value of a node in a single-edit transaction.
+
+        Args:
+            node (TreeNode): The node to update
+            value (Any): The new value
+        """
+        with self.transaction():
+            node.set_value(value)
+
+    def close(self) -> None:
+        """Stop tracking edits; the wrapped tree is left as it is."""
+        with self.lock.writing():
+            self.tree._remove_listener(self._snapshots)
+            self._snapshots.clear()